@@ -0,0 +1,90 @@
+from statistics import mean, pstdev
+from typing import Iterable
+from segment import ONE_SECOND, SCHEDULE_LAYER, Segment
+
+SECONDS_PER_HOUR = 3600
+
+class UserStats:
+    """
+    On-call totals of one user over a rendered window.
+    A shift is a maximal stretch of consecutive on-call time, as in the rendered output.
+    """
+    __slots__ = ("name", "total_seconds", "scheduled_seconds", "override_seconds", "shifts", "longest_shift_seconds")
+
+    def __init__(self, name : str) -> None:
+        self.name = name
+        self.total_seconds = 0
+        self.scheduled_seconds = 0
+        self.override_seconds = 0
+        self.shifts = 0
+        self.longest_shift_seconds = 0
+
+    def __repr__(self) -> str:
+        return (f"UserStats(name={self.name}, total_seconds={self.total_seconds}, shifts={self.shifts}, "
+                f"override_seconds={self.override_seconds})")
+
+    def _to_dict(self) -> dict[str, object]:
+        """
+        Convert the stats into a dictionary with durations in hours.
+        """
+        return {"total_hours": self.total_seconds / SECONDS_PER_HOUR,
+                "scheduled_hours": self.scheduled_seconds / SECONDS_PER_HOUR,
+                "override_hours": self.override_seconds / SECONDS_PER_HOUR,
+                "shifts": self.shifts,
+                "longest_shift_hours": self.longest_shift_seconds / SECONDS_PER_HOUR}
+
+
+def aggregate_segments(segments : Iterable[Segment], names : list[str]) -> dict[str, UserStats]:
+    """
+    Compute per-user stats in one pass over the merged, start-ordered segment stream
+    (before combining, where each segment's layer is still exact).
+    Consecutive segments of the same owner are counted as one shift, exactly as the
+    combiner would join them, and zero-duration segments are ignored.
+    E.g.
+    merged = [(A, 1pm, 3pm, schedule), (A, 3pm, 4pm, override), (B, 4pm, 6pm, schedule)]
+    stats = {A: 3h total, 1h override, 1 shift of 3h; B: 2h total, 1 shift of 2h}
+    """
+    stats_by_owner: dict[int, UserStats] = {}
+    shift_owner, shift_start, shift_end = None, None, None
+
+    for segment in segments:
+        start, end, owner = segment.start, segment.end, segment.owner
+        if start >= end:
+            continue
+        stats = stats_by_owner.get(owner)
+        if stats is None:
+            stats = stats_by_owner[owner] = UserStats(names[owner])
+        duration = (end - start) // ONE_SECOND
+        stats.total_seconds += duration
+        if segment.layer == SCHEDULE_LAYER:
+            stats.scheduled_seconds += duration
+        else:
+            stats.override_seconds += duration
+
+        if owner == shift_owner and start == shift_end:
+            shift_end = end
+            continue
+        if shift_owner is not None:
+            _close_shift(stats_by_owner[shift_owner], (shift_end - shift_start) // ONE_SECOND)
+        shift_owner, shift_start, shift_end = owner, start, end
+
+    if shift_owner is not None:
+        _close_shift(stats_by_owner[shift_owner], (shift_end - shift_start) // ONE_SECOND)
+    return {stats.name: stats for stats in stats_by_owner.values()}
+
+
+def _close_shift(stats : UserStats, length : int) -> None:
+    stats.shifts += 1
+    stats.longest_shift_seconds = max(stats.longest_shift_seconds, length)
+
+
+def fairness_summary(stats : dict[str, UserStats]) -> dict[str, float]:
+    """
+    Summarise how evenly on-call hours are spread across users:
+    mean, population standard deviation, minimum and maximum of total hours.
+    """
+    hours = [user_stats.total_seconds / SECONDS_PER_HOUR for user_stats in stats.values()]
+    if not hours:
+        return {"users": 0}
+    return {"users": len(hours), "mean_hours": mean(hours), "stdev_hours": pstdev(hours),
+            "min_hours": min(hours), "max_hours": max(hours)}
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from file_handler import FileHandler
+from scheduling_engine import SchedulingEngine
+
+def read_manifest(manifest_file : str) -> list[dict]:
+    """
+    Read a manifest of rotations:
+    [{"name": "payments", "schedule": "payments/schedule.json", "overrides": "payments/overrides.json"}, ...]
+    Relative paths are resolved against the manifest's directory.
+    A name becomes the output file <output_dir>/<name>.json, so it must be a plain
+    file name: no path separators, not "." or "..", and not an absolute path.
+    Raises ValueError if an entry is missing a field, a name is not a plain file name
+    or a name is repeated.
+    """
+    with open(manifest_file, "r") as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    jobs, names = [], set()
+    for entry in manifest:
+        name, schedule, overrides = entry.get("name"), entry.get("schedule"), entry.get("overrides")
+        if not (isinstance(name, str) and schedule and overrides):
+            raise ValueError(f"Invalid manifest entry: {entry!r}")
+        if name in ("", ".", "..") or "/" in name or "\\" in name or os.path.isabs(name):
+            raise ValueError(f"Invalid rotation name in manifest: {name!r}")
+        if name in names:
+            raise ValueError(f"Duplicate rotation name in manifest: {name!r}")
+        names.add(name)
+        jobs.append({"name": name,
+                     "schedule": os.path.join(base_dir, schedule),
+                     "overrides": os.path.join(base_dir, overrides)})
+    return jobs
+
+def render_rotation(job : dict, start_time : str, end_time : str, output_dir : str | None) -> dict:
+    """
+    Render one rotation. Runs inside a worker process.
+    Writes <output_dir>/<name>.json when output_dir is given, otherwise returns the
+    rendered events in the result. Never raises: failures are reported in the result.
+    """
+    started = time.perf_counter()
+    result = {"name": job["name"], "ok": False, "events": None, "event_count": 0, "seconds": 0.0, "error": None}
+    try:
+        output_file = os.path.join(output_dir, f"{job['name']}.json") if output_dir else None
+        file_handler = FileHandler(job["schedule"], job["overrides"], output_file)
+        schedule_lst = file_handler.read_schedule_file(start_time, end_time)
+        override_lst = file_handler.read_override_file(start_time, end_time)
+        final_schedule_queue = SchedulingEngine(schedule_lst, override_lst).override_schedule_queue()
+
+        if output_file:
+            file_handler.write_to_output_file(final_schedule_queue)
+        else:
+            result["events"] = [event._to_dict() for event in final_schedule_queue]
+        result["event_count"] = len(final_schedule_queue)
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+def render_batch(jobs : list[dict], start_time : str, end_time : str, output_dir : str | None = None,
+                 workers : int | None = None, chunksize : int = 8) -> list[dict]:
+    """
+    Render every rotation in jobs over the shared [start_time, end_time] window.
+    Jobs are fanned out over a ProcessPoolExecutor in chunks of chunksize, so the
+    interpreter start-up and imports are paid once per worker instead of once per rotation.
+    A failing rotation is reported in its result and does not abort the batch.
+    Results are returned in manifest order.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    count = len(jobs)
+    args = (jobs, [start_time] * count, [end_time] * count, [output_dir] * count)
+    if workers == 1:
+        return list(map(render_rotation, *args))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_rotation, *args, chunksize=chunksize))
+
+def write_combined_output(results : list[dict], output_file : str) -> None:
+    """
+    Write the events of every successful rotation into one json file keyed by rotation name.
+    """
+    combined = {result["name"]: result["events"] for result in results if result["ok"]}
+    with open(output_file, "w") as f:
+        json.dump(combined, f, indent=2)
+
+def read_stdin():
+    parser = argparse.ArgumentParser(description="Render many schedules with overrides in parallel")
+    parser.add_argument("--manifest", required=True)
+    parser.add_argument("--from", dest="from_time", required=True)
+    parser.add_argument("--until", required=True)
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output-dir", help="write one <name>.json per rotation into this directory")
+    output.add_argument("--combined-output", help="write all rotations into one json file keyed by name")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--report", help="write per-rotation timings and failures to this json file")
+
+    args = parser.parse_args()
+
+    jobs = read_manifest(args.manifest)
+    results = render_batch(jobs, args.from_time, args.until, args.output_dir, args.workers, args.chunksize)
+    if args.combined_output:
+        write_combined_output(results, args.combined_output)
+
+    report = [{key: value for key, value in result.items() if key != "events"} for result in results]
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    for entry in report:
+        status = "ok" if entry["ok"] else f"FAILED {entry['error']}"
+        print(f"{entry['name']}: {entry['event_count']} events in {entry['seconds'] * 1e3:.1f} ms {status}")
+
+    failures = sum(1 for entry in report if not entry["ok"])
+    print(f"{len(report) - failures}/{len(report)} rotations rendered")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    read_stdin()
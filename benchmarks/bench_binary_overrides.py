@@ -0,0 +1,49 @@
+"""
+Benchmark reading a one-week window from a large override history.
+
+Writes several years of overrides as json and in the binary format, then
+times FileHandler.read_override_file on a narrow window for each.
+
+Run from the repository root:
+python -m benchmarks.bench_binary_overrides
+"""
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from file_handler import FileHandler
+from override_store import write_binary_overrides
+
+START = datetime(2020, 1, 1)
+DAYS = 365 * 5
+OVERRIDES = 500_000
+
+
+def main() -> None:
+    rng = random.Random(13)
+    override_data = []
+    for _ in range(OVERRIDES):
+        start = START + timedelta(minutes=rng.randrange(DAYS * 24 * 60))
+        end = start + timedelta(minutes=rng.randrange(30, 720))
+        override_data.append({"user": rng.choice(["dan", "erin", "frank"]),
+                              "start_at": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                              "end_at": end.strftime("%Y-%m-%dT%H:%M:%SZ")})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_file, binary_file = os.path.join(tmpdir, "overrides.json"), os.path.join(tmpdir, "overrides.bin")
+        with open(json_file, "w") as f:
+            json.dump(override_data, f)
+        write_binary_overrides(FileHandler(None, json_file, None).read_overrides(), binary_file)
+
+        for label, path in (("json", json_file), ("binary", binary_file)):
+            handler = FileHandler(None, path, None)
+            start = time.perf_counter()
+            overrides = handler.read_override_file("2023-06-01T00:00:00Z", "2023-06-08T00:00:00Z")
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {os.path.getsize(path) / 1e6:.1f} MB, {len(overrides)} overrides in window, {elapsed * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark memory and throughput of UserEvent objects against compact Segments.
+
+Measures:
+1. Peak memory of holding N events as UserEvent objects and as Segments.
+2. Throughput of a combine pass over each representation.
+3. SchedulingEngine.override_schedule_queue on N schedule events with N / 10
+   overrides, split into boundary conversion and the Segment pipeline.
+4. The epoch-seconds round trip Segments used to make at the engine boundary,
+   against passing the events' datetimes through.
+
+Run from the repository root:
+python -m benchmarks.bench_event_representation --events 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from scheduling_engine import SchedulingEngine
+from segment import NameTable, Segment, from_epoch_seconds, to_epoch_seconds
+from user_event import UserEvent
+
+USERS = ["alice", "bob", "charlie", "dan"]
+START = datetime(2025, 1, 1)
+
+
+def make_user_events(count : int, step : timedelta) -> list[UserEvent]:
+    """
+    Build back-to-back events of length step cycling through USERS.
+    """
+    return [UserEvent(USERS[i % len(USERS)], START + i * step, START + (i + 1) * step) for i in range(count)]
+
+
+def combine_user_events(events : list[UserEvent]) -> int:
+    """
+    Count combined segments comparing names and datetimes.
+    """
+    count, prev = 0, None
+    for curr in events:
+        if prev is None or curr.name != prev.name or prev.end_time != curr.start_time:
+            count += 1
+        prev = curr
+    return count
+
+
+def combine_segments(segments : list[Segment]) -> int:
+    """
+    Count combined segments comparing interned ids and the shared datetimes.
+    """
+    count, prev = 0, None
+    for curr in segments:
+        if prev is None or curr.owner != prev.owner or prev.end != curr.start:
+            count += 1
+        prev = curr
+    return count
+
+
+def epoch_round_trip(events : list[UserEvent]) -> list[UserEvent]:
+    """
+    Convert each event to epoch seconds and back, as the engine boundary did before
+    Segments kept the input datetimes.
+    """
+    return [UserEvent(event.name, from_epoch_seconds(to_epoch_seconds(event.start_time)),
+                      from_epoch_seconds(to_epoch_seconds(event.end_time))) for event in events]
+
+
+def pass_through(events : list[UserEvent]) -> list[UserEvent]:
+    """
+    Rebuild each event from its own datetimes, as the engine boundary does now.
+    """
+    return [UserEvent(event.name, event.start_time, event.end_time) for event in events]
+
+
+def _peak_memory(build) -> tuple[object, int]:
+    """
+    Return the built object and the peak traced memory in bytes while building it.
+    """
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def _seconds(func) -> float:
+    """
+    Return the wall time of a single call in seconds.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark event representations")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+    count = args.events
+
+    events, event_bytes = _peak_memory(lambda: make_user_events(count, timedelta(minutes=1)))
+    names = NameTable()
+    segments, segment_bytes = _peak_memory(lambda: list(names.to_segments(events)))
+    print(f"memory for {count} events: UserEvent {event_bytes / 2**20:.1f} MiB, "
+          f"Segment {segment_bytes / 2**20:.1f} MiB ({event_bytes / segment_bytes:.1f}x smaller)")
+
+    event_time = _seconds(lambda: combine_user_events(events))
+    segment_time = _seconds(lambda: combine_segments(segments))
+    print(f"combine pass: UserEvent {count / event_time / 1e6:.2f} M events/s, "
+          f"Segment {count / segment_time / 1e6:.2f} M events/s")
+
+    overrides = make_user_events(count // 10, timedelta(minutes=7))
+    total = count + len(overrides)
+    render_time = _seconds(lambda: SchedulingEngine(events, overrides).override_schedule_queue())
+    print(f"override_schedule_queue: {total / render_time / 1e6:.2f} M input events/s ({render_time:.2f} s)")
+
+    engine, names = SchedulingEngine([], []), NameTable()
+    convert_time = _seconds(lambda: (list(names.to_segments(events)), list(names.to_segments(overrides))))
+    override_segments = list(names.to_segments(overrides))
+    pipeline_time = _seconds(lambda: list(engine._render(segments, override_segments)))
+    print(f"  input conversion {convert_time:.2f} s, segment pipeline {pipeline_time:.2f} s")
+
+    round_trip_time = _seconds(lambda: epoch_round_trip(events))
+    pass_through_time = _seconds(lambda: pass_through(events))
+    print(f"boundary: epoch round trip {round_trip_time:.2f} s, datetime pass-through {pass_through_time:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
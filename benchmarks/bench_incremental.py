@@ -0,0 +1,60 @@
+"""
+Benchmark single override edits against a full re-render.
+
+Builds a timeline with tens of thousands of segments, then applies random
+add/update/remove edits through the incremental API and compares the mean
+cost per edit with one full SchedulingEngine.override_schedule_queue call.
+
+Run from the repository root:
+python -m benchmarks.bench_incremental
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+START = datetime(2025, 1, 1)
+DAYS = 365
+EDITS = 500
+
+
+def random_override(rng : random.Random) -> UserEvent:
+    """
+    Return an override of 30 minutes to 12 hours somewhere in the window.
+    """
+    start = START + timedelta(minutes=rng.randrange(DAYS * 24 * 60))
+    return UserEvent(rng.choice(["dan", "erin", "frank"]), start, start + timedelta(minutes=rng.randrange(30, 720)))
+
+
+def main() -> None:
+    rng = random.Random(3)
+    rotation = Rotation(["alice", "bob", "charlie"], START, timedelta(hours=12))
+    schedules = list(rotation.iter_events(START, START + timedelta(days=DAYS)))
+    overrides = [random_override(rng) for _ in range(20_000)]
+
+    start = time.perf_counter()
+    engine = SchedulingEngine(schedules, overrides)
+    full_render = len(engine.override_schedule_queue())
+    full_time = time.perf_counter() - start
+    engine.rendered_events()
+
+    ids = list(range(len(overrides)))
+    start = time.perf_counter()
+    for _ in range(EDITS):
+        action = rng.random()
+        if action < 0.4:
+            ids.append(engine.add_override(random_override(rng)))
+        elif action < 0.7:
+            engine.update_override(rng.choice(ids), random_override(rng))
+        else:
+            engine.remove_override(ids.pop(rng.randrange(len(ids))))
+    edit_time = (time.perf_counter() - start) / EDITS
+
+    print(f"full render of {full_render} segments: {full_time * 1e3:.1f} ms")
+    print(f"incremental edit: {edit_time * 1e3:.3f} ms ({full_time / edit_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark rendering every week of a quarter with render_windows against
+rendering each week independently.
+
+Both start from the parsed rotation and untruncated overrides; the independent
+renders truncate the overrides to each week and run the engine once per week.
+
+Run from the repository root:
+python -m benchmarks.bench_multi_window
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from rendered_schedule import render_windows
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+START = datetime(2025, 1, 1)
+WEEKS = 13
+OVERRIDES = 200_000
+
+
+def main() -> None:
+    rng = random.Random(18)
+    rotation = Rotation(["alice", "bob", "charlie"], START, timedelta(hours=12))
+    overrides = []
+    for _ in range(OVERRIDES):
+        start = START + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        overrides.append(UserEvent(rng.choice(["dan", "erin", "frank"]), start, start + timedelta(minutes=rng.randrange(30, 720))))
+    overrides.sort(key=lambda event: event.start_time)
+    windows = [(START + timedelta(weeks=week), START + timedelta(weeks=week + 1)) for week in range(WEEKS)]
+
+    start = time.perf_counter()
+    independent = []
+    for start_time, end_time in windows:
+        override_lst = [UserEvent(o.name, max(o.start_time, start_time), min(o.end_time, end_time))
+                        for o in overrides if o.start_time < end_time and o.end_time > start_time]
+        schedule_lst = list(rotation.iter_events(start_time, end_time))
+        independent.append(SchedulingEngine(schedule_lst, override_lst).override_schedule_queue())
+    independent_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    combined = render_windows(rotation, overrides, windows)
+    combined_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    covering_start, covering_end = windows[0][0], windows[-1][1]
+    override_lst = [UserEvent(o.name, max(o.start_time, covering_start), min(o.end_time, covering_end))
+                    for o in overrides if o.start_time < covering_end and o.end_time > covering_start]
+    SchedulingEngine(list(rotation.iter_events(covering_start, covering_end)), override_lst).override_schedule_queue()
+    covering_time = time.perf_counter() - start
+
+    assert combined == independent
+    print(f"{WEEKS} independent renders: {independent_time * 1e3:.1f} ms")
+    print(f"render_windows: {combined_time * 1e3:.1f} ms ({independent_time / combined_time:.1f}x faster)")
+    print(f"one render of the covering range: {covering_time * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the numpy backend against the Python engine to find the crossover point.
+
+The workload is a daily rotation over a window sized to fit N minute-granularity
+overrides placed at random. Both backends are timed on the Segment pipeline alone
+(Python generators vs numpy_backend.render_arrays on prebuilt arrays) and end to end
+through SchedulingEngine.override_schedule_queue.
+
+Run from the repository root:
+python -m benchmarks.bench_numpy_backend
+"""
+import random
+import time
+from datetime import datetime, timedelta
+import numpy_backend
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from segment import NameTable
+from user_event import UserEvent
+
+OVERRIDE_COUNTS = [10, 100, 1_000, 10_000, 100_000, 500_000]
+START = datetime(2025, 1, 1)
+
+
+def make_workload(count : int, seed : int = 7) -> tuple[list[UserEvent], list[UserEvent]]:
+    """
+    Build a daily rotation and count overrides of 1 to 120 minutes.
+    The window grows with count so there are about 20 overrides per day.
+    """
+    rng = random.Random(seed)
+    days = max(1, count // 20)
+    end = START + timedelta(days=days)
+    rotation = Rotation(["alice", "bob", "charlie"], START, timedelta(days=1))
+    schedules = list(rotation.iter_events(START, end))
+    overrides = []
+    for _ in range(count):
+        start = START + timedelta(minutes=rng.randrange(days * 24 * 60))
+        overrides.append(UserEvent(rng.choice(["dan", "erin", "frank"]), start, start + timedelta(minutes=rng.randrange(1, 121))))
+    return schedules, overrides
+
+
+def _best_of(func, repeat : int = 3) -> float:
+    """
+    Return the best wall time of repeat calls in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    numpy_backend.require_numpy()
+    print(f"{'overrides':>10} {'py pipeline (ms)':>17} {'np arrays (ms)':>15} {'py engine (ms)':>15} {'np engine (ms)':>15}")
+    for count in OVERRIDE_COUNTS:
+        schedules, overrides = make_workload(count)
+        names = NameTable()
+        s_segments = sorted(names.to_segments(schedules), key=lambda e: e.start)
+        o_segments = sorted(names.to_segments(overrides), key=lambda e: e.start)
+        columns = numpy_backend.segment_columns(s_segments) + numpy_backend.segment_columns(o_segments)
+        engine = SchedulingEngine([], [])
+
+        py_pipeline = _best_of(lambda: list(engine._render(s_segments, o_segments)))
+        np_arrays = _best_of(lambda: numpy_backend.render_arrays(*columns))
+        py_engine = _best_of(lambda: SchedulingEngine(schedules, overrides).override_schedule_queue())
+        np_engine = _best_of(lambda: SchedulingEngine(schedules, overrides, backend="numpy").override_schedule_queue())
+        print(f"{count:>10} {py_pipeline * 1e3:>17.2f} {np_arrays * 1e3:>15.2f} {py_engine * 1e3:>15.2f} {np_engine * 1e3:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
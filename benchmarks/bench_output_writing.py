@@ -0,0 +1,48 @@
+"""
+Benchmark writing a rendered schedule: json.dump of _to_dict records against
+FileHandler.write_to_output_file in each output format.
+
+Run from the repository root:
+python -m benchmarks.bench_output_writing
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from file_handler import FileHandler, OUTPUT_FORMATS, format_utc_timestamp
+from user_event import UserEvent
+
+COUNT = 200_000
+
+
+def _seconds(func) -> float:
+    """
+    Return the wall time of a single call in seconds.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    base = datetime(2025, 1, 1)
+    users = ["alice", "bob", "charlie"]
+    events = [UserEvent(users[i % 3], base + timedelta(minutes=i), base + timedelta(minutes=i + 1)) for i in range(COUNT)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, "output.json")
+        handler = FileHandler(None, None, output_file)
+
+        def json_dump():
+            with open(output_file, "w") as f:
+                json.dump([event._to_dict() for event in events], f, indent=2)
+
+        print(f"json.dump indent=2: {_seconds(json_dump):.3f} s for {COUNT} events")
+        for output_format in OUTPUT_FORMATS:
+            format_utc_timestamp.cache_clear()
+            seconds = _seconds(lambda: handler.write_to_output_file(events, output_format))
+            print(f"write_to_output_file {output_format}: {seconds:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark rotation generation for varying anchor ages and window sizes.
+
+Compares the seeking Rotation.iter_events against walking every handover
+since handover_start_at (the previous read_schedule_file behaviour).
+
+Run from the repository root:
+python -m benchmarks.bench_rotation
+"""
+import timeit
+from datetime import datetime, timedelta
+from rotation import Rotation
+from user_event import UserEvent
+
+ANCHOR_AGES_DAYS = [0, 365, 365 * 10, 365 * 50]
+WINDOW_SIZES_DAYS = [1, 7, 90, 365]
+WINDOW_START = datetime(2025, 11, 7, 17)
+
+
+def walk_from_anchor(rotation : Rotation, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+    """
+    Generate events by walking every handover since handover_start_at.
+    """
+    events = []
+    idx = 0
+    curr_start_time = rotation.handover_start_at
+    while curr_start_time < end_time:
+        curr_end_time = curr_start_time + rotation.interval
+        truncated_start = max(curr_start_time, start_time)
+        truncated_end = min(curr_end_time, end_time)
+        if truncated_start < truncated_end:
+            events.append(UserEvent(rotation.users[idx % len(rotation.users)], truncated_start, truncated_end))
+        curr_start_time += rotation.interval
+        idx += 1
+    return events
+
+
+def _time_per_call(func, repeat : int = 5) -> float:
+    """
+    Return the best per-call time in seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> None:
+    print(f"{'anchor age (d)':>15} {'window (d)':>11} {'walk (us)':>12} {'seek (us)':>12} {'speedup':>9}")
+    for age in ANCHOR_AGES_DAYS:
+        rotation = Rotation(["alice", "bob", "charlie"], WINDOW_START - timedelta(days=age), timedelta(days=1))
+        for window in WINDOW_SIZES_DAYS:
+            end_time = WINDOW_START + timedelta(days=window)
+            walk = _time_per_call(lambda: walk_from_anchor(rotation, WINDOW_START, end_time))
+            seek = _time_per_call(lambda: list(rotation.iter_events(WINDOW_START, end_time)))
+            print(f"{age:>15} {window:>11} {walk * 1e6:>12.1f} {seek * 1e6:>12.1f} {walk / seek:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
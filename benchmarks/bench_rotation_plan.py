@@ -0,0 +1,62 @@
+"""
+Benchmark rendering compiled rotation plans with sparse overrides.
+
+Renders multi-year windows of a 12h follow-the-sun plan and a
+"weekdays alice/bob, weekends charlie" plan with tens to hundreds of overrides,
+once by merging every shift with SchedulingEngine and once with
+render_periods, which slices the periods without overrides from the plan.
+
+Run from the repository root:
+python -m benchmarks.bench_rotation_plan
+"""
+import random
+import timeit
+from datetime import datetime, timedelta
+from rendered_schedule import render_periods
+from rotation import RotationPlan
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+START = datetime(2025, 1, 6, 9)
+YEARS = 10
+OVERRIDE_COUNTS = [30, 300]
+
+PLANS = {
+    "follow_the_sun_12h": [("apac", timedelta(hours=12)), ("emea", timedelta(hours=12)),
+                           ("amer", timedelta(hours=12)), ("emea", timedelta(hours=12))],
+    "weekdays_weekends": [("alice", timedelta(days=5)), ("charlie", timedelta(days=2)),
+                          ("bob", timedelta(days=5)), ("charlie", timedelta(days=2))],
+}
+
+
+def full_render(plan : RotationPlan, overrides : list[UserEvent], start_time : datetime, end_time : datetime) -> list[UserEvent]:
+    """
+    Render the whole window through the engine.
+    """
+    override_lst = [UserEvent(o.name, max(o.start_time, start_time), min(o.end_time, end_time))
+                    for o in sorted(overrides, key=lambda o: o.start_time)
+                    if o.start_time < end_time and o.end_time > start_time]
+    return SchedulingEngine(list(plan.iter_events(start_time, end_time)), override_lst).override_schedule_queue()
+
+
+def main() -> None:
+    rng = random.Random(25)
+    end_time = START + timedelta(days=365 * YEARS)
+    for count in OVERRIDE_COUNTS:
+        overrides = []
+        for _ in range(count):
+            start = START + timedelta(hours=rng.randrange(365 * YEARS * 24))
+            overrides.append(UserEvent(rng.choice(["dan", "erin"]), start, start + timedelta(hours=rng.randrange(1, 48))))
+
+        for name, shifts in PLANS.items():
+            plan = RotationPlan(shifts, START)
+            result = render_periods(plan, overrides, START, end_time)
+            assert result == full_render(plan, overrides, START, end_time)
+            full_time = min(timeit.repeat(lambda: full_render(plan, overrides, START, end_time), number=1, repeat=5))
+            plan_time = min(timeit.repeat(lambda: render_periods(plan, overrides, START, end_time), number=1, repeat=5))
+            print(f"{name}, {count} overrides: {len(result)} events, full merge {full_time * 1e3:.1f} ms, "
+                  f"render_periods {plan_time * 1e3:.1f} ms ({full_time / plan_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark reader throughput of a shared schedule while overrides are applied.
+
+Reader threads query who is on call at random times for a fixed period, first
+with no writer, then with a writer applying override edits back to back. The
+snapshot model (SharedSchedule) is compared with a plain engine behind one
+global lock, where readers wait while the writer edits and re-renders.
+CPython runs one thread at a time, so the writer's own CPU time is taken from
+the readers either way; the difference left is the time readers spend blocked.
+
+Run from the repository root:
+python -m benchmarks.bench_shared_snapshots
+"""
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from rendered_schedule import RenderedSchedule
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from shared_schedule import SharedSchedule
+from user_event import UserEvent
+
+START = datetime(2025, 1, 1)
+DAYS = 90
+READERS = 4
+SECONDS = 2.0
+
+
+def random_override(rng : random.Random) -> UserEvent:
+    """
+    Return an override of 30 minutes to 12 hours somewhere in the window.
+    """
+    start = START + timedelta(minutes=rng.randrange(DAYS * 24 * 60))
+    return UserEvent(rng.choice(["dan", "erin", "frank"]), start, start + timedelta(minutes=rng.randrange(30, 720)))
+
+
+def measure(read, write) -> tuple[float, int]:
+    """
+    Run READERS threads calling read(time) and, if given, one thread calling write(rng)
+    for SECONDS. Return total reads per second and the number of writes.
+    """
+    stop = threading.Event()
+    reads, writes = [0] * READERS, [0]
+
+    def reader(idx : int) -> None:
+        rng = random.Random(idx)
+        while not stop.is_set():
+            read(START + timedelta(minutes=rng.randrange(DAYS * 24 * 60)))
+            reads[idx] += 1
+
+    def writer() -> None:
+        rng = random.Random(99)
+        while not stop.is_set():
+            write(rng)
+            writes[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(idx,)) for idx in range(READERS)]
+    if write is not None:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / SECONDS, writes[0]
+
+
+def main() -> None:
+    rng = random.Random(5)
+    rotation = Rotation(["alice", "bob", "charlie"], START, timedelta(hours=12))
+    schedules = list(rotation.iter_events(START, START + timedelta(days=DAYS)))
+    overrides = [random_override(rng) for _ in range(2_000)]
+
+    shared = SharedSchedule(schedules, overrides)
+    shared_write = lambda rng: shared.add_override(random_override(rng))
+    idle, _ = measure(shared.who_is_on_call, None)
+    busy, writes = measure(shared.who_is_on_call, shared_write)
+    print(f"snapshots, no writer: {idle:,.0f} reads/s")
+    print(f"snapshots, writer:    {busy:,.0f} reads/s ({busy / idle:.0%}) with {writes} writes")
+
+    engine = SchedulingEngine(schedules, overrides)
+    lock = threading.Lock()
+    current = [RenderedSchedule(engine.rendered_events())]
+
+    def locked_read(time : datetime) -> str | None:
+        with lock:
+            return current[0].who_is_on_call(time)
+
+    def locked_write(rng : random.Random) -> None:
+        with lock:
+            engine.add_override(random_override(rng))
+            current[0] = RenderedSchedule(engine.rendered_events())
+
+    idle, _ = measure(locked_read, None)
+    busy, writes = measure(locked_read, locked_write)
+    print(f"global lock, no writer: {idle:,.0f} reads/s")
+    print(f"global lock, writer:    {busy:,.0f} reads/s ({busy / idle:.0%}) with {writes} writes")
+
+
+if __name__ == "__main__":
+    main()
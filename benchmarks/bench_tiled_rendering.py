@@ -0,0 +1,55 @@
+"""
+Benchmark a sliding dashboard window rendered from cached blocks.
+
+Slides a 30 day window forward one hour at a time over a rotation with
+daily handovers and frequent overrides, rendering every position once in a
+single pass and once through TiledRenderer, and compares the mean cost per window.
+
+Run from the repository root:
+python -m benchmarks.bench_tiled_rendering
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from tiled_renderer import TiledRenderer
+from user_event import UserEvent
+
+START = datetime(2025, 1, 1)
+DAYS = 120
+WINDOW = timedelta(days=30)
+SLIDES = 24 * 14
+
+
+def main() -> None:
+    rng = random.Random(12)
+    rotation = Rotation(["alice", "bob", "charlie"], START, timedelta(days=1))
+    overrides = []
+    for _ in range(DAYS * 40):
+        start = START + timedelta(minutes=rng.randrange(DAYS * 24 * 60))
+        overrides.append(UserEvent(rng.choice(["dan", "erin", "frank"]), start, start + timedelta(minutes=rng.randrange(30, 720))))
+    overrides.sort(key=lambda event: event.start_time)
+    windows = [(START + timedelta(hours=hour), START + timedelta(hours=hour) + WINDOW) for hour in range(SLIDES)]
+
+    start = time.perf_counter()
+    for start_time, end_time in windows:
+        override_lst = [UserEvent(o.name, max(o.start_time, start_time), min(o.end_time, end_time))
+                        for o in overrides if o.start_time < end_time and o.end_time > start_time]
+        direct = SchedulingEngine(list(rotation.iter_events(start_time, end_time)), override_lst).override_schedule_queue()
+    direct_time = (time.perf_counter() - start) / SLIDES
+
+    renderer = TiledRenderer(rotation, overrides)
+    start = time.perf_counter()
+    for start_time, end_time in windows:
+        tiled = renderer.render(start_time, end_time)
+    tiled_time = (time.perf_counter() - start) / SLIDES
+
+    assert tiled == direct
+    print(f"single-pass window: {direct_time * 1e3:.2f} ms")
+    print(f"tiled window: {tiled_time * 1e3:.2f} ms ({direct_time / tiled_time:.1f}x faster, "
+          f"{renderer.blocks_rendered} blocks rendered for {SLIDES} windows)")
+
+
+if __name__ == "__main__":
+    main()
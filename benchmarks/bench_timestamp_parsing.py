@@ -0,0 +1,32 @@
+"""
+Benchmark timestamp parsing: strptime against the fast path, cold and cached.
+
+Run from the repository root:
+python -m benchmarks.bench_timestamp_parsing
+"""
+import timeit
+from datetime import datetime, timedelta
+from file_handler import TIMESTAMP_FORMAT, parse_utc_timestamp
+
+COUNT = 100_000
+
+
+def main() -> None:
+    base = datetime(2025, 1, 1)
+    distinct = [(base + timedelta(minutes=i)).strftime(TIMESTAMP_FORMAT) for i in range(COUNT)]
+    repeated = [distinct[i % 1000] for i in range(COUNT)]
+
+    def per_call(func, samples):
+        return min(timeit.repeat(lambda: [func(sample) for sample in samples], number=1, repeat=3)) / COUNT * 1e6
+
+    strptime = lambda sample: datetime.strptime(sample, TIMESTAMP_FORMAT)
+    print(f"strptime:                 {per_call(strptime, distinct):.3f} us")
+    print(f"fast path (uncached):     {per_call(parse_utc_timestamp.__wrapped__, distinct):.3f} us")
+    parse_utc_timestamp.cache_clear()
+    print(f"fast path (distinct):     {per_call(parse_utc_timestamp, distinct):.3f} us")
+    parse_utc_timestamp.cache_clear()
+    print(f"fast path (1k repeated):  {per_call(parse_utc_timestamp, repeated):.3f} us")
+
+
+if __name__ == "__main__":
+    main()
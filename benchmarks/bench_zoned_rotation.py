@@ -0,0 +1,55 @@
+"""
+Benchmark time-zone aware rotations against the UTC path.
+
+Generates multi-year windows of a daily 09:00 Europe/London rotation with
+ZonedRotation.iter_events (one offset per DST period) and compares it with
+a UTC Rotation and with converting every handover's local time to UTC
+through zoneinfo one at a time.
+
+Run from the repository root:
+python -m benchmarks.bench_zoned_rotation
+"""
+import timeit
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from rotation import Rotation, ZonedRotation
+from user_event import UserEvent
+
+WINDOW_START = datetime(2025, 1, 1)
+WINDOW_YEARS = [1, 10, 30]
+USERS = ["alice", "bob", "charlie"]
+
+
+def convert_each_handover(rotation : ZonedRotation, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+    """
+    Generate events by converting every handover's local time to UTC with zoneinfo.
+    """
+    events = []
+    idx = rotation._handover_index(start_time)
+    curr_start_time = rotation._handover_time(idx)
+    while curr_start_time < end_time:
+        local_time = rotation.local_start_at + (idx + 1) * rotation.interval
+        curr_end_time = local_time.replace(tzinfo=rotation.zone).astimezone(timezone.utc).replace(tzinfo=None)
+        truncated_start, truncated_end = max(curr_start_time, start_time), min(curr_end_time, end_time)
+        if truncated_start < truncated_end:
+            events.append(UserEvent(USERS[idx % len(USERS)], truncated_start, truncated_end))
+        curr_start_time = curr_end_time
+        idx += 1
+    return events
+
+
+def main() -> None:
+    utc = Rotation(USERS, datetime(2024, 1, 1, 9), timedelta(days=1))
+    zoned = ZonedRotation(USERS, datetime(2024, 1, 1, 9), timedelta(days=1), ZoneInfo("Europe/London"))
+    print(f"{'years':>5} {'utc ms':>9} {'zoned ms':>9} {'per-event ms':>13}")
+    for years in WINDOW_YEARS:
+        end_time = WINDOW_START + timedelta(days=365 * years)
+        assert list(zoned.iter_events(WINDOW_START, end_time)) == convert_each_handover(zoned, WINDOW_START, end_time)
+        utc_time = min(timeit.repeat(lambda: list(utc.iter_events(WINDOW_START, end_time)), number=1, repeat=5))
+        zoned_time = min(timeit.repeat(lambda: list(zoned.iter_events(WINDOW_START, end_time)), number=1, repeat=5))
+        each_time = min(timeit.repeat(lambda: convert_each_handover(zoned, WINDOW_START, end_time), number=1, repeat=5))
+        print(f"{years:>5} {utc_time * 1e3:>9.2f} {zoned_time * 1e3:>9.2f} {each_time * 1e3:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark suite with machine-readable results and baseline comparison.
+
+For every workload in benchmarks.workloads, times each stage of a render:
+read_schedule, read_overrides (FileHandler), resolve_overlaps, merge, combine
+(the SchedulingEngine stages on prebuilt Segment lists), write (write_to_output_file)
+and end_to_end (render_schedule.py in a subprocess). Timestamp parsing is timed
+once on its own: strptime against the uncached fast path (parse_utc_timestamp) on
+distinct timestamps. Each timing is the best of --repeat runs.
+
+Run from the repository root:
+python -m benchmarks.suite --output results.json
+python -m benchmarks.suite --output results.json --baseline baseline.json --tolerance 0.2
+
+With --baseline, every result more than --tolerance slower than the baseline is
+reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from operator import attrgetter
+from file_handler import TIMESTAMP_FORMAT, FileHandler, format_utc_timestamp, parse_utc_timestamp
+from scheduling_engine import SchedulingEngine
+from segment import NameTable
+from benchmarks.workloads import WORKLOADS, build_workload
+
+RENDER_SCHEDULE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "render_schedule.py")
+
+
+def _best_of(func, repeat : int) -> float:
+    """
+    Return the best wall time of repeat calls in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_workload(name : str, seed : int, scale : float, repeat : int) -> dict[str, dict]:
+    """
+    Time every stage of one workload and return {stage: {"seconds": ..., "events": ...}}.
+    """
+    workload = build_workload(name, seed, scale)
+    start_str, end_str = format_utc_timestamp(workload.start_time), format_utc_timestamp(workload.end_time)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        schedule_file, override_file = workload.write_files(tmpdir)
+        file_handler = FileHandler(schedule_file, override_file, os.path.join(tmpdir, "output.json"))
+
+        schedule_lst = file_handler.read_schedule_file(start_str, end_str)
+        results["read_schedule"] = {"seconds": _best_of(lambda: file_handler.read_schedule_file(start_str, end_str), repeat),
+                                    "events": len(schedule_lst)}
+        override_lst = file_handler.read_override_file(start_str, end_str)
+        results["read_overrides"] = {"seconds": _best_of(lambda: file_handler.read_override_file(start_str, end_str), repeat),
+                                     "events": len(override_lst)}
+
+        engine = SchedulingEngine(schedule_lst, override_lst)
+        names = NameTable()
+        schedules = sorted(names.to_segments(schedule_lst), key=attrgetter("start"))
+        overrides = sorted(names.to_segments(override_lst), key=attrgetter("start"))
+        resolved = list(engine._resolve_override_overlaps(overrides))
+        merged = list(engine._merge_main_schedule(schedules, resolved))
+        combined = list(engine._events_combiner(merged))
+        results["resolve_overlaps"] = {"seconds": _best_of(lambda: list(engine._resolve_override_overlaps(overrides)), repeat),
+                                       "events": len(resolved)}
+        results["merge"] = {"seconds": _best_of(lambda: list(engine._merge_main_schedule(schedules, resolved)), repeat),
+                            "events": len(merged)}
+        results["combine"] = {"seconds": _best_of(lambda: list(engine._events_combiner(merged)), repeat),
+                              "events": len(combined)}
+
+        final_schedule = engine.override_schedule_queue()
+        results["write"] = {"seconds": _best_of(lambda: file_handler.write_to_output_file(final_schedule), repeat),
+                            "events": len(final_schedule)}
+
+        command = [sys.executable, RENDER_SCHEDULE, f"--schedule={schedule_file}", f"--overrides={override_file}",
+                   f"--from={start_str}", f"--until={end_str}"]
+        results["end_to_end"] = {"seconds": _best_of(lambda: subprocess.run(command, cwd=tmpdir, check=True), repeat),
+                                 "events": len(final_schedule)}
+    return results
+
+
+def run_timestamp_parsing(scale : float, repeat : int) -> dict[str, dict]:
+    """
+    Time parsing distinct timestamps with strptime and with the uncached fast path.
+    """
+    base = datetime(2025, 1, 1)
+    samples = [format_utc_timestamp(base + timedelta(minutes=i)) for i in range(int(20_000 * scale))]
+    fast_parse = parse_utc_timestamp.__wrapped__
+    return {"strptime": {"seconds": _best_of(lambda: [datetime.strptime(sample, TIMESTAMP_FORMAT) for sample in samples], repeat),
+                         "events": len(samples)},
+            "fast_path": {"seconds": _best_of(lambda: [fast_parse(sample) for sample in samples], repeat),
+                          "events": len(samples)}}
+
+
+def compare_results(results : dict, baseline : dict, tolerance : float, min_seconds : float = 0.001) -> list[str]:
+    """
+    Return a line for every benchmark slower than its baseline by more than tolerance
+    (e.g. 0.2 for 20%). Benchmarks missing from either side are ignored, and so are
+    benchmarks that stay under min_seconds, whose timings are mostly noise.
+    """
+    regressions = []
+    for key, current in results["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None or previous["seconds"] <= 0 or current["seconds"] < min_seconds:
+            continue
+        ratio = current["seconds"] / previous["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{key}: {previous['seconds'] * 1e3:.2f} ms -> {current['seconds'] * 1e3:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--output", help="write results as json to this file")
+    parser.add_argument("--baseline", help="results json of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against the baseline before failing (default 0.2 = 20%%)")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="ignore benchmarks faster than this when comparing (default 1 ms)")
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS),
+                        help="run only this workload (repeatable, default all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale window lengths and override counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=16)
+    args = parser.parse_args()
+
+    results = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                        "seed": args.seed, "scale": args.scale, "repeat": args.repeat},
+               "results": {}}
+    runs = [(name, run_workload(name, args.seed, args.scale, args.repeat)) for name in args.workload or WORKLOADS]
+    runs.append(("timestamps", run_timestamp_parsing(args.scale, args.repeat)))
+    for name, stages in runs:
+        for stage, result in stages.items():
+            results["results"][f"{name}/{stage}"] = result
+            print(f"{name + '/' + stage:<42} {result['seconds'] * 1e3:10.2f} ms {result['events']:>10} events")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("scale") != args.scale or baseline["meta"].get("seed") != args.seed:
+            print("warning: baseline was run with a different seed or scale", file=sys.stderr)
+        regressions = compare_results(results, baseline, args.tolerance, args.min_ms / 1e3)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Seeded synthetic workloads shared by the benchmark suite.
+
+Each workload describes a rotation (number of users, handover interval, window
+length) and an override pattern:
+- sparse: independent overrides of 30 minutes to 12 hours
+- dense: overrides of 1 hour to 3 days that overlap heavily
+- nested: chains of overrides, each starting and ending inside the previous one
+The same name, seed and scale always produce the same events.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from rotation import Rotation
+from user_event import UserEvent
+
+START = datetime(2025, 1, 1)
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# name -> (users, handover interval in days, window in days, overrides, pattern)
+WORKLOADS = {
+    "small_team_weekly": (4, 7, 365, 500, "sparse"),
+    "many_users_daily": (200, 1, 365 * 2, 20_000, "sparse"),
+    "short_interval_dense": (10, 0.25, 365, 50_000, "dense"),
+    "nested_overrides": (6, 1, 365, 20_000, "nested"),
+    "multi_year_long": (8, 14, 365 * 10, 100_000, "dense"),
+}
+
+
+class Workload:
+    def __init__(self, name : str, rotation : Rotation, overrides : list[UserEvent], start_time : datetime, end_time : datetime) -> None:
+        self.name = name
+        self.rotation = rotation
+        self.overrides = overrides
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def schedule_events(self) -> list[UserEvent]:
+        return list(self.rotation.iter_events(self.start_time, self.end_time))
+
+    def write_files(self, directory : str) -> tuple[str, str]:
+        """
+        Write schedule.json and overrides.json for the workload and return their paths.
+        """
+        schedule_file = os.path.join(directory, "schedule.json")
+        override_file = os.path.join(directory, "overrides.json")
+        with open(schedule_file, "w") as f:
+            json.dump({"users": self.rotation.users,
+                       "handover_start_at": self.rotation.handover_start_at.strftime(TIMESTAMP_FORMAT),
+                       "handover_interval_days": self.rotation.interval / timedelta(days=1)}, f)
+        with open(override_file, "w") as f:
+            json.dump([{"user": event.name,
+                        "start_at": event.start_time.strftime(TIMESTAMP_FORMAT),
+                        "end_at": event.end_time.strftime(TIMESTAMP_FORMAT)} for event in self.overrides], f)
+        return schedule_file, override_file
+
+
+def build_workload(name : str, seed : int = 16, scale : float = 1.0) -> Workload:
+    """
+    Build a named workload. scale multiplies the window length and the override count,
+    e.g. scale=0.1 for a quick run.
+    Raises KeyError for an unknown workload name.
+    """
+    num_users, interval_days, days, num_overrides, pattern = WORKLOADS[name]
+    rng = random.Random(f"{name}:{seed}")
+    days = max(1, round(days * scale))
+    num_overrides = max(1, round(num_overrides * scale))
+    users = [f"user{idx:03d}" for idx in range(num_users)]
+    rotation = Rotation(users, START, timedelta(days=interval_days))
+    overrides = OVERRIDE_PATTERNS[pattern](rng, users, timedelta(days=days), num_overrides)
+    return Workload(name, rotation, overrides, START, START + timedelta(days=days))
+
+
+def _sparse_overrides(rng : random.Random, users : list[str], window : timedelta, count : int) -> list[UserEvent]:
+    overrides = []
+    for _ in range(count):
+        start = START + timedelta(minutes=rng.randrange(window // timedelta(minutes=1)))
+        overrides.append(UserEvent(rng.choice(users), start, start + timedelta(minutes=rng.randrange(30, 12 * 60))))
+    return overrides
+
+
+def _dense_overrides(rng : random.Random, users : list[str], window : timedelta, count : int) -> list[UserEvent]:
+    overrides = []
+    for _ in range(count):
+        start = START + timedelta(minutes=rng.randrange(window // timedelta(minutes=1)))
+        overrides.append(UserEvent(rng.choice(users), start, start + timedelta(minutes=rng.randrange(60, 3 * 24 * 60))))
+    return overrides
+
+
+def _nested_overrides(rng : random.Random, users : list[str], window : timedelta, count : int) -> list[UserEvent]:
+    overrides = []
+    while len(overrides) < count:
+        start = START + timedelta(minutes=rng.randrange(window // timedelta(minutes=1)))
+        end = start + timedelta(minutes=rng.randrange(24 * 60, 5 * 24 * 60))
+        for _ in range(min(rng.randrange(2, 8), count - len(overrides))):
+            overrides.append(UserEvent(rng.choice(users), start, end))
+            span = (end - start) // timedelta(minutes=1)
+            if span < 4:
+                break
+            start += timedelta(minutes=rng.randrange(1, span // 2))
+            end -= timedelta(minutes=rng.randrange(1, span // 4 + 1))
+    return overrides
+
+
+OVERRIDE_PATTERNS = {"sparse": _sparse_overrides, "dense": _dense_overrides, "nested": _nested_overrides}
@@ -0,0 +1,17 @@
+import argparse
+from file_handler import FileHandler
+from override_store import write_binary_overrides
+
+def read_stdin():
+    parser = argparse.ArgumentParser(description="Convert an overrides json file to the binary override format")
+    parser.add_argument("--overrides", required=True, help="overrides json file to read")
+    parser.add_argument("--output", required=True, help="binary override file to write")
+
+    args = parser.parse_args()
+
+    overrides = FileHandler(None, args.overrides, None).read_overrides()
+    count = write_binary_overrides(overrides, args.output)
+    print(f"Wrote {count} overrides to {args.output}")
+
+if __name__ == "__main__":
+    read_stdin()
@@ -1,73 +1,267 @@
-import json 
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from user_event import UserEvent
+from profiler import NULL_PROFILER, NullProfiler, Profiler
+from override_store import BinaryOverrideReader, is_binary_override_file
+from rotation import Rotation, RotationPlan, ZonedRotation
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Iterator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+JSON_CHUNK_SIZE = 1 << 16
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+TIMESTAMP_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_utc_timestamp(date_time_str : str) -> datetime | None:
+    """
+    Parse a "YYYY-MM-DDTHH:MM:SSZ" timestamp into a naive UTC datetime.
+    Strings with exactly that shape go through datetime.fromisoformat, which is
+    several times faster than strptime. Anything else (or anything fromisoformat
+    rejects) falls back to strptime, so accepted inputs and None returns are
+    unchanged. Results are cached since overrides often share timestamps.
+    """
+    if (len(date_time_str) == 20 and date_time_str[19] == "Z" and date_time_str[10] == "T"
+            and date_time_str[4] == "-" and date_time_str[7] == "-"
+            and date_time_str[13] == ":" and date_time_str[16] == ":" and date_time_str.isascii()):
+        try:
+            return datetime.fromisoformat(date_time_str[:19])
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_time_str, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def format_utc_timestamp(time : datetime) -> str:
+    """
+    Format a naive UTC datetime as "YYYY-MM-DDTHH:MM:SSZ".
+    Uses isoformat, which is about 3x faster than strftime, and falls back to
+    strftime whenever the two could differ. Results are cached because every
+    boundary of a back-to-back schedule is written twice (as an end and a start).
+    """
+    if time.microsecond or time.tzinfo is not None or time.year < 1000:
+        return time.strftime(TIMESTAMP_FORMAT)
+    return time.isoformat() + "Z"
+
+# (opening, separator, closing, empty output, record template) for each output format
+OUTPUT_FORMATS = {
+    "pretty": ("[\n  ", ",\n  ", "\n]", "[]", '{\n    "user": %s,\n    "start_at": "%s",\n    "end_at": "%s"\n  }'),
+    "compact": ("[", ",", "]", "[]", '{"user":%s,"start_at":"%s","end_at":"%s"}'),
+    "jsonl": ("", "\n", "\n", "", '{"user":%s,"start_at":"%s","end_at":"%s"}'),
+}
+OUTPUT_CHUNK_RECORDS = 1024
+OUTPUT_BUFFER_SIZE = 1 << 20
 
 class FileHandler:
-    def __init__(self, schedule_file : str, override_file : str, output_file : str) -> None:
+    def __init__(self, schedule_file : str, override_file : str | list[str], output_file : str,
+                 override_workers : int | None = None, profiler : Profiler | NullProfiler = NULL_PROFILER) -> None:
         self.schedule_file = schedule_file
         self.override_file = override_file
         self.output_file = output_file
+        # Worker processes for parsing several override sources; None uses one per CPU, 1 parses inline
+        self.override_workers = override_workers
+        self.profiler = profiler
 
     def read_schedule_file(self, start_time_str: str, end_time_str: str) -> list[UserEvent]:
         """
         Read and generate schedule events from schedule.json:
         1. Validates and parses start/end time strings.
-        2. Generates repeated handover events.
+        2. Generates the handover events that fall inside [start_time, end_time].
         3. Truncates them within [start_time, end_time].
         """
-        start_time = self._convert_str_to_datetime(start_time_str)
-        end_time = self._convert_str_to_datetime(end_time_str)
-        if not (start_time and end_time and start_time < end_time):
-            raise ValueError("Invalid start or end time range provided.")
+        return list(self.iter_schedule_events(start_time_str, end_time_str))
 
+    def iter_schedule_events(self, start_time_str: str, end_time_str: str) -> Iterator[UserEvent]:
+        """
+        Lazily generate schedule events from schedule.json, in start time order.
+        The time range and schedule file are validated before the first event is produced.
+        """
+        start_time, end_time = self.parse_time_range(start_time_str, end_time_str)
+        with self.profiler.stage("read_schedule"):
+            rotation = self.read_rotation()
+        return self.profiler.track("read_schedule", rotation.iter_events(start_time, end_time))
+
+    def read_rotation(self) -> Rotation:
+        """
+        Read the rotation definition from schedule.json.
+        Handovers happen every handover_interval_days or, for sub-day shifts such as
+        12h follow-the-sun rotations, every handover_interval_hours.
+        Instead of users and an interval, a "pattern" of shifts ({"user", "duration_hours"})
+        repeats from handover_start_at, e.g. weekdays alice/bob and weekends charlie;
+        it is compiled once into a RotationPlan.
+        With an optional "timezone" (an IANA name such as "Europe/London"), handovers
+        stay at the local time of handover_start_at in that zone across DST changes
+        (see ZonedRotation); the output remains in UTC. Patterns are always in UTC.
+        Raises ValueError if any required field is missing or invalid.
+        """
         with open(self.schedule_file, "r") as f:
             schedule_data = json.load(f)
 
         users = schedule_data.get("users", [])
         start_str = schedule_data.get("handover_start_at")
         interval_days = schedule_data.get("handover_interval_days", 0)
+        interval_hours = schedule_data.get("handover_interval_hours", 0)
+        pattern = schedule_data.get("pattern")
 
-        if not users or not start_str or interval_days <= 0:
+        if not start_str or (pattern is None and (not users or (interval_days <= 0) == (interval_hours <= 0))):
             raise ValueError("Invalid schedule file: missing required fields.")
 
         base_start_time = self._convert_str_to_datetime(start_str)
         if base_start_time is None:
             raise ValueError("Invalid handover_start_at format in schedule file.")
 
-        schedule_lst: list[UserEvent] = []
-        user_idx = 0
-        curr_start_time = base_start_time
-        delta = timedelta(days=interval_days)
-
-        # Generate and truncate events within [start_time, end_time]
-        while curr_start_time < end_time:
-            curr_end_time = curr_start_time + delta
-            name = users[user_idx % len(users)]
-            truncated_start = max(curr_start_time, start_time)
-            truncated_end = min(curr_end_time, end_time)
-            if truncated_start < truncated_end:
-                schedule_lst.append(UserEvent(name, truncated_start, truncated_end))
-
-            curr_start_time += delta
-            user_idx += 1
+        if pattern is not None:
+            if "timezone" in schedule_data:
+                raise ValueError("Invalid schedule file: timezone is not supported with a pattern.")
+            try:
+                shifts = [(shift["user"], timedelta(hours=shift["duration_hours"])) for shift in pattern]
+            except (KeyError, TypeError):
+                raise ValueError("Invalid schedule file: each pattern shift needs a user and duration_hours.")
+            return RotationPlan(shifts, base_start_time)
 
-        return schedule_lst
+        interval = timedelta(days=interval_days) if interval_days > 0 else timedelta(hours=interval_hours)
+        zone_name = schedule_data.get("timezone")
+        if zone_name is None:
+            return Rotation(users, base_start_time, interval)
+        try:
+            zone = ZoneInfo(zone_name)
+        except (TypeError, ValueError, ZoneInfoNotFoundError):
+            raise ValueError(f"Invalid timezone {zone_name!r} in schedule file.")
+        return ZonedRotation(users, base_start_time, interval, zone)
 
     def read_override_file(self, start_time_str: str, end_time_str: str) -> list[UserEvent]:
         """
         Read override events from override.json:
         1. Validates and parses start/end time strings.
-        2. Truncates each override to within [start_time, end_time].
+        2. Orders overrides by their original start_at (file order on ties).
+        3. Truncates each override to within [start_time, end_time].
+        Ordering before truncating keeps the precedence overrides have in the full
+        file, so any window renders the same as the matching slice of a wider window.
+        Binary override files (see override_store) are memory-mapped and only the
+        records overlapping the window are decoded.
+        With several override sources, see read_overrides for how they are combined.
+        """
+        start_time, end_time = self.parse_time_range(start_time_str, end_time_str)
+        overrides = self._merge_override_sources(start_time, end_time)
+        return list(self.profiler.track("truncate_overrides", self.truncate_events(overrides, start_time, end_time)))
+
+    def read_overrides(self) -> list[UserEvent]:
+        """
+        Read every valid override, untruncated and sorted by start_at (file order on ties).
+        override_file may be a single file, a directory (every file in it, by file name)
+        or a list of files and directories. Each source is parsed and sorted on its own,
+        in parallel worker processes when there is more than one, and the sorted runs are
+        combined with a k-way merge. On equal start_at, overrides from later sources win,
+        exactly as if the sources had been concatenated in order.
+        """
+        return list(self._merge_override_sources(None, None))
+
+    def override_sources(self) -> list[str]:
+        """
+        Return the override files to read, expanding directories into the
+        files they contain (sorted by name, hidden files skipped).
+        """
+        paths = [self.override_file] if isinstance(self.override_file, str) else self.override_file
+        sources = []
+        for path in paths:
+            if os.path.isdir(path):
+                sources.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                               if not name.startswith(".") and os.path.isfile(os.path.join(path, name)))
+            else:
+                sources.append(path)
+        return sources
+
+    def iter_override_file(self, start_time_str: str, end_time_str: str) -> Iterator[UserEvent]:
+        """
+        Lazily read override events from override.json.
+        The file is decoded one array element at a time, so only a small
+        buffer of the file is held in memory regardless of its size.
+        Overrides are yielded in file order, truncated to [start_time, end_time].
+        Binary override files are read through a memory map instead.
+        Several sources are merged lazily by start_at, so each must be sorted.
+        """
+        start_time, end_time = self.parse_time_range(start_time_str, end_time_str)
+        streams = [self._iter_override_source(path, start_time, end_time) for path in self.override_sources()]
+        overrides = streams[0] if len(streams) == 1 else heapq.merge(*streams, key=attrgetter("start_time"))
+        return self.profiler.track("truncate_overrides", self.truncate_events(overrides, start_time, end_time))
+
+    def truncate_events(self, events : Iterable[UserEvent], start_time : datetime, end_time : datetime) -> Iterator[UserEvent]:
+        """
+        Truncate events to within [start_time, end_time], skipping those outside it.
+        Events that already fit are passed through without copying.
+        """
+        for event in events:
+            truncated_start = max(event.start_time, start_time)
+            truncated_end = min(event.end_time, end_time)
+            if truncated_start < truncated_end:
+                if truncated_start == event.start_time and truncated_end == event.end_time:
+                    yield event
+                else:
+                    yield UserEvent(event.name, truncated_start, truncated_end)
+
+    def write_to_output_file(self, schedule_queue : Iterable[UserEvent], output_format : str = "pretty") -> None:
+        """
+        Write schedule to output json file.
+        Records are formatted from a template with cached timestamp and name encodings
+        and written in chunks to a buffered file, so schedule_queue may be a generator.
+        Output formats:
+        - pretty: identical to json.dump(..., indent=2) of the full list (default)
+        - compact: a json list without whitespace
+        - jsonl: one compact json object per line
+        The output file is replaced atomically, so it is never left half written.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}, expected one of {tuple(OUTPUT_FORMATS)}.")
+        opening, separator, closing, empty, template = OUTPUT_FORMATS[output_format]
+        encoded_names: dict[str, str] = {}
+        schedule_queue = self.profiler.count_in("write_output", schedule_queue)
+
+        # Written next to the output and renamed over it only once complete, so an error
+        # raised by schedule_queue mid-stream leaves any previous output untouched
+        tmp_file = f"{self.output_file}.{os.getpid()}.tmp"
+        try:
+            with self.profiler.stage("write_output"), open(tmp_file, "w", buffering=OUTPUT_BUFFER_SIZE) as f:
+                chunk, written = [], False
+                for schedule_event in schedule_queue:
+                    name = encoded_names.get(schedule_event.name)
+                    if name is None:
+                        name = encoded_names[schedule_event.name] = json.dumps(schedule_event.name)
+                    chunk.append(template % (name, format_utc_timestamp(schedule_event.start_time),
+                                             format_utc_timestamp(schedule_event.end_time)))
+                    if len(chunk) == OUTPUT_CHUNK_RECORDS:
+                        f.write((separator if written else opening) + separator.join(chunk))
+                        chunk, written = [], True
+                if chunk:
+                    f.write((separator if written else opening) + separator.join(chunk))
+                    written = True
+                f.write(closing if written else empty)
+            os.replace(tmp_file, self.output_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def parse_time_range(self, start_time_str : str, end_time_str : str) -> tuple[datetime, datetime]:
+        """
+        Parse the requested [start_time, end_time] window.
+        Raises ValueError if either time is invalid or the range is empty.
         """
         start_time = self._convert_str_to_datetime(start_time_str)
         end_time = self._convert_str_to_datetime(end_time_str)
         if not (start_time and end_time and start_time < end_time):
             raise ValueError("Invalid start or end time range provided.")
+        return start_time, end_time
 
-        override_lst: list[UserEvent] = []
-        with open(self.override_file, "r") as f:
-            override_data = json.load(f)
-
+    def _iter_valid_overrides(self, override_data : Iterable[dict]) -> Iterator[UserEvent]:
+        """
+        Validate raw override records, skipping invalid ones.
+        """
         for user in override_data:
             name = user.get("user")
             start_str = user.get("start_at")
@@ -76,25 +270,113 @@ class FileHandler:
             name, start_dt, end_dt = self._validate_input(name, start_str, end_str)
             if not (name and start_dt and end_dt):
                 continue
-            truncated_start = max(start_dt, start_time)
-            truncated_end = min(end_dt, end_time)
+            yield UserEvent(name, start_dt, end_dt)
 
-            if truncated_start < truncated_end:
-                override_lst.append(UserEvent(name, truncated_start, truncated_end))
+    def _merge_override_sources(self, start_time : datetime | None, end_time : datetime | None) -> Iterator[UserEvent]:
+        """
+        Read every override source (in parallel when there are several) and merge
+        the sorted runs by start_at, earlier sources first on ties.
+        Sources parsed in worker processes are profiled as a whole under read_overrides.
+        No sources (e.g. an empty override directory) means no overrides.
+        """
+        sources = self.override_sources()
+        if not sources:
+            return iter(())
+        workers = min(len(sources), self.override_workers or os.cpu_count() or 1)
+        with self.profiler.stage("read_overrides"):
+            if workers <= 1:
+                runs = [self._read_override_source(path, start_time, end_time) for path in sources]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    runs = list(executor.map(self._read_override_source, sources, repeat(start_time), repeat(end_time)))
+        if len(runs) == 1:
+            return iter(runs[0])
+        return self.profiler.track("merge_override_sources", heapq.merge(*runs, key=attrgetter("start_time")))
 
-        return override_lst
-    
-    def write_to_output_file(self, schedule_queue):
+    def _read_override_source(self, path : str, start_time : datetime | None, end_time : datetime | None) -> list[UserEvent]:
         """
-        Write schedule to output json file.
+        Read one override file, sorted by start_at and untruncated.
+        When a window is given, only overrides overlapping it are returned.
         """
-        output_data = []
-        for schedule_event in schedule_queue:
-            output_data.append(schedule_event._to_dict())
+        profiler = self.profiler
+        if is_binary_override_file(path):
+            with BinaryOverrideReader(path) as reader:
+                if start_time is None:
+                    return list(profiler.track("read_binary_overrides", reader.iter_overrides()))
+                overrides = reader.iter_overrides_between(start_time, end_time, truncate=False)
+                return list(profiler.track("read_binary_overrides", overrides))
+
+        with profiler.stage("load_overrides_json"):
+            with open(path, "r") as f:
+                override_data = json.load(f)
+        # Dominated by timestamp parsing (parse_utc_timestamp)
+        overrides = list(profiler.track("parse_overrides", self._iter_valid_overrides(override_data)))
+        with profiler.stage("sort_overrides"):
+            overrides.sort(key=attrgetter("start_time"))
+        if start_time is not None:
+            overrides = [event for event in overrides if event.start_time < end_time and event.end_time > start_time]
+        return overrides
+
+    def _iter_override_source(self, path : str, start_time : datetime, end_time : datetime) -> Iterator[UserEvent]:
+        """
+        Lazily yield the overrides of one file that overlap [start_time, end_time], untruncated.
+        """
+        if is_binary_override_file(path):
+            with BinaryOverrideReader(path) as reader:
+                yield from reader.iter_overrides_between(start_time, end_time, truncate=False)
+        else:
+            yield from self.profiler.track("parse_overrides", self._iter_valid_overrides(self._iter_json_array(path)))
+
+    def _iter_json_array(self, path : str) -> Iterator[object]:
+        """
+        Incrementally decode the elements of a top-level JSON array.
+        Reads the file in fixed-size chunks and decodes one element at a time.
+        Raises ValueError if the file is not a well-formed JSON array.
+        """
+        decoder = json.JSONDecoder()
+        with open(path, "r") as f:
+            buffer, pos = "", 0
+            state = "open"
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos == len(buffer):
+                    chunk = f.read(JSON_CHUNK_SIZE)
+                    if not chunk:
+                        raise ValueError("Invalid JSON array: unexpected end of file.")
+                    buffer, pos = chunk, 0
+                    continue
+
+                char = buffer[pos]
+                if state == "open":
+                    if char != "[":
+                        raise ValueError("Invalid JSON array: expected '['.")
+                    pos += 1
+                    state = "first"
+                elif state != "value" and char == "]":
+                    return
+                elif state == "separator":
+                    if char != ",":
+                        raise ValueError("Invalid JSON array: expected ',' or ']'.")
+                    pos += 1
+                    state = "value"
+                else:
+                    try:
+                        value, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        value, end = None, len(buffer)
+                    # The element may continue past the end of the buffer
+                    if end == len(buffer):
+                        chunk = f.read(JSON_CHUNK_SIZE)
+                        if chunk:
+                            buffer, pos = buffer[pos:] + chunk, 0
+                            continue
+                        if value is None:
+                            raise ValueError("Invalid JSON array: malformed element.")
+                    yield value
+                    pos = end
+                    state = "separator"
 
-        with open(self.output_file, "w") as f:
-            json.dump(output_data, f, indent=2)
-    
     def _validate_input(self, name : str, start_time : str, end_time : str) -> tuple[str | None, datetime | None, datetime | None]:
         """
         Validate input fields.
@@ -107,15 +389,9 @@ class FileHandler:
             return None,None,None
         return name, start_time_dt, end_time_dt
     
-    def _convert_str_to_datetime(self, date_time_str : datetime) -> datetime | None:
+    def _convert_str_to_datetime(self, date_time_str : str) -> datetime | None:
         """
         Convert a string to a datetime object.
         Returns None if parsing fails.
         """
-        try:
-            new_time = datetime.strptime(date_time_str, "%Y-%m-%dT%H:%M:%SZ")
-            return new_time
-        except ValueError:
-            return None
-    
-        
+        return parse_utc_timestamp(date_time_str)
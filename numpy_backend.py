@@ -0,0 +1,143 @@
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for backend="numpy"
+    np = None
+from typing import Iterator
+from segment import Segment, from_epoch_microseconds, to_epoch_microseconds
+
+
+def require_numpy() -> None:
+    """
+    Raise ImportError if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("The numpy backend requires NumPy to be installed.")
+
+
+def segment_columns(segments : list[Segment]):
+    """
+    Return (start, end, owner) int64 arrays for segments, with times in epoch microseconds
+    so that sub-second inputs render exactly as in the Python backend.
+    E.g.
+    [Segment(1970-01-01 00:00:01.5, 1970-01-01 00:00:02, 0)] -> ([1500000], [2000000], [0])
+    """
+    require_numpy()
+    count = len(segments)
+    return (np.fromiter((to_epoch_microseconds(e.start) for e in segments), dtype=np.int64, count=count),
+            np.fromiter((to_epoch_microseconds(e.end) for e in segments), dtype=np.int64, count=count),
+            np.fromiter((e.owner for e in segments), dtype=np.int64, count=count))
+
+
+def to_segments(start, end, owner) -> Iterator[Segment]:
+    """
+    Inverse of segment_columns: yield a Segment per row of the rendered arrays.
+    """
+    return map(Segment, map(from_epoch_microseconds, start.tolist()),
+               map(from_epoch_microseconds, end.tolist()), owner.tolist())
+
+
+def render_arrays(s_start, s_end, s_owner, o_start, o_end, o_owner):
+    """
+    Vectorised counterpart of the SchedulingEngine pipeline.
+    Takes int64 start/end arrays (any one time unit, see segment_columns) and owner-id arrays for the
+    schedule and the overrides and returns (start, end, owner) arrays of the
+    combined final schedule.
+
+    1. Every start and end is collected into sorted unique boundaries,
+       giving elementary intervals on which ownership cannot change.
+    2. The schedule event covering each elementary interval is found with searchsorted.
+    3. The winning override of each elementary interval (the latest in start order)
+       is found with a range-max segment tree built level by level.
+    4. Adjacent intervals with the same owner are combined and gaps are dropped.
+
+    Overrides keep their input order among equal start times, as in the Python engine.
+    Schedule events must not overlap each other.
+    E.g.
+    s = [(A, 1pm, 5pm)]
+    o = [(B, 2pm, 4pm)]
+    boundaries = [1pm, 2pm, 4pm, 5pm]
+    final = [(A, 1pm, 2pm), (B, 2pm, 4pm), (A, 4pm, 5pm)]
+    """
+    require_numpy()
+    s_start, s_end, s_owner = _sorted_non_empty(s_start, s_end, s_owner)
+    o_start, o_end, o_owner = _sorted_non_empty(o_start, o_end, o_owner)
+    if np.any(s_start[1:] < s_end[:-1]):
+        raise ValueError("The numpy backend requires non-overlapping schedule events.")
+
+    bounds = np.concatenate([s_start, s_end, o_start, o_end])
+    bounds.sort()
+    bounds = bounds[np.concatenate(([True], bounds[1:] != bounds[:-1]))] if bounds.size else bounds
+    if bounds.size < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    seg_start, seg_end = bounds[:-1], bounds[1:]
+
+    # Schedule event covering each elementary interval
+    owner = np.full(seg_start.size, -1, dtype=np.int64)
+    sched_idx = np.searchsorted(s_start, seg_start, side="right") - 1
+    covered = sched_idx >= 0
+    covered[covered] = s_end[sched_idx[covered]] > seg_start[covered]
+    owner[covered] = s_owner[sched_idx[covered]]
+
+    # Winning override of each elementary interval
+    if o_start.size:
+        lo = np.searchsorted(bounds, o_start)
+        hi = np.searchsorted(bounds, o_end)
+        winner = _range_max(lo, hi, np.arange(o_start.size, dtype=np.int64), seg_start.size)
+        overridden = winner >= 0
+        owner[overridden] = o_owner[winner[overridden]]
+
+    # Drop gaps and combine consecutive intervals with the same owner
+    present = owner >= 0
+    seg_start, seg_end, owner = seg_start[present], seg_end[present], owner[present]
+    if seg_start.size == 0:
+        return seg_start, seg_end, owner
+    run_start = np.empty(seg_start.size, dtype=bool)
+    run_start[0] = True
+    run_start[1:] = (owner[1:] != owner[:-1]) | (seg_start[1:] != seg_end[:-1])
+    first = np.flatnonzero(run_start)
+    last = np.append(first[1:], seg_start.size) - 1
+    return seg_start[first], seg_end[last], owner[first]
+
+
+def _sorted_non_empty(start, end, owner):
+    """
+    Convert inputs to int64 arrays, drop zero-duration events and stable sort by start.
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    owner = np.asarray(owner, dtype=np.int64)
+    keep = start < end
+    start, end, owner = start[keep], end[keep], owner[keep]
+    order = np.argsort(start, kind="stable")
+    return start[order], end[order], owner[order]
+
+
+def _range_max(lo, hi, values, size):
+    """
+    For each position in [0, size) return the largest value whose range [lo, hi)
+    contains it, or -1 if no range does.
+    Ranges are tagged onto the canonical nodes of an iterative segment tree,
+    processing every range at once per tree level, then each leaf takes the
+    maximum tag along its path to the root.
+    """
+    leaves = 1 << max(0, (size - 1).bit_length())
+    tags = np.full(2 * leaves, -1, dtype=np.int64)
+    l, r = lo + leaves, hi + leaves
+    while l.size:
+        left = (l & 1).astype(bool)
+        np.maximum.at(tags, l[left], values[left])
+        l = l + left
+        right = (r & 1).astype(bool)
+        r = r - right
+        np.maximum.at(tags, r[right], values[right])
+        l, r = l >> 1, r >> 1
+        active = l < r
+        l, r, values = l[active], r[active], values[active]
+
+    node = np.arange(size, dtype=np.int64) + leaves
+    result = tags[node]
+    while node[0] > 1:
+        node = node >> 1
+        result = np.maximum(result, tags[node])
+    return result
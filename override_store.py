@@ -0,0 +1,122 @@
+import json
+import mmap
+import struct
+from datetime import datetime
+from operator import attrgetter
+from typing import Iterable, Iterator
+from segment import NameTable, from_epoch_seconds, to_epoch_seconds
+from user_event import UserEvent
+
+MAGIC = b"OVRBIN01"
+# magic, record count, longest override in seconds, string table offset
+HEADER = struct.Struct("<8sQqQ")
+# start and end in epoch seconds, user id into the string table
+RECORD = struct.Struct("<qqI")
+
+def is_binary_override_file(path : str) -> bool:
+    """
+    Return True if the file starts with the binary override magic bytes.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def write_binary_overrides(events : Iterable[UserEvent], path : str) -> int:
+    """
+    Write overrides to the binary format and return the number of records.
+    Layout: header, fixed-width records sorted by start time (input order on ties,
+    so precedence is unchanged), then the user names as a json list.
+    Times are stored as whole epoch seconds, the precision of the json timestamps.
+    """
+    events = sorted(events, key=attrgetter("start_time"))
+    names = NameTable()
+    max_duration = 0
+    with open(path, "wb") as f:
+        f.seek(HEADER.size)
+        for event in events:
+            start, end = to_epoch_seconds(event.start_time), to_epoch_seconds(event.end_time)
+            max_duration = max(max_duration, end - start)
+            f.write(RECORD.pack(start, end, names.intern(event.name)))
+        string_table_offset = f.tell()
+        f.write(json.dumps(names.names).encode())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(events), max_duration, string_table_offset))
+    return len(events)
+
+
+class BinaryOverrideReader:
+    def __init__(self, path : str) -> None:
+        """
+        Memory-map a binary override file. Only the header and the string table are
+        decoded up front; records are decoded on demand.
+        Raises ValueError if the file is not a binary override file.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError("Invalid binary override file: truncated header.")
+        magic, self.count, self.max_duration, string_table_offset = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or HEADER.size + self.count * RECORD.size != string_table_offset:
+            self.close()
+            raise ValueError("Invalid binary override file.")
+        self.names = json.loads(self._mmap[string_table_offset:])
+
+    def __enter__(self) -> "BinaryOverrideReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def iter_overrides_between(self, start_time : datetime, end_time : datetime, truncate : bool = True) -> Iterator[UserEvent]:
+        """
+        Yield the overrides intersecting [start_time, end_time] in start order,
+        truncated to it unless truncate is False.
+        Binary search finds the first record that can reach start_time (no override is
+        longer than max_duration) and the first record starting at or after end_time;
+        only the records between them are decoded.
+        """
+        start, end = to_epoch_seconds(start_time), to_epoch_seconds(end_time)
+        lo = self._bisect_start(start - self.max_duration)
+        hi = self._bisect_start(end)
+        return self._iter_records(lo, hi, start, end, truncate)
+
+    def iter_overrides(self) -> Iterator[UserEvent]:
+        """
+        Yield every override, untruncated and in start order.
+        """
+        return self._iter_records(0, self.count, None, None, False)
+
+    def _bisect_start(self, start : int) -> int:
+        """
+        Return the index of the first record whose start is at or after start.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if RECORD.unpack_from(self._mmap, HEADER.size + mid * RECORD.size)[0] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _iter_records(self, lo : int, hi : int, start : int | None, end : int | None, truncate : bool) -> Iterator[UserEvent]:
+        """
+        Decode records [lo, hi), skipping those that do not overlap [start, end]
+        when given, and truncating the rest to it if truncate is set.
+        """
+        names = self.names
+        records = self._mmap[HEADER.size + lo * RECORD.size:HEADER.size + hi * RECORD.size]
+        for record_start, record_end, owner in RECORD.iter_unpack(records):
+            if start is not None:
+                if max(record_start, start) >= min(record_end, end):
+                    continue
+                if truncate:
+                    record_start, record_end = max(record_start, start), min(record_end, end)
+            yield UserEvent(names[owner], from_epoch_seconds(record_start), from_epoch_seconds(record_end))
@@ -0,0 +1,165 @@
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Iterable, Iterator
+
+try:
+    import resource
+except ImportError:  # not available on Windows, peak memory is then left out
+    resource = None
+
+
+class Profiler:
+    """
+    Records wall time and event counts per render stage.
+    Time is exclusive: while a stage pulls events from another tracked stage, the
+    time is charged to the upstream stage, so lazily chained generator stages are
+    measured separately even though they run interleaved.
+    """
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, float | int]] = {}
+        # Inputs of the tracked lazy stages currently producing an event, innermost last
+        self._tracking: list[_StageInputs] = []
+        self._current = None
+        self._since = None
+        self._stack = []
+        self._started = perf_counter()
+
+    def stage(self, name : str):
+        """
+        Context manager timing an eager stage, e.g. loading a json file.
+        """
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name : str) -> Iterator[None]:
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def track(self, name : str, events : Iterable) -> Iterator:
+        """
+        Wrap a lazy stage's output, charging the time spent producing each event
+        to the stage and counting the events it yields. If the stage's input was
+        counted with count_in, yielded events that are not input events are counted
+        as events_created (fragments made by splitting).
+        Stages that count inputs take and yield events with a start attribute in start
+        order, so an input that starts before the last yielded event can no longer be
+        passed through and is forgotten; only the events in flight are kept.
+        """
+        stats = self._stats(name)
+        inputs = _StageInputs(name)
+        iterator = iter(events)
+        while True:
+            self._enter(name)
+            self._tracking.append(inputs)
+            try:
+                event = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._tracking.pop()
+                self._leave()
+            stats["events_out"] += 1
+            if inputs.counted:
+                if id(event) not in inputs.events:
+                    stats["events_created"] += 1
+                inputs.forget_before(event.start)
+            yield event
+
+    def count_in(self, name : str, events : Iterable) -> Iterator:
+        """
+        Count the events flowing into a stage without timing them.
+        Inputs of a tracked stage are held until they can no longer be passed through.
+        """
+        stats = self._stats(name)
+        tracking = self._tracking
+        for event in events:
+            stats["events_in"] += 1
+            # The stage pulling this event runs inside its own track wrapper
+            if tracking and tracking[-1].name == name:
+                tracking[-1].add(event)
+            yield event
+
+    def to_dict(self) -> dict:
+        """
+        Return the recorded stats.
+        """
+        stages = {name: dict(stats, seconds=round(stats["seconds"], 6)) for name, stats in self.stages.items()}
+        result = {"total_seconds": round(perf_counter() - self._started, 6), "stages": stages}
+        if resource is not None:
+            # ru_maxrss is in kilobytes on Linux
+            result["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return result
+
+    def _stats(self, name : str) -> dict[str, float | int]:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = {"seconds": 0.0, "events_in": 0, "events_out": 0, "events_created": 0}
+        return stats
+
+    def _enter(self, name : str) -> None:
+        """
+        Switch the clock to stage name, charging the time so far to the current stage.
+        """
+        now = perf_counter()
+        if self._current is not None:
+            self.stages[self._current]["seconds"] += now - self._since
+        self._stack.append(self._current)
+        self._stats(name)
+        self._current, self._since = name, now
+
+    def _leave(self) -> None:
+        """
+        Charge the time since the last switch to the current stage and resume the previous one.
+        """
+        now = perf_counter()
+        self.stages[self._current]["seconds"] += now - self._since
+        self._current, self._since = self._stack.pop(), now
+
+
+class _StageInputs:
+    """
+    The inputs of one tracked lazy stage that it may still yield unchanged, by id.
+    Inputs are held in arrival order so they can be forgotten from the front.
+    """
+    __slots__ = ("name", "events", "pending", "counted")
+
+    def __init__(self, name : str) -> None:
+        self.name = name
+        self.events: dict[int, object] = {}
+        self.pending = deque()
+        self.counted = False
+
+    def add(self, event : object) -> None:
+        self.events[id(event)] = event
+        self.pending.append(event)
+        self.counted = True
+
+    def forget_before(self, start : object) -> None:
+        """
+        Drop the inputs starting before start, which a start-ordered stage can no longer yield.
+        """
+        pending, events = self.pending, self.events
+        while pending and pending[0].start < start:
+            del events[id(pending.popleft())]
+
+
+class NullProfiler:
+    """
+    Profiler that records nothing. Lazy stages are returned unwrapped,
+    so a disabled profiler adds a few calls per render and none per event.
+    """
+    def stage(self, name : str):
+        return nullcontext()
+
+    def track(self, name : str, events : Iterable) -> Iterable:
+        return events
+
+    def count_in(self, name : str, events : Iterable) -> Iterable:
+        return events
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,43 @@
+"""
+Seeded random schedules and overrides shared by the randomized tests.
+
+Times are whole minutes after a base datetime, so the cases stay small enough for
+brute-force oracles while still producing gaps, touching events, nesting and ties.
+The same Random state always produces the same events.
+"""
+import random
+from datetime import datetime, timedelta
+from user_event import UserEvent
+
+
+def random_schedule(rng : random.Random, names : list[str], base : datetime, max_events : int,
+                    min_length : int = 1, max_first_start : int = 0) -> list[UserEvent]:
+    """
+    Return up to max_events - 1 sorted, non-overlapping schedule events of min_length to
+    59 minutes, back to back two times in three and otherwise separated by a gap of up
+    to 19 minutes. The first event starts up to max_first_start minutes after base.
+    E.g.
+    [(alice, +3m, +40m), (bob, +40m, +52m), (alice, +60m, +61m)]
+    """
+    events, curr = [], rng.randrange(0, max_first_start) if max_first_start else 0
+    for _ in range(rng.randrange(0, max_events)):
+        length = rng.randrange(min_length, 60)
+        events.append(UserEvent(rng.choice(names), base + timedelta(minutes=curr), base + timedelta(minutes=curr + length)))
+        curr += length + rng.choice([0, 0, rng.randrange(1, 20)])
+    return events
+
+
+def random_override(rng : random.Random, names : list[str], base : datetime, horizon : int) -> UserEvent:
+    """
+    Return an override starting within horizon minutes of base and lasting 0 to 89 minutes.
+    """
+    start = rng.randrange(0, horizon)
+    return UserEvent(rng.choice(names), base + timedelta(minutes=start), base + timedelta(minutes=start + rng.randrange(0, 90)))
+
+
+def random_overrides(rng : random.Random, names : list[str], base : datetime, max_count : int, horizon : int) -> list[UserEvent]:
+    """
+    Return up to max_count - 1 overrides from random_override, in generation order
+    (not sorted), so they overlap, nest, touch and share start times arbitrarily.
+    """
+    return [random_override(rng, names, base, horizon) for _ in range(rng.randrange(0, max_count))]
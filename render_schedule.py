@@ -1,30 +1,124 @@
 import argparse
-from file_handler import FileHandler
+import cProfile
+import json
+from aggregation import fairness_summary
+from file_handler import FileHandler, OUTPUT_FORMATS, parse_utc_timestamp
+from profiler import NULL_PROFILER, NullProfiler, Profiler
+from rendered_schedule import render_periods
+from rotation import RotationPlan
 from scheduling_engine import SchedulingEngine
+from tiled_renderer import TiledRenderer
 
 def read_stdin():
     parser = argparse.ArgumentParser(description="Render schedule with overrides")
+    parser.add_argument("command", nargs="?", choices=("render", "aggregate"), default="render",
+                        help="render (default) writes the schedule to output.json; aggregate prints per-user "
+                             "on-call hours, shift counts and fairness stats as json without writing the schedule")
     parser.add_argument("--schedule", required=True)
-    parser.add_argument("--overrides", required=True)
+    parser.add_argument("--overrides", required=True, nargs="+",
+                        help="override files or directories; on equal start_at, later sources win")
+    parser.add_argument("--override-workers", type=int,
+                        help="processes used to parse several override sources (default: one per CPU)")
     parser.add_argument("--from", dest="from_time", required=True)
-    parser.add_argument("--until", required=True)
+    window_end = parser.add_mutually_exclusive_group(required=True)
+    window_end.add_argument("--until")
+    window_end.add_argument("--next", type=int, metavar="N",
+                            help="render the next N on-call segments from --from instead of a fixed window")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream events from the input files to output.json without building full lists "
+                             "(overrides must be sorted by start_at)")
+    parser.add_argument("--tiled", action="store_true",
+                        help="render in blocks of one handover interval and stitch them together")
+    parser.add_argument("--output-format", choices=sorted(OUTPUT_FORMATS), default="pretty",
+                        help="pretty (indented json, default), compact (json without whitespace) or jsonl (one event per line)")
+
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write per-stage wall time, event counts and peak memory as json to PATH")
+    parser.add_argument("--profile-pstats", metavar="PATH",
+                        help="also run cProfile and dump pstats to PATH (requires --profile)")
 
     args = parser.parse_args()
+    if args.profile_pstats and not args.profile:
+        parser.error("--profile-pstats requires --profile")
+    if args.command == "aggregate" and args.until is None:
+        parser.error("aggregate requires --until")
+
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    output_file_name = "output.json"
+    file_handler = FileHandler(args.schedule, args.overrides, output_file_name, args.override_workers, profiler)
 
-    schedule_file = args.schedule
-    overrides_file = args.overrides
-    start_time = args.from_time 
+    if not args.profile:
+        render(args, file_handler, profiler)
+        return
+
+    c_profile = cProfile.Profile() if args.profile_pstats else None
+    if c_profile:
+        c_profile.enable()
+    try:
+        render(args, file_handler, profiler)
+    finally:
+        if c_profile:
+            c_profile.disable()
+            c_profile.dump_stats(args.profile_pstats)
+        stats = profiler.to_dict()
+        stats["timestamp_cache"] = parse_utc_timestamp.cache_info()._asdict()
+        with open(args.profile, "w") as f:
+            json.dump(stats, f, indent=2)
+
+def render(args : argparse.Namespace, file_handler : FileHandler, profiler : Profiler | NullProfiler) -> None:
+    """
+    Render [--from, --until] into output.json in the mode selected by the flags.
+    """
+    start_time = args.from_time
     end_time = args.until
 
-    output_file_name = "output.json"
-    file_handler = FileHandler(schedule_file, overrides_file, output_file_name)
+    if args.command == "aggregate":
+        engine = SchedulingEngine(file_handler.read_schedule_file(start_time, end_time),
+                                  file_handler.read_override_file(start_time, end_time), profiler=profiler)
+        stats = engine.aggregate_by_user()
+        print(json.dumps({"users": {name: stats[name]._to_dict() for name in sorted(stats)},
+                          "fairness": fairness_summary(stats)}, indent=2))
+        return
+
+    if args.next is not None:
+        from_time = parse_utc_timestamp(start_time)
+        if from_time is None or args.next < 0:
+            raise ValueError("Invalid --from time or --next count provided.")
+        engine = SchedulingEngine.from_rotation(file_handler.read_rotation(), file_handler.read_overrides(),
+                                                from_time, profiler=profiler)
+        file_handler.write_to_output_file(engine.next_segments(args.next), args.output_format)
+        return
+
+    if args.stream:
+        schedule_events = file_handler.iter_schedule_events(start_time, end_time)
+        override_events = file_handler.iter_override_file(start_time, end_time)
+        engine = SchedulingEngine(schedule_events, override_events, profiler=profiler)
+        file_handler.write_to_output_file(engine.iter_schedule_queue(), args.output_format)
+        return
+
+    if args.tiled:
+        renderer = TiledRenderer(file_handler.read_rotation(), file_handler.read_override_file(start_time, end_time))
+        with profiler.stage("render_tiled"):
+            final_schedule_queue = renderer.render(*file_handler.parse_time_range(start_time, end_time))
+        file_handler.write_to_output_file(final_schedule_queue, args.output_format)
+        return
+
+    rotation = file_handler.read_rotation()
+    if isinstance(rotation, RotationPlan):
+        # Periods without overrides are sliced from the compiled plan instead of merged
+        with profiler.stage("render_periods"):
+            final_schedule_queue = render_periods(rotation, file_handler.read_override_file(start_time, end_time),
+                                                  *file_handler.parse_time_range(start_time, end_time))
+        file_handler.write_to_output_file(final_schedule_queue, args.output_format)
+        return
+
     schedule_lst = file_handler.read_schedule_file(start_time, end_time)
     override_lst = file_handler.read_override_file(start_time, end_time)
 
-    engine = SchedulingEngine(schedule_lst, override_lst)
+    engine = SchedulingEngine(schedule_lst, override_lst, profiler=profiler)
     final_schedule_queue = engine.override_schedule_queue()
 
-    file_handler.write_to_output_file(final_schedule_queue)
+    file_handler.write_to_output_file(final_schedule_queue, args.output_format)
 
 if __name__ == "__main__":
-    read_stdin()
\ No newline at end of file
+    read_stdin()
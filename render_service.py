@@ -0,0 +1,337 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+from batch_render import read_manifest
+from file_handler import FileHandler, parse_utc_timestamp
+from rendered_schedule import OverrideIndex, RenderedSchedule, who_is_on_call
+from rotation import Rotation
+from tiled_renderer import DEFAULT_MAX_CACHED_EVENTS, TiledRenderer
+from user_event import UserEvent
+
+
+class ParsedRotation:
+    """
+    A rotation and its overrides parsed from disk, with the file state they were read from.
+    version changes whenever the content of either file changes.
+    """
+    def __init__(self, rotation : Rotation, overrides : list[UserEvent], stats : tuple, digest : str, version : int,
+                 max_cached_events : int = DEFAULT_MAX_CACHED_EVENTS) -> None:
+        self.rotation = rotation
+        self.overrides = overrides
+        self.override_index = OverrideIndex(overrides)
+        self.tiles = TiledRenderer(rotation, overrides, max_cached_events=max_cached_events)
+        self.stats = stats
+        self.digest = digest
+        self.version = version
+
+
+class CachedWindow:
+    """
+    A rendered [start_time, end_time] window and its lazily encoded json response.
+    """
+    __slots__ = ("start_time", "end_time", "schedule", "body")
+
+    def __init__(self, start_time : datetime, end_time : datetime, schedule : RenderedSchedule) -> None:
+        self.start_time = start_time
+        self.end_time = end_time
+        self.schedule = schedule
+        self.body = None
+
+
+class WindowIndex:
+    """
+    The cached windows of one rotation, sorted by start time, for finding a window
+    that covers a range with two bisects.
+    reach[i] is the latest end among the first i + 1 windows, so the first window
+    whose end reaches a time is found by bisecting reach, and it covers the range
+    if it also starts early enough.
+    """
+    def __init__(self) -> None:
+        self.starts: list[datetime] = []
+        self.windows: list[CachedWindow] = []
+        self.reach: list[datetime] = []
+
+    def add(self, window : CachedWindow) -> None:
+        idx = bisect_right(self.starts, window.start_time)
+        self.starts.insert(idx, window.start_time)
+        self.windows.insert(idx, window)
+        self._update_reach(idx)
+
+    def remove(self, window : CachedWindow) -> None:
+        idx = bisect_left(self.starts, window.start_time)
+        while self.windows[idx] is not window:
+            idx += 1
+        del self.starts[idx], self.windows[idx]
+        self._update_reach(idx)
+
+    def covering(self, start_time : datetime, end_time : datetime) -> CachedWindow | None:
+        """
+        Return a window with start <= start_time and end_time <= end, or None.
+        """
+        idx = bisect_left(self.reach, end_time)
+        if idx < len(self.starts) and self.starts[idx] <= start_time:
+            return self.windows[idx]
+        return None
+
+    def at(self, time : datetime) -> CachedWindow | None:
+        """
+        Return a window with start <= time < end, or None.
+        """
+        idx = bisect_right(self.reach, time)
+        if idx < len(self.starts) and self.starts[idx] <= time:
+            return self.windows[idx]
+        return None
+
+    def _update_reach(self, idx : int) -> None:
+        """
+        Recompute reach from position idx on.
+        """
+        del self.reach[idx:]
+        reach = self.reach[idx - 1] if idx else None
+        for window in self.windows[idx:]:
+            reach = window.end_time if reach is None or window.end_time > reach else reach
+            self.reach.append(reach)
+
+
+class RenderCache:
+    def __init__(self, rotations : dict[str, tuple[str, str | list[str]]], max_cached_events : int = DEFAULT_MAX_CACHED_EVENTS) -> None:
+        """
+        Keep parsed rotations and rendered windows in memory.
+        rotations maps a rotation name to its (schedule file, overrides), where overrides
+        is a file, a directory of files or a list of them.
+        Rendered windows live in an LRU cache holding at most max_cached_events events,
+        and each rotation's blocks (see TiledRenderer) in one of the same size.
+        """
+        self.rotations = rotations
+        self.max_cached_events = max_cached_events
+        self.cached_events = 0
+        self._parsed: dict[str, ParsedRotation] = {}
+        self._windows: OrderedDict[tuple, CachedWindow] = OrderedDict()
+        # The cached windows of each rotation's current version, by start time
+        self._window_index: dict[str, WindowIndex] = {}
+
+    def render(self, name : str, start_time : datetime, end_time : datetime) -> CachedWindow:
+        """
+        Return the rendered window [start_time, end_time] of a rotation.
+        1. An exact cached window is returned as-is.
+        2. Otherwise a cached wider window of the same rotation is sliced.
+        3. Otherwise the window is stitched from cached blocks (see TiledRenderer) and cached,
+           so a window sliding forward only renders the blocks it newly reaches.
+        Raises KeyError for an unknown rotation and ValueError for an invalid range.
+        """
+        if not start_time < end_time:
+            raise ValueError("Invalid start or end time range provided.")
+        parsed = self._load(name)
+        key = (name, parsed.version, start_time, end_time)
+        window = self._windows.get(key)
+        if window is not None:
+            self._windows.move_to_end(key)
+            return window
+
+        wider = self._find_covering_window(name, start_time, end_time)
+        if wider is not None:
+            events = wider.schedule.clip(start_time, end_time)
+        else:
+            events = parsed.tiles.render(start_time, end_time)
+
+        window = CachedWindow(start_time, end_time, RenderedSchedule(events))
+        self._store(key, window)
+        return window
+
+    def who_is_on_call(self, name : str, time : datetime) -> str | None:
+        """
+        Answer from any cached window covering time, otherwise from the rotation
+        definition and the overrides without rendering.
+        """
+        parsed = self._load(name)
+        index = self._window_index.get(name)
+        window = index.at(time) if index is not None else None
+        if window is not None:
+            return window.schedule.who_is_on_call(time)
+        return who_is_on_call(parsed.rotation, parsed.override_index, time)
+
+    def _find_covering_window(self, name : str, start_time : datetime, end_time : datetime) -> CachedWindow | None:
+        """
+        Return a cached window of the rotation that covers [start_time, end_time].
+        Every window of the rotation's current version renders the same schedule, so any covering one will do.
+        """
+        index = self._window_index.get(name)
+        return index.covering(start_time, end_time) if index is not None else None
+
+    def _store(self, key : tuple, window : CachedWindow) -> None:
+        """
+        Insert a window and evict least recently used windows until the cache fits.
+        A single window larger than the limit is still returned but not kept.
+        """
+        size = len(window.schedule)
+        if size > self.max_cached_events:
+            return
+        self._windows[key] = window
+        self._window_index.setdefault(key[0], WindowIndex()).add(window)
+        self.cached_events += size
+        while self.cached_events > self.max_cached_events:
+            (evicted_name, *_), evicted = self._windows.popitem(last=False)
+            self._window_index[evicted_name].remove(evicted)
+            self.cached_events -= len(evicted.schedule)
+
+    def _load(self, name : str) -> ParsedRotation:
+        """
+        Return the parsed rotation, re-reading it only if a file changed on disk.
+        The override side may be a file, a directory or a list of them, as for
+        FileHandler.override_sources; each source is stat-ed once. A changed set of
+        sources, mtime or size triggers a content hash; if the hash is unchanged the
+        parsed data (and every cached window) is kept.
+        """
+        schedule_file, override_file = self.rotations[name]
+        file_handler = FileHandler(schedule_file, override_file, None)
+        paths = [schedule_file] + file_handler.override_sources()
+        stats = tuple((path, stat.st_mtime_ns, stat.st_size) for path, stat in zip(paths, map(os.stat, paths)))
+        parsed = self._parsed.get(name)
+        if parsed is not None and parsed.stats == stats:
+            return parsed
+
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(path.encode())
+            digest.update(b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+                digest.update(b"\0")
+        if parsed is not None and parsed.digest == digest.hexdigest():
+            parsed.stats = stats
+            return parsed
+
+        version = parsed.version + 1 if parsed else 0
+        self._parsed[name] = ParsedRotation(file_handler.read_rotation(), file_handler.read_overrides(),
+                                            stats, digest.hexdigest(), version, self.max_cached_events)
+        if parsed is not None:
+            self._drop_windows(name)
+        return self._parsed[name]
+
+    def _drop_windows(self, name : str) -> None:
+        """
+        Remove every cached window of a rotation.
+        """
+        for key in [key for key in self._windows if key[0] == name]:
+            self.cached_events -= len(self._windows.pop(key).schedule)
+        self._window_index.pop(name, None)
+
+
+class RenderService:
+    """
+    Minimal asyncio HTTP/1.1 server in front of a RenderCache.
+    GET /render?rotation=NAME&from=T1&until=T2 -> rendered events as json
+    GET /on-call?rotation=NAME&at=T           -> {"user": NAME or null}
+    rotation may be omitted when only one rotation is served.
+    Connections are kept alive so repeated queries skip the TCP handshake.
+    """
+    def __init__(self, cache : RenderCache) -> None:
+        self.cache = cache
+
+    async def serve_tcp(self, host : str, port : int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def serve_unix(self, path : str) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self._handle_connection, path)
+
+    async def _handle_connection(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    if header.lower().startswith(b"connection:") and b"close" in header.lower():
+                        keep_alive = False
+                status, body = self.handle_request(request_line.decode("latin-1"))
+                writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n"
+                             % (status, HTTP_REASONS[status], len(body),
+                                b"" if keep_alive else b"Connection: close\r\n") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle_request(self, request_line : str) -> tuple[int, bytes]:
+        """
+        Answer one request line and return (status, json body).
+        """
+        parts = request_line.split()
+        if len(parts) < 2 or parts[0] != "GET":
+            return 400, b'{"error": "only GET requests are supported"}'
+        url = urlsplit(parts[1])
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        name = params.get("rotation")
+        if name is None and len(self.cache.rotations) == 1:
+            name = next(iter(self.cache.rotations))
+        if name not in self.cache.rotations:
+            return 404, b'{"error": "unknown rotation"}'
+
+        try:
+            if url.path == "/render":
+                start_time = parse_utc_timestamp(params.get("from", ""))
+                end_time = parse_utc_timestamp(params.get("until", ""))
+                if not (start_time and end_time):
+                    return 400, b'{"error": "from and until must be YYYY-MM-DDTHH:MM:SSZ timestamps"}'
+                window = self.cache.render(name, start_time, end_time)
+                if window.body is None:
+                    window.body = json.dumps([event._to_dict() for event in window.schedule.events]).encode()
+                return 200, window.body
+            if url.path == "/on-call":
+                time = parse_utc_timestamp(params.get("at", ""))
+                if not time:
+                    return 400, b'{"error": "at must be a YYYY-MM-DDTHH:MM:SSZ timestamp"}'
+                return 200, json.dumps({"user": self.cache.who_is_on_call(name, time)}).encode()
+        except ValueError as e:
+            return 400, json.dumps({"error": str(e)}).encode()
+        except OSError as e:
+            return 500, json.dumps({"error": str(e)}).encode()
+        return 404, b'{"error": "unknown path"}'
+
+
+HTTP_REASONS = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 500: b"Internal Server Error"}
+
+async def run_service(cache : RenderCache, host : str, port : int, socket_path : str | None) -> None:
+    service = RenderService(cache)
+    server = await (service.serve_unix(socket_path) if socket_path else service.serve_tcp(host, port))
+    async with server:
+        await server.serve_forever()
+
+def read_stdin():
+    parser = argparse.ArgumentParser(description="Serve rendered schedules from an in-memory cache")
+    rotations = parser.add_mutually_exclusive_group(required=True)
+    rotations.add_argument("--manifest", help="serve every rotation listed in a batch_render manifest")
+    rotations.add_argument("--schedule", help="serve a single rotation (requires --overrides)")
+    parser.add_argument("--overrides")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-cached-events", type=int, default=DEFAULT_MAX_CACHED_EVENTS)
+
+    args = parser.parse_args()
+
+    if args.manifest:
+        rotations = {job["name"]: (job["schedule"], job["overrides"]) for job in read_manifest(args.manifest)}
+    elif args.overrides:
+        rotations = {"default": (args.schedule, args.overrides)}
+    else:
+        parser.error("--schedule requires --overrides")
+
+    cache = RenderCache(rotations, args.max_cached_events)
+    asyncio.run(run_service(cache, args.host, args.port, args.socket))
+
+if __name__ == "__main__":
+    read_stdin()
@@ -0,0 +1,233 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from operator import attrgetter
+from typing import Iterable
+from rotation import Rotation, RotationPlan
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+class RenderedSchedule:
+    def __init__(self, events : list[UserEvent]) -> None:
+        """
+        Index a rendered schedule for point and range queries.
+        events must be sorted and non-overlapping, as returned by
+        SchedulingEngine.override_schedule_queue.
+        """
+        self.events = events
+        self.starts = [event.start_time for event in events]
+        self.ends = [event.end_time for event in events]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def event_at(self, time : datetime) -> UserEvent | None:
+        """
+        Return the event covering the given time, or None if nobody is on call.
+        O(log n) via bisect over the start times.
+        """
+        idx = bisect_right(self.starts, time) - 1
+        if idx >= 0 and time < self.ends[idx]:
+            return self.events[idx]
+        return None
+
+    def who_is_on_call(self, time : datetime) -> str | None:
+        """
+        Return the name of the user on call at the given time, or None.
+        """
+        event = self.event_at(time)
+        return event.name if event else None
+
+    def between(self, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+        """
+        Return the events that overlap [start_time, end_time].
+        The result is a slice of the rendered list, so events at the edges are not truncated.
+        E.g.
+        events = [(A, 1pm, 3pm), (B, 3pm, 5pm), (C, 5pm, 7pm)]
+        between(2pm, 4pm) = [(A, 1pm, 3pm), (B, 3pm, 5pm)]
+        """
+        lo = bisect_right(self.ends, start_time)
+        hi = bisect_left(self.starts, end_time)
+        return self.events[lo:hi]
+
+    def clip(self, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+        """
+        Return the events inside [start_time, end_time], truncating the ones at the edges.
+        Equal to rendering [start_time, end_time] directly when this schedule covers it.
+        E.g.
+        events = [(A, 1pm, 3pm), (B, 3pm, 5pm), (C, 5pm, 7pm)]
+        clip(2pm, 4pm) = [(A, 2pm, 3pm), (B, 3pm, 4pm)]
+        """
+        events = self.between(start_time, end_time)
+        if events and events[0].start_time < start_time:
+            first = events[0]
+            events[0] = UserEvent(first.name, start_time, first.end_time)
+        if events and events[-1].end_time > end_time:
+            last = events[-1]
+            events[-1] = UserEvent(last.name, last.start_time, end_time)
+        return events
+
+
+class OverrideIndex:
+    def __init__(self, overrides : Iterable[UserEvent]) -> None:
+        """
+        Index untruncated overrides for repeated point lookups.
+        Overrides are sorted by start time (input order on ties) and the longest
+        override's duration is kept, so only overrides starting within that
+        duration before a time can cover it.
+        """
+        self.overrides = sorted(overrides, key=attrgetter("start_time"))
+        self.starts = [override.start_time for override in self.overrides]
+        self.max_duration = max((override.end_time - override.start_time for override in self.overrides), default=None)
+
+    def override_at(self, time : datetime) -> UserEvent | None:
+        """
+        Return the override that decides who is on call at time, or None.
+        The override covering time that starts last wins (the later one in the input
+        on ties, matching the engine's precedence). Found with a bisect and a backward
+        scan over the overrides starting in (time - max_duration, time].
+        """
+        idx = bisect_right(self.starts, time) - 1
+        if idx < 0:
+            return None
+        earliest = time - self.max_duration
+        overrides, starts = self.overrides, self.starts
+        while idx >= 0 and starts[idx] > earliest:
+            if time < overrides[idx].end_time:
+                return overrides[idx]
+            idx -= 1
+        return None
+
+
+def who_is_on_call(rotation : Rotation, overrides : OverrideIndex | Iterable[UserEvent], time : datetime) -> str | None:
+    """
+    Answer "who is on call at time" without rendering a schedule.
+    The override covering time that starts last wins (the later one in the input
+    on ties, matching the engine's precedence), otherwise the rotation decides
+    with arithmetic. Pass an OverrideIndex built once for repeated lookups; any
+    other iterable of overrides is indexed for this call.
+    """
+    if not isinstance(overrides, OverrideIndex):
+        overrides = OverrideIndex(overrides)
+    winner = overrides.override_at(time)
+    if winner is not None:
+        return winner.name
+    return rotation.who_is_on_call(time)
+
+
+def render_windows(rotation : Rotation, overrides : Iterable[UserEvent], windows : list[tuple[datetime, datetime]]) -> list[list[UserEvent]]:
+    """
+    Render several [start_time, end_time] windows of the same rotation at once.
+    overrides must be untruncated (see FileHandler.read_overrides).
+    Overlapping or touching windows are coalesced into their union, each part of the
+    union is merged once, and every window is clipped out of its part. The results are
+    identical to rendering each window on its own and are returned in window order.
+    Raises ValueError if a window is empty.
+    E.g.
+    windows = [(1st, 8th), (8th, 15th), (10th, 12th), (1st Mar, 8th Mar)]
+    renders [1st, 15th] and [1st Mar, 8th Mar] once each.
+    """
+    for start_time, end_time in windows:
+        if not start_time < end_time:
+            raise ValueError("Invalid start or end time range provided.")
+
+    union = []
+    for start_time, end_time in sorted(windows):
+        if union and start_time <= union[-1][1]:
+            union[-1][1] = max(union[-1][1], end_time)
+        else:
+            union.append([start_time, end_time])
+    union_starts = [start_time for start_time, _ in union]
+    union_ends = [end_time for _, end_time in union]
+
+    # One pass over the overrides in precedence order, truncating each to the union parts it overlaps.
+    # Overrides starting after the union are skipped by bisecting.
+    overrides = sorted(overrides, key=attrgetter("start_time"))
+    override_lsts = [[] for _ in union]
+    for override in overrides[:bisect_left(overrides, union_ends[-1], key=attrgetter("start_time"))]:
+        idx = bisect_right(union_ends, override.start_time)
+        while idx < len(union) and union_starts[idx] < override.end_time:
+            truncated_start = max(override.start_time, union_starts[idx])
+            truncated_end = min(override.end_time, union_ends[idx])
+            if truncated_start < truncated_end:
+                override_lsts[idx].append(UserEvent(override.name, truncated_start, truncated_end))
+            idx += 1
+
+    rendered = []
+    for (start_time, end_time), override_lst in zip(union, override_lsts):
+        schedule_lst = list(rotation.iter_events(start_time, end_time))
+        rendered.append(RenderedSchedule(SchedulingEngine(schedule_lst, override_lst).override_schedule_queue()))
+
+    return [rendered[bisect_right(union_starts, start_time) - 1].clip(start_time, end_time) for start_time, end_time in windows]
+
+
+def _extend_joined(final_schedule : list[UserEvent], events : Iterable[UserEvent]) -> None:
+    """
+    Append combined events to final_schedule, joining the first one to the last
+    event already there when they belong to the same user and touch.
+    """
+    events = iter(events)
+    first = next(events, None)
+    if first is None:
+        return
+    if final_schedule and final_schedule[-1].name == first.name and final_schedule[-1].end_time == first.start_time:
+        first = UserEvent(first.name, final_schedule.pop().start_time, first.end_time)
+    final_schedule.append(first)
+    final_schedule.extend(events)
+
+
+def render_periods(plan : RotationPlan, overrides : Iterable[UserEvent], start_time : datetime, end_time : datetime) -> list[UserEvent]:
+    """
+    Render [start_time, end_time] of a compiled rotation plan, skipping the merge for
+    every period that no override touches.
+    overrides must be untruncated (see FileHandler.read_overrides) or truncated to
+    [start_time, end_time] in start order (see FileHandler.read_override_file). The periods touched
+    by overrides are grouped into stretches of overlapping or adjacent periods and only
+    those are merged by the engine; everything between them is copied from the plan,
+    whose events are already combined. Events of the same user meeting at a stretch edge are
+    joined, so the result is identical to rendering the whole window with the engine.
+    Raises ValueError if start_time is not before end_time.
+    E.g.
+    a weekly plan over a year with overrides in weeks 3 and 30:
+    weeks 3 and 30 are merged, the other 50 weeks are sliced from the plan.
+    """
+    if not start_time < end_time:
+        raise ValueError("Invalid start or end time range provided.")
+
+    # Group the overrides, in precedence order, by stretches of periods they touch
+    stretches = []
+    for override in sorted(overrides, key=attrgetter("start_time")):
+        truncated_start, truncated_end = max(override.start_time, start_time), min(override.end_time, end_time)
+        if not truncated_start < truncated_end:
+            continue
+        first_period = plan.period_index(truncated_start)
+        # The period containing the override's last instant
+        last_period = plan.period_index(truncated_end)
+        if plan.period_start(last_period) == truncated_end:
+            last_period -= 1
+        override = UserEvent(override.name, truncated_start, truncated_end)
+        if stretches and first_period <= stretches[-1][1] + 1:
+            stretches[-1][1] = max(stretches[-1][1], last_period)
+            stretches[-1][2].append(override)
+        else:
+            stretches.append([first_period, last_period, [override]])
+
+    # All busy stretches are merged by one engine call; they never touch, so nothing is combined across them
+    bounds = [(max(plan.period_start(first_period), start_time), min(plan.period_start(last_period + 1), end_time))
+              for first_period, last_period, _ in stretches]
+    schedule_lst, override_lst = [], []
+    for (stretch_start, stretch_end), (_, _, stretch_overrides) in zip(bounds, stretches):
+        schedule_lst.extend(plan.iter_events(stretch_start, stretch_end))
+        override_lst.extend(stretch_overrides)
+    rendered = SchedulingEngine(schedule_lst, override_lst).override_schedule_queue() if stretches else []
+
+    final_schedule = []
+    cursor, lo = start_time, 0
+    for stretch_start, stretch_end in bounds:
+        if cursor < stretch_start:
+            _extend_joined(final_schedule, plan.iter_events(cursor, stretch_start))
+        hi = bisect_left(rendered, stretch_end, lo, key=attrgetter("start_time"))
+        _extend_joined(final_schedule, rendered[lo:hi])
+        cursor, lo = stretch_end, hi
+    if cursor < end_time:
+        _extend_joined(final_schedule, plan.iter_events(cursor, end_time))
+    return final_schedule
@@ -0,0 +1,324 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from zoneinfo import ZoneInfo
+from user_event import UserEvent
+
+ONE_SECOND = timedelta(seconds=1)
+# Offsets are probed this far apart when looking for the next DST change; no current
+# zone changes its offset twice within two weeks (Ramadan time in Morocco lasts about a month).
+ZONE_PROBE_STEP = timedelta(days=14)
+ZONE_PROBE_LIMIT = 30
+
+class Rotation:
+    def __init__(self, users : list[str], handover_start_at : datetime, interval : timedelta) -> None:
+        self.users = users
+        self.handover_start_at = handover_start_at
+        self.interval = interval
+
+    def _handover_index(self, time : datetime) -> int:
+        """
+        Return the index of the handover that is active at the given time.
+        Times before handover_start_at are clamped to the first handover.
+        E.g.
+        handover_start_at = 7th 5pm, interval = 7 days
+        time = 20th 5pm -> index 1 (handover starting 14th 5pm)
+        """
+        if time <= self.handover_start_at:
+            return 0
+        return (time - self.handover_start_at) // self.interval
+
+    def who_is_on_call(self, time : datetime) -> str | None:
+        """
+        Return the user whose handover covers the given time, or None before handover_start_at.
+        Computed in O(1) from the rotation definition.
+        """
+        if time < self.handover_start_at:
+            return None
+        return self.users[self._handover_index(time) % len(self.users)]
+
+    def iter_events(self, start_time : datetime, end_time : datetime | None) -> Iterator[UserEvent]:
+        """
+        Yield handover events truncated to [start_time, end_time].
+        Seeks straight to the first handover in the window with arithmetic,
+        so the cost depends on the window length and not on the rotation's age.
+        With end_time None the generator never ends; handovers are only
+        computed as they are consumed.
+        E.g.
+        users = [A, B], handover_start_at = 1st 5pm, interval = 7 days
+        window = [10th 5pm, 17th 5pm]
+        events = [(B, 10th 5pm, 15th 5pm), (A, 15th 5pm, 17th 5pm)]
+        """
+        idx = self._handover_index(start_time)
+        curr_start_time = self.handover_start_at + idx * self.interval
+        num_users = len(self.users)
+
+        while end_time is None or curr_start_time < end_time:
+            curr_end_time = curr_start_time + self.interval
+            truncated_start = max(curr_start_time, start_time)
+            truncated_end = curr_end_time if end_time is None else min(curr_end_time, end_time)
+            if truncated_start < truncated_end:
+                yield UserEvent(self.users[idx % num_users], truncated_start, truncated_end)
+
+            curr_start_time = curr_end_time
+            idx += 1
+
+
+class ZonedRotation(Rotation):
+    def __init__(self, users : list[str], handover_start_at : datetime, interval : timedelta, zone : ZoneInfo) -> None:
+        """
+        A rotation that hands over at the same local wall-clock time in zone, so a
+        "09:00 local" handover stays at 09:00 across DST changes.
+        handover_start_at is a naive UTC datetime; its local time in zone is the
+        handover time, and handover k is at the local time handover_start_at + k * interval,
+        converted back to naive UTC datetimes (local times skipped or repeated by a DST
+        change resolve like datetime's fold=0: with the offset in force before the change).
+        Handovers never move backwards: when an interval shorter than a forward DST change
+        puts a handover inside the skipped time, the handovers after it that would resolve
+        earlier are held at its time, so the shifts between them are empty.
+        """
+        super().__init__(users, handover_start_at, interval)
+        self.zone = zone
+        self.local_start_at = self._to_local(handover_start_at)
+
+    def _offset_at(self, time : datetime) -> timedelta:
+        """
+        Return the zone's UTC offset at a naive UTC time.
+        """
+        return time.replace(tzinfo=timezone.utc).astimezone(self.zone).utcoffset()
+
+    def _to_local(self, time : datetime) -> datetime:
+        """
+        Convert a naive UTC time to naive local wall-clock time.
+        """
+        return time + self._offset_at(time)
+
+    def _resolve(self, local_time : datetime) -> datetime:
+        """
+        Convert a naive local wall-clock time to naive UTC, like datetime's fold=0.
+        """
+        return local_time.replace(tzinfo=self.zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def _handover_time(self, idx : int) -> datetime:
+        """
+        Return handover idx as a naive UTC datetime, never earlier than the handovers before it.
+        Only a forward DST change within the last ZONE_PROBE_STEP can make an earlier handover
+        resolve later, and only if it is less than the size of the change earlier in local time.
+        E.g. Europe/London, every 30 minutes on 30th Mar 2025
+        local 01:30 (skipped) -> 01:30 UTC, local 02:00 -> 01:30 UTC (not 01:00 UTC)
+        """
+        local_time = self.local_start_at + idx * self.interval
+        time = self._resolve(local_time)
+        jump = self._offset_at(time) - self._offset_at(time - ZONE_PROBE_STEP)
+        prev_idx, prev_local_time = idx - 1, local_time - self.interval
+        while prev_idx >= 0 and prev_local_time > local_time - jump:
+            time = max(time, self._resolve(prev_local_time))
+            prev_idx, prev_local_time = prev_idx - 1, prev_local_time - self.interval
+        return time
+
+    def _handover_index(self, time : datetime) -> int:
+        """
+        Return the index of the handover that is active at the given time.
+        Times before handover_start_at are clamped to the first handover.
+        The index is estimated from the local time and corrected by at most a step
+        either way, since DST moves a handover by less than one interval.
+        """
+        if time <= self._handover_time(0):
+            return 0
+        idx = max((self._to_local(time) - self.local_start_at) // self.interval, 0)
+        while idx > 0 and self._handover_time(idx) > time:
+            idx -= 1
+        while self._handover_time(idx + 1) <= time:
+            idx += 1
+        return idx
+
+    def who_is_on_call(self, time : datetime) -> str | None:
+        """
+        Return the user whose handover covers the given time, or None before the first handover.
+        """
+        if time < self._handover_time(0):
+            return None
+        return self.users[self._handover_index(time) % len(self.users)]
+
+    def _offset_periods(self, local_time : datetime) -> Iterator[tuple[timedelta, datetime]]:
+        """
+        Yield (offset, local_until) for the stretches of local time from local_time on
+        during which the zone's UTC offset is constant, so every local time before
+        local_until converts to UTC by subtracting offset.
+        Transitions are found by probing the offset every ZONE_PROBE_STEP and bisecting
+        to the second where it changes; a stretch with no transition within
+        ZONE_PROBE_LIMIT probes is yielded as is and the search carries on from its end.
+        E.g. Europe/London from 1st Mar 2025:
+        (0h, 30th Mar 2am), (1h, 26th Oct 2am), (0h, 29th Mar 2026 2am), ...
+        """
+        # Start a day early so a local time inside a skipped or repeated hour still gets the earlier offset
+        lo = (local_time - timedelta(days=1)).replace(microsecond=0)
+        offset = self._offset_at(lo)
+        while True:
+            hi = lo + ZONE_PROBE_STEP
+            for _ in range(ZONE_PROBE_LIMIT):
+                if self._offset_at(hi) != offset:
+                    break
+                lo, hi = hi, hi + ZONE_PROBE_STEP
+            else:
+                local_until = hi + offset
+                if local_until > local_time:
+                    yield offset, local_until
+                lo = hi
+                continue
+
+            # Bisect to the first whole second with the new offset
+            while hi - lo > ONE_SECOND:
+                mid = lo + ((hi - lo) // ONE_SECOND // 2) * ONE_SECOND
+                if self._offset_at(mid) == offset:
+                    lo = mid
+                else:
+                    hi = mid
+            next_offset = self._offset_at(hi)
+            local_until = hi + max(offset, next_offset)
+            if local_until > local_time:
+                yield offset, local_until
+            lo, offset = hi, next_offset
+
+    def iter_events(self, start_time : datetime, end_time : datetime | None) -> Iterator[UserEvent]:
+        """
+        Yield handover events truncated to [start_time, end_time], like Rotation.iter_events.
+        Handovers are stepped in local time and converted to UTC by subtracting the
+        offset of the DST period they fall in, so the zone is only consulted a few times
+        per DST change rather than once per handover.
+        Each handover is held at the previous one's time if it would resolve earlier.
+        E.g.
+        users = [A, B], 09:00 Europe/London, interval = 1 day
+        26th Oct 08:00 UTC -> 27th Oct 09:00 UTC (the clocks went back overnight)
+        """
+        idx = self._handover_index(start_time)
+        local_time = self.local_start_at + idx * self.interval
+        periods = self._offset_periods(local_time)
+        offset, local_until = next(periods)
+        # Within a DST period handovers are evenly spaced in UTC as well, so only
+        # the handover that crosses into the next period is converted from local time
+        utc_until = local_until - offset
+        resolved = local_time - offset
+        curr_start_time = self._handover_time(idx)
+        num_users = len(self.users)
+
+        while end_time is None or curr_start_time < end_time:
+            resolved += self.interval
+            if resolved >= utc_until:
+                local_time = resolved + offset
+                while local_time >= local_until:
+                    offset, local_until = next(periods)
+                resolved = local_time - offset
+                utc_until = local_until - offset
+            curr_end_time = max(resolved, curr_start_time)
+            truncated_start = max(curr_start_time, start_time)
+            truncated_end = curr_end_time if end_time is None else min(curr_end_time, end_time)
+            if truncated_start < truncated_end:
+                yield UserEvent(self.users[idx % num_users], truncated_start, truncated_end)
+
+            curr_start_time = curr_end_time
+            idx += 1
+
+
+class RotationPlan(Rotation):
+    def __init__(self, shifts : list[tuple[str, timedelta]], handover_start_at : datetime) -> None:
+        """
+        A rotation compiled from a repeating list of (user, duration) shifts, e.g.
+        12h follow-the-sun shifts or "weekdays alice/bob, weekends charlie".
+        The pattern is compiled once into a periodic plan: the period length, the
+        offset at which each shift starts within a period, and its owner. Consecutive
+        shifts of the same user are joined, and a shift that would continue across the
+        period boundary is moved to the start of the period, so the events of a window
+        are already combined. Any window is then generated by modular arithmetic and a
+        slice of the plan. The plan repeats from handover_start_at; as with Rotation,
+        nobody is on call before it.
+        Raises ValueError for an empty pattern or a duration that is not positive.
+        E.g.
+        shifts = [(alice, 5 days), (charlie, 2 days), (bob, 5 days), (charlie, 2 days)]
+        period = 14 days, offsets = [0, 5 days, 7 days, 12 days]
+        """
+        if not shifts or any(duration <= timedelta(0) for _, duration in shifts):
+            raise ValueError("A rotation pattern needs at least one shift and positive durations.")
+        owners, durations = [], []
+        for user, duration in shifts:
+            if owners and owners[-1] == user:
+                durations[-1] += duration
+            else:
+                owners.append(user)
+                durations.append(duration)
+        anchor = handover_start_at
+        if len(owners) > 1 and owners[0] == owners[-1]:
+            anchor -= durations[-1]
+            durations[0] += durations.pop()
+            owners.pop()
+
+        super().__init__(owners, handover_start_at, sum(durations, timedelta(0)))
+        self.anchor = anchor
+        self.offsets, self.ends = [], []
+        offset = timedelta(0)
+        for duration in durations:
+            self.offsets.append(offset)
+            offset += duration
+            self.ends.append(offset)
+        self._shifts = list(zip(owners, self.offsets, self.ends))
+
+    def period_index(self, time : datetime) -> int:
+        """
+        Return the index of the period containing time (negative before the plan's anchor).
+        """
+        return (time - self.anchor) // self.interval
+
+    def period_start(self, idx : int) -> datetime:
+        """
+        Return the start time of period idx.
+        """
+        return self.anchor + idx * self.interval
+
+    def _handover_index(self, time : datetime) -> int:
+        """
+        Return the index of the shift that is active at the given time, counting
+        shifts of every period since the anchor.
+        Times before handover_start_at are clamped to it.
+        """
+        time = max(time, self.handover_start_at)
+        idx, offset = divmod(time - self.anchor, self.interval)
+        return idx * len(self.users) + bisect_right(self.offsets, offset) - 1
+
+    def iter_events(self, start_time : datetime, end_time : datetime | None) -> Iterator[UserEvent]:
+        """
+        Yield the plan's shifts truncated to [start_time, end_time], in time order.
+        Seeks to the first shift with arithmetic and then walks the plan, so the cost
+        depends on the window length only. With end_time None the generator never ends.
+        E.g.
+        plan = [(A, 0h, 12h), (B, 12h, 24h)], handover_start_at = 1st 9am
+        window = [3rd 3pm, 4th 3pm]
+        events = [(A, 3rd 3pm, 3rd 9pm), (B, 3rd 9pm, 4th 9am), (A, 4th 9am, 4th 3pm)]
+        """
+        start_time = max(start_time, self.handover_start_at)
+        owners, offsets, ends = self.users, self.offsets, self.ends
+        if len(owners) == 1 and end_time is not None:
+            # A single user is on call throughout; with no end one event per period is yielded
+            if start_time < end_time:
+                yield UserEvent(owners[0], start_time, end_time)
+            return
+        period_idx, pos = divmod(self._handover_index(start_time), len(owners))
+        period_start = self.period_start(period_idx)
+
+        while True:
+            period_end = period_start + self.interval
+            if pos == 0 and start_time <= period_start and (end_time is None or period_end <= end_time):
+                # A whole period is a slice of the plan shifted to its start, nothing to truncate
+                yield from [UserEvent(owner, period_start + offset, period_start + end)
+                            for owner, offset, end in self._shifts]
+            else:
+                for pos in range(pos, len(owners)):
+                    curr_start_time = period_start + offsets[pos]
+                    if end_time is not None and curr_start_time >= end_time:
+                        return
+                    curr_end_time = period_start + ends[pos]
+                    truncated_start = max(curr_start_time, start_time)
+                    truncated_end = curr_end_time if end_time is None else min(curr_end_time, end_time)
+                    if truncated_start < truncated_end:
+                        yield UserEvent(owners[pos], truncated_start, truncated_end)
+            pos = 0
+            period_start = period_end
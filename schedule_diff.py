@@ -0,0 +1,115 @@
+from datetime import datetime
+from user_event import UserEvent
+
+ADDED = "added"
+REMOVED = "removed"
+REASSIGNED = "reassigned"
+
+class ScheduleChange:
+    """
+    A stretch of time whose owner differs between two renders.
+    kind is ADDED (nobody was on call before), REMOVED (nobody is on call now)
+    or REASSIGNED; old_name and new_name are None where nobody is on call.
+    """
+    __slots__ = ("kind", "start_time", "end_time", "old_name", "new_name")
+
+    def __init__(self, kind : str, start_time : datetime, end_time : datetime, old_name : str | None, new_name : str | None) -> None:
+        self.kind = kind
+        self.start_time = start_time
+        self.end_time = end_time
+        self.old_name = old_name
+        self.new_name = new_name
+
+    def __repr__(self) -> str:
+        return (f"ScheduleChange(kind={self.kind}, start_time={self.start_time}, end_time={self.end_time}, "
+                f"old_name={self.old_name}, new_name={self.new_name})")
+
+    def __eq__(self, other : object) -> bool:
+        if not isinstance(other, ScheduleChange):
+            return False
+        return (self.kind == other.kind and self.start_time == other.start_time and self.end_time == other.end_time
+                and self.old_name == other.old_name and self.new_name == other.new_name)
+
+    def _to_dict(self) -> dict[str, object]:
+        """
+        Convert the change into a dictionary representation.
+        """
+        return {"kind" : self.kind, "old_user" : self.old_name, "new_user" : self.new_name,
+                "start_at" : self.start_time.strftime("%Y-%m-%dT%H:%M:%SZ"), "end_at" : self.end_time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+def diff_schedules(old : list[UserEvent], new : list[UserEvent]) -> list[ScheduleChange]:
+    """
+    Return the stretches of time whose owner differs between two renders, in time order.
+    Both inputs must be sorted and non-overlapping, as returned by
+    SchedulingEngine.override_schedule_queue. They are walked together once, so the
+    cost is linear in their total length. Events that are the same object or equal
+    in both renders are skipped pairwise without splitting them into boundaries.
+    Consecutive stretches with the same kind and owners are reported as one change.
+    E.g.
+    old = [(A, 1pm, 5pm), (B, 5pm, 9pm)]
+    new = [(A, 1pm, 3pm), (C, 3pm, 6pm), (B, 6pm, 8pm)]
+    changes = [(reassigned A -> C, 3pm, 5pm), (reassigned B -> C, 5pm, 6pm), (removed B, 8pm, 9pm)]
+    """
+    if old is new:
+        return []
+    changes = []
+    i, j = 0, 0
+    num_old, num_new = len(old), len(new)
+    cursor = None
+
+    while i < num_old or j < num_new:
+        # Fast path: skip events both renders share, as long as neither is partly consumed
+        while (i < num_old and j < num_new and (old[i] is new[j] or old[i] == new[j])
+               and (cursor is None or cursor <= old[i].start_time)):
+            i += 1
+            j += 1
+        if i == num_old and j == num_new:
+            break
+
+        o = old[i] if i < num_old else None
+        n = new[j] if j < num_new else None
+        next_start = min(event.start_time for event in (o, n) if event is not None)
+        if cursor is None or cursor < next_start:
+            cursor = next_start
+
+        # The stretch from cursor ends at the nearest boundary of either render
+        old_name, end_time = None, None
+        if o is not None:
+            if o.start_time <= cursor:
+                old_name, end_time = o.name, o.end_time
+            else:
+                end_time = o.start_time
+        new_name = None
+        if n is not None:
+            if n.start_time <= cursor:
+                new_name = n.name
+                boundary = n.end_time
+            else:
+                boundary = n.start_time
+            if end_time is None or boundary < end_time:
+                end_time = boundary
+
+        if old_name != new_name and cursor < end_time:
+            kind = ADDED if old_name is None else REMOVED if new_name is None else REASSIGNED
+            last = changes[-1] if changes else None
+            if (last is not None and last.end_time == cursor and last.kind == kind
+                    and last.old_name == old_name and last.new_name == new_name):
+                last.end_time = end_time
+            else:
+                changes.append(ScheduleChange(kind, cursor, end_time, old_name, new_name))
+
+        cursor = end_time
+        if o is not None and o.end_time <= cursor:
+            i += 1
+        if n is not None and n.end_time <= cursor:
+            j += 1
+
+    return changes
+
+
+def affected_users(changes : list[ScheduleChange]) -> set[str]:
+    """
+    Return everyone who gains or loses on-call time in the given changes.
+    """
+    return {name for change in changes for name in (change.old_name, change.new_name) if name is not None}
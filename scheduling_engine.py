@@ -1,61 +1,141 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator
+import numpy_backend
+from aggregation import UserStats, aggregate_segments
+from profiler import NULL_PROFILER, NullProfiler, Profiler
+from rotation import Rotation
+from segment import OVERRIDE_LAYER, NameTable, Segment
 from user_event import UserEvent
 
+BACKENDS = ("python", "numpy")
+
+def _iter_truncated(events : Iterable[UserEvent], start_time : datetime, end_time : datetime | None) -> Iterator[UserEvent]:
+    """
+    Yield the events overlapping [start_time, end_time] truncated to it (no upper bound when end_time is None).
+    """
+    for event in events:
+        truncated_start = max(event.start_time, start_time)
+        truncated_end = event.end_time if end_time is None else min(event.end_time, end_time)
+        if truncated_start < truncated_end:
+            yield UserEvent(event.name, truncated_start, truncated_end)
+
 class SchedulingEngine:
-    def __init__(self, schedule_lst : list[UserEvent], override_lst : list[UserEvent]) -> None:
+    def __init__(self, schedule_lst : Iterable[UserEvent], override_lst : Iterable[UserEvent], backend : str = "python",
+                 profiler : Profiler | NullProfiler = NULL_PROFILER) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}.")
+        if backend == "numpy":
+            numpy_backend.require_numpy()
         self.schedule_lst = schedule_lst
         self.override_lst = override_lst
+        self.backend = backend
+        self.profiler = profiler
         self.final_schedule = []
+        # Set by from_rotation without an end time: only the streaming entry points can be used
+        self.unbounded = False
+        self._stream = None
+        # Set by from_layers: the input layers ordered from lowest to highest priority
+        self.layers = None
+        # Incremental state, built on the first add/remove/update_override call
+        self._names = None
+        self._timeline = None
+        self._timeline_starts = None
+        self._timeline_ends = None
+        self._schedule_segments = None
+        self._schedule_starts = None
+        self._overrides = None
+        self._override_keys = None
+        self._max_override_length = timedelta(0)
+        self._next_override_id = 0
+        # Time ranges re-rendered since the last changed_ranges call
+        self._changed_ranges = []
 
-    def _append_if_valid(self, event_list : list[UserEvent], event : UserEvent) -> None:
+    @classmethod
+    def from_rotation(cls, rotation : Rotation, override_lst : Iterable[UserEvent], start_time : datetime,
+                      end_time : datetime | None = None, profiler : Profiler | NullProfiler = NULL_PROFILER) -> "SchedulingEngine":
         """
-        Append an event to a list only if it represents a valid time range.
-        Ignore events if they have identical start and end times as they represent 
-        zero-duration (invalid) intervals.
+        Build an engine over a rotation definition instead of materialized handover events.
+        Handovers from start_time on are generated lazily as the merge advances, so with
+        end_time None the schedule has no upper bound and only what is consumed through
+        iter_schedule_queue or next_segments is computed.
+        override_lst must be untruncated (see FileHandler.read_overrides); it is ordered by
+        start time and truncated to the window lazily.
+        Raises ValueError for an unbounded rotation with a single distinct user, whose
+        one never-ending segment could not be produced.
         """
-        if event.start_time < event.end_time:
-            event_list.append(event)
+        if end_time is None and len(set(rotation.users)) == 1:
+            raise ValueError("An unbounded rotation needs at least two distinct users.")
+        if end_time is not None and not start_time < end_time:
+            raise ValueError("Invalid start or end time range provided.")
+        overrides = sorted(override_lst, key=attrgetter("start_time"))
+        engine = cls(rotation.iter_events(start_time, end_time), _iter_truncated(overrides, start_time, end_time),
+                     profiler=profiler)
+        engine.unbounded = end_time is None
+        return engine
 
-    def _handle_pre_schedule_overrides(self, final : list[UserEvent]) -> int:
+    @classmethod
+    def from_layers(cls, layers : list[Iterable[UserEvent]], priorities : list[int] | None = None,
+                    profiler : Profiler | NullProfiler = NULL_PROFILER) -> "SchedulingEngine":
         """
-        Add override events that finish before the first scheduled event.
+        Build an engine that stacks any number of layers, e.g. a primary rotation, a weekend
+        rotation, holiday coverage and ad-hoc overrides.
+        Wherever a layer has coverage it wins over every layer of lower priority; within a
+        layer, the event that starts last wins as for overrides. Gaps in a layer let the
+        layers below it show through. The result is identical to rendering the lowest layer
+        and then applying each higher layer as the override list of the previous result.
+        priorities defaults to the list order (later layers win).
+        Raises ValueError if priorities does not match the layers or has duplicates.
         E.g.
-        s = [(A, 3pm, 5pm), (B, 6pm, 7pm)] 
-        o = [(C, 2pm, 3pm)]
-        final = [(C, 2pm, 3pm), (A, 3pm, 5pm), (B, 6pm, 7pm)]
+        layers = [[(A, 1pm, 9pm)], [(B, 2pm, 6pm)], [(C, 5pm, 7pm)]]
+        final = [(A, 1pm, 2pm), (B, 2pm, 5pm), (C, 5pm, 7pm), (A, 7pm, 9pm)]
         """
-        over_ptr = 0
-        schedules, overrides = self.schedule_lst, self.override_lst
-        while over_ptr < len(overrides) and overrides[over_ptr].end_time <= schedules[0].start_time:
-            self._append_if_valid(final, overrides[over_ptr])
-            over_ptr += 1
-        return over_ptr
+        if priorities is None:
+            priorities = list(range(len(layers)))
+        if len(priorities) != len(layers) or len(set(priorities)) != len(priorities):
+            raise ValueError("Each layer needs exactly one distinct priority.")
+        engine = cls([], [], profiler=profiler)
+        engine.layers = [layer for _, layer in sorted(zip(priorities, layers), key=lambda item: item[0])]
+        return engine
 
-    def _handle_partial_overlap_before_first_schedule(self, final : list[UserEvent], over_ptr : int) -> int:
+    def _slice_event(self, event : Segment, start : datetime, end : datetime) -> Segment:
         """
-        Handle an override that partially overlaps before the first scheduled task.
-        The overriding event always takes precedence.
-        E.g.
-        s = [(A, 3pm, 5pm), (B, 6pm, 7pm)] 
-        o = [(C, 2pm, 4pm)]
-        after _handle_partial_overlap_before_first_schedule:
-        final = [(C, 2pm, 4pm)] 
-        s = [(A, 4pm, 5pm), (B, 6pm, 7pm)] 
-        o = [] (not visible as pointer incremented)
-        """
-        schedules, overrides = self.schedule_lst, self.override_lst
-        if over_ptr < len(overrides) and overrides[over_ptr].start_time < schedules[0].start_time:
-            o = overrides[over_ptr]
-            self._append_if_valid(final, o)
-            schedules[0].start_time = o.end_time
-            over_ptr += 1
-        return over_ptr
-    
-    def _resolve_override_overlaps(self) -> None:
+        Return the part of a segment between start and end.
+        The original segment is reused when the bounds are unchanged so no
+        new object is created for segments that pass through untouched.
+        """
+        if event.start == start and event.end == end:
+            return event
+        return Segment(start, end, event.owner, event.layer)
+
+    def _check_sorted(self, events : Iterable[Segment], label : str) -> Iterator[Segment]:
+        """
+        Pass segments through while checking that they arrive ordered by start time.
+        Raises ValueError on the first out-of-order segment.
+        """
+        prev_start = None
+        for event in events:
+            if prev_start is not None and event.start < prev_start:
+                raise ValueError(f"Streaming mode requires {label} events sorted by start time.")
+            prev_start = event.start
+            yield event
+
+    def _resolve_override_overlaps(self, overrides : Iterable[Segment]) -> Iterator[Segment]:
         """
         Remove overlapping override events.
         Later overrides take precedence — earlier ones are split or truncated
         so that no overlaps remain in the final override list.
 
+        Overrides arrive sorted by start time, so the override that started last
+        has the highest precedence. A sweep line moves from one override start to
+        the next, keeping the active overrides in a heap ordered by precedence.
+        Between two starts the top of the heap owns the time until it ends, after
+        which the next active override underneath it takes over. This handles any
+        depth of nesting in O(n log n) and only the active overrides are held in memory.
+
         Case 1: Ignore zero-duration overrides (start_time == end_time).
         These are skipped and not added to the final list.
         E.g.
@@ -79,197 +159,480 @@ class SchedulingEngine:
         E.g.
         o = [(C, 2pm, 3pm), (D, 4pm, 5pm)]
         o_final = [(C, 2pm, 3pm), (D, 4pm, 5pm)]
+
+        Case 5: Overrides nested several levels deep.
+        Each override resumes once every later override inside it has ended.
+        E.g.
+        o = [(C, 1pm, 9pm), (D, 2pm, 6pm), (E, 3pm, 4pm), (F, 5pm, 7pm)]
+        o_final = [(C, 1pm, 2pm), (D, 2pm, 3pm), (E, 3pm, 4pm), (D, 4pm, 5pm), (F, 5pm, 7pm), (C, 7pm, 9pm)]
         """
-        overrides = self.override_lst
-        i = 0
-        result = []
-        while i < len(overrides):
-            first_override = overrides[i]
-            if first_override.start_time < first_override.end_time:
-                result.append(first_override)
-                break 
-            i += 1
-        
-        if len(result) == 0:
-            return []
-        
-        for o_ptr in range(1, len(overrides)):
-            prev_o = result[-1]
-            curr_o = overrides[o_ptr]
+        active = []
+        cursor = None
+        for seq, curr_o in enumerate(overrides):
             # Case 1: Ignore zero-duration overrides
-            if curr_o.start_time == curr_o.end_time:
+            if curr_o.start >= curr_o.end:
                 continue
-            # Case 2: Current override lies fully within the previous override
-            elif prev_o.start_time <= curr_o.start_time < curr_o.end_time <= prev_o.end_time:
-                temp_end = prev_o.end_time
-                temp_name = prev_o.name
-                if prev_o.start_time < curr_o.start_time:
-                    prev_o.end_time = curr_o.start_time
-                result.append(curr_o)
-                if curr_o.end_time < temp_end:
-                    after_override = UserEvent(temp_name, curr_o.end_time, temp_end)
-                    result.append(after_override)
-            # Case 3: Current override extends beyond the previous override
-            elif prev_o.start_time <= curr_o.start_time < prev_o.end_time and prev_o.end_time < curr_o.end_time:
-                if prev_o.start_time < curr_o.start_time:
-                    prev_o.end_time = curr_o.start_time
-                    result.append(curr_o)
-                else:
-                    _ = result.pop()
-                    result.append(curr_o)
-            # Case 4: No overlap between overrides
-            else:
-                result.append(curr_o)
-            
+            if active:
+                yield from self._sweep_active_overrides(active, cursor, curr_o.start)
+            cursor = curr_o.start
+            heapq.heappush(active, (-seq, curr_o))
 
-        return result
+        if active:
+            yield from self._sweep_active_overrides(active, cursor, None)
 
+    def _sweep_active_overrides(self, active : list[tuple[int, Segment]], cursor : datetime, until : datetime | None) -> Iterator[Segment]:
+        """
+        Emit the winning fragments of the active overrides from cursor up to until
+        (or until every active override has ended when until is None).
+        Overrides that have ended are popped once they reach the top of the heap.
+        E.g.
+        active = [(D, 2pm, 4pm), (C, 1pm, 9pm)], cursor = 3pm, until = 5pm
+        fragments = [(D, 3pm, 4pm), (C, 4pm, 5pm)]
+        """
+        while active and (until is None or cursor < until):
+            top = active[0][1]
+            if top.end <= cursor:
+                heapq.heappop(active)
+                continue
+            fragment_end = top.end if until is None or top.end < until else until
+            yield self._slice_event(top, cursor, fragment_end)
+            cursor = fragment_end
 
-    def _merge_main_schedule(self, final : list[UserEvent], sched_ptr : int, over_ptr : int) -> tuple[int,int]:
+    def _merge_main_schedule(self, schedules : Iterable[Segment], overrides : Iterable[Segment]) -> Iterator[Segment]:
         """
-        Merge the main schedule and override lists when time ranges overlap.
+        Merge the main schedule and the resolved override stream when time ranges overlap.
         Each schedule event may be partially or fully replaced by one or more
         override events depending on their overlap relationships.
+        Events are never mutated: the part of the current schedule or override that
+        has not been emitted yet is tracked with a local start cursor.
 
-        Case 1: Override and schedule do not intersect. Both events are appended as-is.
+        Case 1: Override and schedule do not intersect. Both events are emitted as-is.
         E.g. 
         s = [(A, 1pm, 2pm)]
         o = [(B, 3pm, 4pm)]
         final = [(A, 1pm, 2pm), (B, 3pm, 4pm)]
 
-        Case 2: The override lies completely within a schedule window. 
+        Case 2: The override starts before the schedule and runs into it.
+        The part before the schedule is emitted and the rest of the override
+        is handled against the schedule in the next iteration.
+        E.g.
+        s = [(A, 3pm, 5pm)]
+        o = [(C, 2pm, 4pm)]
+        after first merge:
+        final = [(C, 2pm, 3pm)]
+        o = [(C, 3pm, 4pm)]
+
+        Case 3: The override lies completely within a schedule window. 
         The schedule is split into two parts: before and after the override.
         E.g.
         s = [(A, 1pm, 5pm)]
         o = [(B, 2pm, 4pm)]
         final = [(A, 1pm, 2pm), (B, 2pm, 4pm), (A, 4pm, 5pm)]
 
-        Case 3: The override begins within one schedule and extends into the next. 
+        Case 4: The override begins within one schedule and extends into the next. 
         The current schedule's segment is replaced up to its end,
         and the override continues in the next iteration.
         E.g.
         s = [(A, 1pm, 3pm), (C, 3pm, 5pm)]
         o = [(B, 2pm, 4pm)]
         after first merge:
-        s = [(C, 3pm, 5pm)] (sched_ptr is incremented so assume previous schedule is no longer visible)
+        s = [(C, 3pm, 5pm)]
         o = [(B, 3pm, 4pm)]
         final = [(A, 1pm, 2pm), (B, 2pm, 3pm)]
         """
-        schedules, overrides = self.schedule_lst, self.override_lst
+        schedule_iter, override_iter = iter(schedules), iter(overrides)
+        s, o = next(schedule_iter, None), next(override_iter, None)
+        s_start = s.start if s else None
+        o_start = o.start if o else None
 
-        while sched_ptr < len(schedules) and over_ptr < len(overrides):
-            s, o = schedules[sched_ptr], overrides[over_ptr]
-            s_start, s_end = s.start_time, s.end_time
-            o_start, o_end = o.start_time, o.end_time
+        while s is not None and o is not None:
+            s_end, o_end = s.end, o.end
 
             # Skip empty events
-            if s_start == s_end:
-                sched_ptr += 1
+            if s_start >= s_end:
+                s = next(schedule_iter, None)
+                s_start = s.start if s else None
                 continue
-            if o_start == o_end:
-                over_ptr += 1
+            if o_start >= o_end:
+                o = next(override_iter, None)
+                o_start = o.start if o else None
                 continue
 
             # Case 1: No overlap
             if s_end <= o_start:
-                self._append_if_valid(final, s)
-                sched_ptr += 1
+                yield self._slice_event(s, s_start, s_end)
+                s = next(schedule_iter, None)
+                s_start = s.start if s else None
             elif o_end <= s_start:
-                self._append_if_valid(final, o)
-                over_ptr += 1
-            # Case 2: Override fully inside schedule
-            elif s_start <= o_start < o_end <= s_end:
-                self._append_if_valid(final, UserEvent(s.name, s_start, o_start)) 
-                self._append_if_valid(final, o)                                 
-                schedules[sched_ptr] = UserEvent(s.name, o_end, s_end)
-                over_ptr += 1
-            # Case 3: Override spans multiple schedules
+                yield self._slice_event(o, o_start, o_end)
+                o = next(override_iter, None)
+                o_start = o.start if o else None
+            # Case 2: Override starts before the schedule
+            elif o_start < s_start:
+                yield Segment(o_start, s_start, o.owner, o.layer)
+                o_start = s_start
+            # Case 3: Override fully inside schedule
+            elif o_end <= s_end:
+                if s_start < o_start:
+                    yield Segment(s_start, o_start, s.owner, s.layer)
+                yield self._slice_event(o, o_start, o_end)
+                s_start = o_end
+                o = next(override_iter, None)
+                o_start = o.start if o else None
+            # Case 4: Override spans multiple schedules
             else:
-                self._append_if_valid(final, UserEvent(s.name, s_start, o_start))
-                self._append_if_valid(final, UserEvent(o.name, o_start, s_end))
-                o.start_time = s_end
-                sched_ptr += 1
+                if s_start < o_start:
+                    yield Segment(s_start, o_start, s.owner, s.layer)
+                yield Segment(o_start, s_end, o.owner, o.layer)
+                o_start = s_end
+                s = next(schedule_iter, None)
+                s_start = s.start if s else None
+
+        # Emit whatever remains of the schedule or override stream
+        if s is not None and s_start < s.end:
+            yield self._slice_event(s, s_start, s.end)
+        if o is not None and o_start < o.end:
+            yield self._slice_event(o, o_start, o.end)
+        yield from schedule_iter
+        yield from override_iter
+
+    def _sweep_layers(self, layers : Iterable[Iterable[Segment]]) -> Iterator[Segment]:
+        """
+        Merge resolved layers, each sorted and non-overlapping, keeping the highest layer
+        at every point in time. Segment.layer is the layer's rank (higher wins).
+        The sweep moves from one segment start to the next over all layers at once,
+        holding at most one current segment per layer and a heap of the layers that
+        have one, so the cost is O(n log k) for n segments in k layers.
+        E.g.
+        layer 0 = [(A, 1pm, 9pm)], layer 1 = [(B, 2pm, 4pm), (C, 5pm, 6pm)]
+        final = [(A, 1pm, 2pm), (B, 2pm, 4pm), (A, 4pm, 5pm), (C, 5pm, 6pm), (A, 6pm, 9pm)]
+        """
+        active, current = [], {}
+        cursor = None
+        for segment in heapq.merge(*layers, key=attrgetter("start")):
+            if active:
+                yield from self._sweep_active_layers(active, current, cursor, segment.start)
+            cursor = segment.start
+            # The layer's previous segment has ended by now, so it is simply replaced
+            if segment.layer not in current:
+                heapq.heappush(active, -segment.layer)
+            current[segment.layer] = segment
+
+        if active:
+            yield from self._sweep_active_layers(active, current, cursor, None)
 
-        return sched_ptr, over_ptr
+    def _sweep_active_layers(self, active : list[int], current : dict[int, Segment], cursor : datetime,
+                             until : datetime | None) -> Iterator[Segment]:
+        """
+        Emit the highest active layer's segment from cursor up to until (or until every
+        layer's current segment has ended when until is None).
+        Layers whose current segment has ended are dropped once they reach the top of the heap.
+        """
+        while active and (until is None or cursor < until):
+            top = current[-active[0]]
+            if top.end <= cursor:
+                heapq.heappop(active)
+                del current[top.layer]
+                continue
+            fragment_end = top.end if until is None or top.end < until else until
+            yield self._slice_event(top, cursor, fragment_end)
+            cursor = fragment_end
 
-    def _append_remaining(self, final : list[UserEvent], sched_ptr : int, over_ptr : int) -> None:
+    def _events_combiner(self, events : Iterable[Segment]) -> Iterator[Segment]:
         """
-        Add any remaining schedules or overrides.
+        Combine consecutive events with the same name (due to partial events being created).
+        Zero-duration events are dropped.
         E.g. 
-        final = [(B, 2pm, 4pm)]
-        s = [(A, 4pm, 6pm), (C, 6pm, 7pm)]
-        o = []
-        after _append_remaining():
-        final = [(B, 2pm, 4pm), (A, 4pm, 6pm), (C, 6pm, 7pm)]
-        (same logic applies for override if schedule is empty)
-        """
-        schedules, overrides = self.schedule_lst, self.override_lst
-        while sched_ptr < len(schedules):
-            self._append_if_valid(final, schedules[sched_ptr])
-            sched_ptr += 1
-        while over_ptr < len(overrides):
-            self._append_if_valid(final, overrides[over_ptr])
-            over_ptr += 1
+        final = [(A, 3pm, 5pm), (C, 5pm, 6pm), (C, 6pm, 7pm), (B, 7pm, 9pm)]
+        after events_combiner(): 
+        final = [(A, 3pm, 5pm), (C, 5pm, 7pm), (B, 7pm, 9pm)]
+        """
+        prev = None
+        prev_end = None
+        for curr in events:
+            if curr.start >= curr.end:
+                continue
+            if prev is not None and curr.owner == prev.owner and prev_end == curr.start:
+                prev_end = curr.end
+                continue
+            if prev is not None:
+                yield self._slice_event(prev, prev.start, prev_end)
+            prev, prev_end = curr, curr.end
+
+        if prev is not None:
+            yield self._slice_event(prev, prev.start, prev_end)
+
+    def _render(self, schedules : Iterable[Segment], overrides : Iterable[Segment]) -> Iterator[Segment]:
+        """
+        Chain the pipeline stages over start-sorted segments:
+        1. Resolve overlapping overrides
+        2. Merge overrides with the base schedule
+        3. Combine consecutive segments.
+        Each stage is wrapped by the profiler (a no-op unless profiling is enabled).
+        """
+        profiler = self.profiler
+        overrides = profiler.count_in("resolve_overlaps", overrides)
+        resolved = profiler.track("resolve_overlaps", self._resolve_override_overlaps(overrides))
+        schedules, resolved = profiler.count_in("merge", schedules), profiler.count_in("merge", resolved)
+        merged = profiler.track("merge", self._merge_main_schedule(schedules, resolved))
+        return profiler.track("combine", self._events_combiner(profiler.count_in("combine", merged)))
+
+    def _merge_layers(self, layers : list[Iterable[Segment]]) -> Iterator[Segment]:
+        """
+        Resolve the overlaps inside each start-sorted layer, then sweep across the layers.
+        """
+        profiler = self.profiler
+        resolved = [profiler.track("resolve_overlaps", self._resolve_override_overlaps(profiler.count_in("resolve_overlaps", layer)))
+                    for layer in layers]
+        return profiler.track("sweep_layers", self._sweep_layers([profiler.count_in("sweep_layers", layer) for layer in resolved]))
+
+    def _layer_segments(self, names : NameTable) -> list[list[Segment]]:
+        """
+        Convert the layers to start-sorted segments tagged with their rank.
+        """
+        return [names.iter_sorted_segments(layer, rank) for rank, layer in enumerate(self.layers)]
 
     def override_schedule_queue(self) -> list[UserEvent]:
         """
         Main entry point for generating the final merged schedule.
+        Converts both input lists to compact segments ordered by start time (sorting
+        only when they are out of order) and renders them in one pass.
+        The inputs are treated as read-only: neither the lists nor their UserEvents
+        are modified, so the same inputs can be rendered again without copying them.
+        UserEvents are only created for the output.
+        With backend="numpy" the segments are rendered by numpy_backend.render_arrays,
+        which requires non-overlapping schedule events.
+        An engine built with from_layers renders its layers in one sweep instead.
+        """
+        if self.unbounded:
+            raise ValueError("An unbounded schedule can only be streamed, use iter_schedule_queue or next_segments.")
+        names, profiler = NameTable(), self.profiler
+        if self.layers is not None:
+            with profiler.stage("to_segments"):
+                layers = self._layer_segments(names)
+            rendered = profiler.track("combine", self._events_combiner(profiler.count_in("combine", self._merge_layers(layers))))
+            self.final_schedule = list(profiler.track("to_user_events", names.to_user_events(rendered)))
+            return self.final_schedule
 
-        Coordinates all helper functions to:
-        1. Resolve overlapping overrides
-        2. Merge overrides with the base schedule
-        3. Append remaining events
-        4. Combine consecutive segments.
+        if self.backend == "numpy":
+            with profiler.stage("to_segments"):
+                schedules = names.to_sorted_segments(self.schedule_lst)
+                overrides = names.to_sorted_segments(self.override_lst, OVERRIDE_LAYER)
+            rendered = profiler.track("render_numpy", self._render_numpy(schedules, overrides))
+        else:
+            with profiler.stage("to_segments"):
+                schedules = names.iter_sorted_segments(self.schedule_lst)
+                overrides = names.iter_sorted_segments(self.override_lst, OVERRIDE_LAYER)
+            rendered = self._render(profiler.track("to_segments", schedules), profiler.track("to_segments", overrides))
+
+        self.final_schedule = list(profiler.track("to_user_events", names.to_user_events(rendered)))
+        return self.final_schedule
+
+    def aggregate_by_user(self) -> dict[str, UserStats]:
         """
-        final = self.final_schedule
-        sched_ptr, over_ptr = 0, 0
+        Compute per-user on-call totals, shift counts, longest shift and
+        override vs scheduled time in one pass, without building the output events.
+        Runs the Python pipeline up to the merge stage, whatever the backend,
+        since that is where each segment's provenance is known.
+        For an engine built with from_layers, time from every layer above the lowest
+        one counts as override time.
+        """
+        if self.unbounded:
+            raise ValueError("An unbounded schedule cannot be aggregated.")
+        names = NameTable()
+        if self.layers is not None:
+            return aggregate_segments(self._merge_layers(self._layer_segments(names)), names.names)
+        schedules = names.iter_sorted_segments(self.schedule_lst)
+        overrides = names.iter_sorted_segments(self.override_lst, OVERRIDE_LAYER)
+        merged = self._merge_main_schedule(schedules, self._resolve_override_overlaps(overrides))
+        return aggregate_segments(merged, names.names)
 
-        self.schedule_lst.sort(key = lambda x: x.start_time)
-        self.override_lst.sort(key = lambda x: x.start_time)
+    def _render_numpy(self, schedules : list[Segment], overrides : list[Segment]) -> Iterator[Segment]:
+        """
+        Render segments with the vectorised NumPy backend.
+        Times are converted to epoch microseconds for the arrays and back on the way out.
+        """
+        columns = numpy_backend.segment_columns(schedules) + numpy_backend.segment_columns(overrides)
+        return numpy_backend.to_segments(*numpy_backend.render_arrays(*columns))
 
-        if len(self.schedule_lst) == 0 and len(self.override_lst) == 0:
-            return []
-        
-        if len(self.schedule_lst) == 0 and len(self.override_lst) > 0:
-            self.final_schedule = self.override_lst
-            return self._events_combiner()
-        
-        if len(self.schedule_lst) > 0 and len(self.override_lst) == 0:
-            self.final_schedule = self.schedule_lst
-            return self._events_combiner()
-        
-        self.override_lst = self._resolve_override_overlaps()
+    def iter_schedule_queue(self) -> Iterator[UserEvent]:
+        """
+        Streaming entry point for generating the final merged schedule.
+        Unlike override_schedule_queue, the inputs may be any iterables and are
+        consumed lazily, so they must already be sorted by start time.
+        Only a constant number of events is held in memory at once.
+        Streaming always uses the Python pipeline, whatever the backend.
+        """
+        names, profiler = NameTable(), self.profiler
+        if self.layers is not None:
+            layers = [profiler.track("to_segments", self._check_sorted(names.to_segments(layer, rank), f"layer {rank}"))
+                      for rank, layer in enumerate(self.layers)]
+            rendered = self._events_combiner(self._merge_layers(layers))
+            return profiler.track("to_user_events", names.to_user_events(rendered))
+        schedules = profiler.track("to_segments", self._check_sorted(names.to_segments(self.schedule_lst), "schedule"))
+        overrides = profiler.track("to_segments", self._check_sorted(names.to_segments(self.override_lst, OVERRIDE_LAYER), "override"))
+        return profiler.track("to_user_events", names.to_user_events(self._render(schedules, overrides)))
 
-        over_ptr = self._handle_pre_schedule_overrides(final)
-        over_ptr = self._handle_partial_overlap_before_first_schedule(final, over_ptr)
+    def next_segments(self, count : int) -> list[UserEvent]:
+        """
+        Return the next count segments of the streamed schedule.
+        Every returned segment is complete: a segment is only produced once the
+        following one has started, so only as much of the schedule is computed as needed.
+        E.g.
+        engine = SchedulingEngine.from_rotation(rotation, overrides, now)
+        engine.next_segments(5) -> the current segment (from now) and the four after it
+        """
+        if self._stream is None:
+            self._stream = self.iter_schedule_queue()
+        return list(islice(self._stream, count))
 
-        sched_ptr, over_ptr = self._merge_main_schedule(final, sched_ptr, over_ptr)
+    def add_override(self, event : UserEvent) -> int:
+        """
+        Add an override to the rendered timeline and return its id.
+        The new override ranks after every existing override with the same start time,
+        as if it had been appended to override_lst. Only the stretch of the timeline
+        it covers is re-rendered.
+        """
+        self._ensure_timeline()
+        override_id = self._next_override_id
+        self._next_override_id += 1
+        segment = self._store_override(override_id, event)
+        self._rerender_range(segment.start, segment.end)
+        return override_id
 
-        self._append_remaining(final, sched_ptr, over_ptr)
+    def remove_override(self, override_id : int) -> None:
+        """
+        Remove an override by id and re-render only the stretch it covered.
+        Overrides from the initial override_lst have their list position as id.
+        Raises KeyError for an unknown id.
+        """
+        self._ensure_timeline()
+        segment = self._discard_override(override_id)
+        self._rerender_range(segment.start, segment.end)
 
-        final_schedule_merged = self._events_combiner()
-        return final_schedule_merged
+    def update_override(self, override_id : int, event : UserEvent) -> None:
+        """
+        Replace an override by id, keeping its precedence among overrides with the same start.
+        Re-renders the stretches covered by the old and the new version.
+        Raises KeyError for an unknown id.
+        """
+        self._ensure_timeline()
+        old_segment = self._discard_override(override_id)
+        new_segment = self._store_override(override_id, event)
+        self._rerender_range(old_segment.start, old_segment.end)
+        self._rerender_range(new_segment.start, new_segment.end)
 
-    def _events_combiner(self) -> list[UserEvent]:
+    def rendered_events(self, start_time : datetime | None = None, end_time : datetime | None = None) -> list[UserEvent]:
         """
-        Combine consecutive events with the same name (due to partial events being created).
-        E.g. 
-        final = [(A, 3pm, 5pm), (C, 5pm, 6pm), (C, 6pm, 7pm), (B, 7pm, 9pm)]
-        after events_combiner(): 
-        final = [(A, 3pm, 5pm), (C, 5pm, 7pm), (B, 7pm, 9pm)]
+        Return the current incrementally maintained timeline as UserEvents.
+        With start_time and end_time only the segments overlapping [start_time, end_time]
+        are returned, untruncated.
         """
-        if not self.final_schedule:
-            return []
+        self._ensure_timeline()
+        timeline = self._timeline
+        if start_time is not None:
+            timeline = timeline[bisect_right(self._timeline_ends, start_time):bisect_left(self._timeline_starts, end_time)]
+        return list(self._names.to_user_events(timeline))
 
-        merged = []
-        prev = self.final_schedule[0]
+    def changed_ranges(self) -> list[tuple[datetime, datetime]]:
+        """
+        Return and forget the time ranges re-rendered by add/remove/update_override since
+        the last call, in the order they were re-rendered. Each range starts and ends on a
+        segment boundary, and the timeline is unchanged outside their union.
+        """
+        changed, self._changed_ranges = self._changed_ranges, []
+        return changed
+
+    def _ensure_timeline(self) -> None:
+        """
+        Render the full timeline once and index it for incremental edits.
+        The schedule must not contain overlapping events.
+        """
+        if self._timeline is not None:
+            return
+        if self.unbounded:
+            raise ValueError("Incremental rendering requires a bounded schedule.")
+        if self.layers is not None:
+            raise ValueError("Incremental rendering is not supported for layered schedules.")
+        self._names = NameTable()
+        schedules = self._names.to_sorted_segments(self.schedule_lst)
+        schedules = [segment for segment in schedules if segment.start < segment.end]
+        if any(prev.end > curr.start for prev, curr in zip(schedules, schedules[1:])):
+            raise ValueError("Incremental rendering requires non-overlapping schedule events.")
+        self._schedule_segments = schedules
+        self._schedule_starts = [segment.start for segment in schedules]
+
+        self._overrides, self._override_keys = {}, []
+        for override_id, event in enumerate(self.override_lst):
+            self._store_override(override_id, event)
+        self._next_override_id = len(self._overrides)
+
+        self._timeline = list(self._render(schedules, self._overrides_between(None, None)))
+        self._timeline_starts = [segment.start for segment in self._timeline]
+        self._timeline_ends = [segment.end for segment in self._timeline]
+
+    def _store_override(self, override_id : int, event : UserEvent) -> Segment:
+        """
+        Convert an override to a segment and index it by (start, id) precedence.
+        """
+        segment = next(self._names.to_segments([event], OVERRIDE_LAYER))
+        self._overrides[override_id] = segment
+        insort(self._override_keys, (segment.start, override_id))
+        self._max_override_length = max(self._max_override_length, segment.end - segment.start)
+        return segment
+
+    def _discard_override(self, override_id : int) -> Segment:
+        """
+        Drop an override from the precedence index and return its segment.
+        """
+        segment = self._overrides.pop(override_id)
+        del self._override_keys[bisect_left(self._override_keys, (segment.start, override_id))]
+        return segment
+
+    def _overrides_between(self, start : datetime | None, end : datetime | None) -> Iterator[Segment]:
+        """
+        Yield the overrides intersecting [start, end] in precedence order, truncated to it.
+        No override is longer than _max_override_length, so only overrides starting in
+        [start - _max_override_length, end) need to be looked at.
+        """
+        keys = self._override_keys
+        lo = 0 if start is None else bisect_left(keys, (start - self._max_override_length,))
+        hi = len(keys) if end is None else bisect_left(keys, (end,))
+        for idx in range(lo, hi):
+            segment = self._overrides[keys[idx][1]]
+            truncated_start = segment.start if start is None else max(segment.start, start)
+            truncated_end = segment.end if end is None else min(segment.end, end)
+            if truncated_start < truncated_end:
+                yield self._slice_event(segment, truncated_start, truncated_end)
+
+    def _rerender_range(self, start : datetime, end : datetime) -> None:
+        """
+        Re-render the part of the timeline affected by a change inside [start, end].
+        The patched stretch is widened to the whole segments touching it plus one
+        neighbour on each side, so that segments split or joined at its edges are
+        re-combined exactly as a full render would combine them.
+        E.g.
+        timeline = [(A, 1pm, 3pm), (B, 3pm, 5pm), (A, 5pm, 7pm)]
+        remove_override((B, 3pm, 5pm)) re-renders [1pm, 7pm] into [(A, 1pm, 7pm)]
+        """
+        if start >= end:
+            return
+        timeline, starts, ends = self._timeline, self._timeline_starts, self._timeline_ends
+        lo = max(bisect_right(ends, start) - 1, 0)
+        hi = min(bisect_left(starts, end) + 1, len(timeline))
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+
+        schedules = self._schedule_segments
+        sched_lo = max(bisect_right(self._schedule_starts, start) - 1, 0)
+        sched_hi = bisect_left(self._schedule_starts, end)
+        clipped_schedules = (self._slice_event(segment, max(segment.start, start), min(segment.end, end))
+                             for segment in schedules[sched_lo:sched_hi])
+
+        patch = list(self._render(clipped_schedules, self._overrides_between(start, end)))
+        timeline[lo:hi] = patch
+        starts[lo:hi] = [segment.start for segment in patch]
+        ends[lo:hi] = [segment.end for segment in patch]
+        self._changed_ranges.append((start, end))
 
-        for curr in self.final_schedule[1:]:
-            if curr.name == prev.name and prev.end_time == curr.start_time:
-                prev.end_time = curr.end_time
-            else:
-                self._append_if_valid(merged, prev)
-                prev = curr
-        if prev.start_time < prev.end_time:
-            merged.append(prev)
-        return merged
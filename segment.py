@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Iterable, Iterator
+from user_event import UserEvent
+
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+# Provenance of a segment: which input it was cut from
+SCHEDULE_LAYER = 0
+OVERRIDE_LAYER = 1
+
+def to_epoch_seconds(time : datetime) -> int:
+    """
+    Convert a naive UTC datetime into integer seconds since the epoch.
+    Times are second-granular, matching the timestamp format of the input files.
+    """
+    return (time - EPOCH) // ONE_SECOND
+
+def from_epoch_seconds(seconds : int) -> datetime:
+    """
+    Convert integer seconds since the epoch back into a naive UTC datetime.
+    """
+    return EPOCH + timedelta(seconds=seconds)
+
+def to_epoch_microseconds(time : datetime) -> int:
+    """
+    Convert a naive UTC datetime into integer microseconds since the epoch.
+    Unlike to_epoch_seconds this is lossless for any datetime.
+    E.g.
+    datetime(1970, 1, 1, 0, 0, 1, 500000) -> 1500000
+    """
+    return (time - EPOCH) // ONE_MICROSECOND
+
+def from_epoch_microseconds(microseconds : int) -> datetime:
+    """
+    Convert integer microseconds since the epoch back into a naive UTC datetime.
+    """
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+class Segment:
+    """
+    Compact event record used inside the engine's inner loops.
+    start and end are the input events' own naive UTC datetimes, passed through
+    unconverted so the engine's boundaries cost nothing to build or to turn back into
+    UserEvents, and the owner is an interned name id. Each record has no __dict__.
+    layer records which input the segment was cut from (SCHEDULE_LAYER or OVERRIDE_LAYER,
+    or the layer's rank for SchedulingEngine.from_layers).
+    It is exact up to the merge stage; combined segments keep the layer of their first part.
+    """
+    __slots__ = ("start", "end", "owner", "layer")
+
+    def __init__(self, start : datetime, end : datetime, owner : int, layer : int = SCHEDULE_LAYER) -> None:
+        self.start = start
+        self.end = end
+        self.owner = owner
+        self.layer = layer
+
+    def __repr__(self) -> str:
+        """
+        Returns a clear string representation of the segment for debugging.
+        """
+        return f"Segment(start={self.start}, end={self.end}, owner={self.owner}, layer={self.layer})"
+
+
+class NameTable:
+    """
+    Interns user names to small integer ids and maps them back.
+    """
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def intern(self, name : str) -> int:
+        """
+        Return the id for a name, assigning the next free id on first use.
+        """
+        owner = self.ids.get(name)
+        if owner is None:
+            owner = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return owner
+
+    def to_segments(self, events : Iterable[UserEvent], layer : int = SCHEDULE_LAYER) -> Iterator[Segment]:
+        """
+        Convert UserEvent objects into Segments of the given layer at the engine's input boundary.
+        """
+        ids, intern = self.ids, self.intern
+        for event in events:
+            owner = ids.get(event.name)
+            if owner is None:
+                owner = intern(event.name)
+            yield Segment(event.start_time, event.end_time, owner, layer)
+
+    def to_sorted_segments(self, events : Iterable[UserEvent], layer : int = SCHEDULE_LAYER) -> list[Segment]:
+        """
+        Convert UserEvent objects into a new list of Segments ordered by start time
+        (input order on ties). The events themselves are never modified.
+        Order is checked during the conversion, so input that is already sorted
+        (e.g. rotation output or FileHandler.read_overrides) is not sorted again.
+        """
+        ids, intern = self.ids, self.intern
+        segments = []
+        append = segments.append
+        prev_start, in_order = None, True
+        for event in events:
+            owner = ids.get(event.name)
+            if owner is None:
+                owner = intern(event.name)
+            start = event.start_time
+            if in_order and prev_start is not None and start < prev_start:
+                in_order = False
+            prev_start = start
+            append(Segment(start, event.end_time, owner, layer))
+        if not in_order:
+            segments.sort(key=attrgetter("start"))
+        return segments
+
+    def iter_sorted_segments(self, events : Iterable[UserEvent], layer : int = SCHEDULE_LAYER) -> Iterator[Segment]:
+        """
+        Lazily convert UserEvent objects into Segments ordered by start time (input order on ties).
+        Order is checked on the events first and only out-of-order input is sorted (into a
+        copy). Segments are then created as the pipeline consumes them, so they are
+        short-lived and no list of input segments is built.
+        """
+        if not isinstance(events, list):
+            events = list(events)
+        start_times = map(attrgetter("start_time"), events)
+        prev_start = next(start_times, None)
+        for start in start_times:
+            if start < prev_start:
+                events = sorted(events, key=attrgetter("start_time"))
+                break
+            prev_start = start
+        return self.to_segments(events, layer)
+
+    def to_user_events(self, segments : Iterable[Segment]) -> Iterator[UserEvent]:
+        """
+        Convert Segments back into UserEvent objects at the engine's output boundary.
+        """
+        names = self.names
+        for segment in segments:
+            yield UserEvent(names[segment.owner], segment.start, segment.end)
@@ -0,0 +1,204 @@
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
+from typing import Iterator
+from rendered_schedule import RenderedSchedule
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+# Events per snapshot chunk; an edit copies the chunks it touches and shares the rest
+SNAPSHOT_CHUNK_SIZE = 512
+
+class ScheduleSnapshot(RenderedSchedule):
+    def __init__(self, chunks : list[RenderedSchedule], version : int) -> None:
+        """
+        A rendered schedule published by SharedSchedule.
+        It is never modified once published, so any number of threads can query it
+        without locking. version counts the edits applied before it was rendered.
+        The events are held in chunks of consecutive events, each indexed on its own,
+        so the next snapshot can share every chunk an edit did not touch. Queries
+        bisect the chunks' first start times and then the chunk. The flat events,
+        starts and ends of RenderedSchedule are built from the chunks on first use.
+        """
+        self.chunks = chunks
+        self.chunk_starts = [chunk.starts[0] for chunk in chunks]
+        self.version = version
+        self._events = None
+        self._starts = None
+        self._ends = None
+
+    @classmethod
+    def from_events(cls, events : list[UserEvent], version : int, chunk_size : int = SNAPSHOT_CHUNK_SIZE) -> "ScheduleSnapshot":
+        """
+        Build a snapshot from sorted, non-overlapping events.
+        """
+        return cls(_to_chunks(events, chunk_size), version)
+
+    @property
+    def events(self) -> list[UserEvent]:
+        """
+        All events as one list, built on first use.
+        """
+        if self._events is None:
+            self._events = list(chain.from_iterable(chunk.events for chunk in self.chunks))
+        return self._events
+
+    @property
+    def starts(self) -> list[datetime]:
+        """
+        Start times of all events, built on first use.
+        """
+        if self._starts is None:
+            self._starts = list(chain.from_iterable(chunk.starts for chunk in self.chunks))
+        return self._starts
+
+    @property
+    def ends(self) -> list[datetime]:
+        """
+        End times of all events, built on first use.
+        """
+        if self._ends is None:
+            self._ends = list(chain.from_iterable(chunk.ends for chunk in self.chunks))
+        return self._ends
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def event_at(self, time : datetime) -> UserEvent | None:
+        """
+        Return the event covering the given time, or None if nobody is on call.
+        """
+        idx = bisect_right(self.chunk_starts, time) - 1
+        return self.chunks[idx].event_at(time) if idx >= 0 else None
+
+    def between(self, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+        """
+        Return the events that overlap [start_time, end_time], untruncated.
+        """
+        lo = max(bisect_right(self.chunk_starts, start_time) - 1, 0)
+        hi = bisect_left(self.chunk_starts, end_time)
+        return [event for chunk in self.chunks[lo:hi] for event in chunk.between(start_time, end_time)]
+
+    def patched(self, changes : list[tuple[datetime, datetime, list[UserEvent]]], version : int,
+                chunk_size : int = SNAPSHOT_CHUNK_SIZE) -> "ScheduleSnapshot":
+        """
+        Return a new snapshot with the events overlapping each changed [start_time, end_time]
+        replaced by the given events. Ranges must not overlap and must start and end on event
+        boundaries. Only the chunks a range touches are copied; the others are shared.
+        E.g.
+        chunks = [[A, B], [C, D], [E, F]]
+        patched with D replaced by (D1, D2) -> [[A, B], [C, D1, D2], [E, F]], first and last chunk shared
+        """
+        chunks = list(self.chunks)
+        for start_time, end_time, events in changes:
+            chunk_starts = [chunk.starts[0] for chunk in chunks]
+            lo = max(bisect_right(chunk_starts, start_time) - 1, 0)
+            hi = max(bisect_left(chunk_starts, end_time), lo)
+            old = RenderedSchedule(list(chain.from_iterable(chunk.events for chunk in chunks[lo:hi])))
+            kept_before = old.events[:bisect_right(old.ends, start_time)]
+            kept_after = old.events[bisect_left(old.starts, end_time):]
+            chunks[lo:hi] = _to_chunks(kept_before + events + kept_after, chunk_size)
+        return ScheduleSnapshot(chunks, version)
+
+
+def _to_chunks(events : list[UserEvent], chunk_size : int) -> list[RenderedSchedule]:
+    """
+    Split events into indexed chunks of at most chunk_size events.
+    """
+    return [RenderedSchedule(events[idx:idx + chunk_size]) for idx in range(0, len(events), chunk_size)]
+
+
+class SharedSchedule:
+    def __init__(self, schedule_lst : list[UserEvent], override_lst : list[UserEvent],
+                 chunk_size : int = SNAPSHOT_CHUNK_SIZE) -> None:
+        """
+        Share one rendered schedule between many threads.
+        Readers take the current snapshot, a single attribute read, and query it without
+        locking. Writers are serialised by a lock: each edit is applied to a private
+        SchedulingEngine with the incremental API, a new snapshot is built off to the
+        side and then swapped in with one reference assignment, so readers see either
+        the old or the new schedule and never a partly applied edit.
+        A new snapshot copies only the chunks of chunk_size events that the edit
+        re-rendered and shares the rest with the previous one.
+        The schedule must not contain overlapping events (see SchedulingEngine.add_override).
+        """
+        self._engine = SchedulingEngine(schedule_lst, override_lst)
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._chunk_size = chunk_size
+        self._snapshot = ScheduleSnapshot.from_events(self._engine.rendered_events(), self._version, chunk_size)
+
+    def snapshot(self) -> ScheduleSnapshot:
+        """
+        Return the latest published snapshot. Take it once and query it for a
+        consistent view across several lookups.
+        """
+        return self._snapshot
+
+    def who_is_on_call(self, time : datetime) -> str | None:
+        """
+        Return the name of the user on call at the given time in the latest snapshot.
+        """
+        return self._snapshot.who_is_on_call(time)
+
+    @contextmanager
+    def edit(self) -> Iterator[SchedulingEngine]:
+        """
+        Apply several override edits and publish them as one snapshot.
+        The private engine is yielded under the write lock and readers keep the previous
+        snapshot until the block ends. If the block raises, the edits it already applied
+        are still published so the snapshot always matches the engine; a block that
+        changed nothing publishes nothing and keeps the version.
+        E.g.
+        with shared.edit() as engine:
+            engine.remove_override(override_id)
+            engine.add_override(replacement)
+        """
+        with self._write_lock:
+            try:
+                yield self._engine
+            finally:
+                ranges = _merge_ranges(self._engine.changed_ranges())
+                if ranges:
+                    self._version += 1
+                    changes = [(start_time, end_time, self._engine.rendered_events(start_time, end_time))
+                               for start_time, end_time in ranges]
+                    self._snapshot = self._snapshot.patched(changes, self._version, self._chunk_size)
+
+    def add_override(self, event : UserEvent) -> int:
+        """
+        Add an override, publish the new snapshot and return the override's id.
+        """
+        with self.edit() as engine:
+            return engine.add_override(event)
+
+    def remove_override(self, override_id : int) -> None:
+        """
+        Remove an override by id and publish the new snapshot.
+        Raises KeyError for an unknown id.
+        """
+        with self.edit() as engine:
+            engine.remove_override(override_id)
+
+    def update_override(self, override_id : int, event : UserEvent) -> None:
+        """
+        Replace an override by id and publish the new snapshot.
+        Raises KeyError for an unknown id.
+        """
+        with self.edit() as engine:
+            engine.update_override(override_id, event)
+
+
+def _merge_ranges(ranges : list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """
+    Return the union of time ranges as sorted, disjoint ranges; touching ranges are joined.
+    """
+    merged = []
+    for start_time, end_time in sorted(ranges):
+        if merged and start_time <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_time))
+        else:
+            merged.append((start_time, end_time))
+    return merged
@@ -0,0 +1,70 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+from aggregation import fairness_summary
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+
+class TestAggregation(unittest.TestCase):
+
+    def test_aggregate_small_schedule(self):
+        """
+        Testing totals, shifts and provenance on a hand-checked example.
+        alice 7th 5pm - 10th 5pm, charlie (override) until 10th 10pm, alice again until 14th 5pm,
+        and alice's own override 14th 5pm - 15th 5pm joins her scheduled shift.
+        """
+        schedule = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 14, 17)),
+                    UserEvent("bob", datetime(2025, 11, 14, 17), datetime(2025, 11, 21, 17))]
+        overrides = [UserEvent("charlie", datetime(2025, 11, 10, 17), datetime(2025, 11, 10, 22)),
+                     UserEvent("alice", datetime(2025, 11, 14, 17), datetime(2025, 11, 15, 17))]
+        stats = SchedulingEngine(schedule, overrides).aggregate_by_user()
+
+        self.assertEqual((7 * 24 - 5 + 24) * 3600, stats["alice"].total_seconds)
+        self.assertEqual(24 * 3600, stats["alice"].override_seconds)
+        self.assertEqual(2, stats["alice"].shifts)
+        self.assertEqual((3 * 24 + 19 + 24) * 3600, stats["alice"].longest_shift_seconds)
+        self.assertEqual(5 * 3600, stats["charlie"].override_seconds)
+        self.assertEqual(0, stats["charlie"].scheduled_seconds)
+        self.assertEqual(6 * 24 * 3600, stats["bob"].scheduled_seconds)
+        self.assertEqual(3, fairness_summary(stats)["users"])
+
+    def test_aggregate_matches_rendered_output(self):
+        """
+        Testing totals and shifts against the rendered events and override time against an hourly oracle.
+        """
+        rng = random.Random(20)
+        rotation = Rotation(["alice", "bob", "charlie"], datetime(2025, 1, 1), timedelta(days=2))
+        start_time, end_time = datetime(2025, 1, 3), datetime(2025, 2, 1)
+        for trial in range(30):
+            overrides = []
+            for _ in range(rng.randrange(0, 15)):
+                start = start_time + timedelta(hours=rng.randrange(0, 24 * 29))
+                overrides.append(UserEvent(rng.choice(["alice", "dan", "erin"]), start,
+                                           min(start + timedelta(hours=rng.randrange(1, 72)), end_time)))
+            schedule = list(rotation.iter_events(start_time, end_time))
+            rendered = SchedulingEngine(schedule, overrides).override_schedule_queue()
+            stats = SchedulingEngine(schedule, overrides).aggregate_by_user()
+
+            with self.subTest(trial=trial):
+                for name in {event.name for event in rendered}:
+                    shifts = [event for event in rendered if event.name == name]
+                    durations = [(event.end_time - event.start_time) // timedelta(seconds=1) for event in shifts]
+                    self.assertEqual(sum(durations), stats[name].total_seconds)
+                    self.assertEqual(len(shifts), stats[name].shifts)
+                    self.assertEqual(max(durations), stats[name].longest_shift_seconds)
+
+                    override_hours = 0
+                    time = start_time
+                    while time < end_time:
+                        covering = [o for o in overrides if o.start_time <= time < o.end_time]
+                        if covering and max(covering, key=lambda o: (o.start_time, overrides.index(o))).name == name:
+                            override_hours += 1
+                        time += timedelta(hours=1)
+                    self.assertEqual(override_hours * 3600, stats[name].override_seconds)
+                    self.assertEqual(stats[name].total_seconds - stats[name].override_seconds, stats[name].scheduled_seconds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import json
+import tempfile
+import os
+from batch_render import read_manifest, render_batch, write_combined_output
+from file_handler import FileHandler
+from scheduling_engine import SchedulingEngine
+
+
+class TestBatchRender(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create two valid rotations, one rotation with a broken schedule file and a manifest listing them.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.start_time, self.end_time = "2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z"
+        schedules = {"payments": {"users": ["alice", "bob"], "handover_start_at": "2025-11-07T17:00:00Z", "handover_interval_days": 7},
+                     "search": {"users": ["charlie", "dan", "erin"], "handover_start_at": "2025-01-01T09:00:00Z", "handover_interval_days": 2},
+                     "broken": {"users": [], "handover_start_at": "2025-11-07T17:00:00Z", "handover_interval_days": 7}}
+        overrides = [{"user": "frank", "start_at": "2025-11-10T17:00:00Z", "end_at": "2025-11-10T22:00:00Z"}]
+        manifest = []
+        for name, schedule in schedules.items():
+            os.makedirs(os.path.join(self.tmpdir.name, name))
+            with open(os.path.join(self.tmpdir.name, name, "schedule.json"), "w") as f:
+                json.dump(schedule, f)
+            with open(os.path.join(self.tmpdir.name, name, "overrides.json"), "w") as f:
+                json.dump(overrides, f)
+            manifest.append({"name": name, "schedule": f"{name}/schedule.json", "overrides": f"{name}/overrides.json"})
+        self.manifest_file = os.path.join(self.tmpdir.name, "manifest.json")
+        with open(self.manifest_file, "w") as f:
+            json.dump(manifest, f)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _render_single(self, job : dict) -> list[dict]:
+        """
+        Render one rotation the way render_schedule.py does.
+        """
+        handler = FileHandler(job["schedule"], job["overrides"], None)
+        engine = SchedulingEngine(handler.read_schedule_file(self.start_time, self.end_time),
+                                  handler.read_override_file(self.start_time, self.end_time))
+        return [event._to_dict() for event in engine.override_schedule_queue()]
+
+    def test_render_batch_writes_one_file_per_rotation(self):
+        """
+        Testing per-rotation output files match single renders and failures do not abort the batch.
+        """
+        jobs = read_manifest(self.manifest_file)
+        output_dir = os.path.join(self.tmpdir.name, "out")
+        results = render_batch(jobs, self.start_time, self.end_time, output_dir, workers=2, chunksize=1)
+
+        self.assertListEqual(["payments", "search", "broken"], [result["name"] for result in results])
+        self.assertListEqual([True, True, False], [result["ok"] for result in results])
+        self.assertIn("ValueError", results[2]["error"])
+        for job in jobs[:2]:
+            with open(os.path.join(output_dir, f"{job['name']}.json"), "r") as f:
+                self.assertListEqual(self._render_single(job), json.load(f))
+
+    def test_render_batch_combined_output(self):
+        """
+        Testing the combined output holds every successful rotation keyed by name.
+        """
+        jobs = read_manifest(self.manifest_file)
+        results = render_batch(jobs, self.start_time, self.end_time, workers=1)
+        combined_file = os.path.join(self.tmpdir.name, "combined.json")
+        write_combined_output(results, combined_file)
+
+        with open(combined_file, "r") as f:
+            combined = json.load(f)
+        self.assertListEqual(["payments", "search"], list(combined))
+        self.assertListEqual(self._render_single(jobs[1]), combined["search"])
+
+    def test_read_manifest_rejects_duplicate_names(self):
+        """
+        Testing that a manifest repeating a rotation name raises ValueError.
+        """
+        with open(self.manifest_file, "w") as f:
+            json.dump([{"name": "a", "schedule": "s.json", "overrides": "o.json"}] * 2, f)
+        with self.assertRaises(ValueError):
+            read_manifest(self.manifest_file)
+
+    def test_read_manifest_rejects_names_outside_output_dir(self):
+        """
+        Testing that names with path separators, dot names and absolute paths raise ValueError.
+        """
+        for name in ["../escape", "a/b", "a\\b", "..", ".", "", "/tmp/x"]:
+            with open(self.manifest_file, "w") as f:
+                json.dump([{"name": name, "schedule": "s.json", "overrides": "o.json"}], f)
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                read_manifest(self.manifest_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
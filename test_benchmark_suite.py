@@ -0,0 +1,33 @@
+import unittest
+from benchmarks.suite import compare_results
+from benchmarks.workloads import WORKLOADS, build_workload
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_workloads_are_deterministic(self):
+        """
+        Testing the same name, seed and scale build identical workloads.
+        """
+        for name in WORKLOADS:
+            with self.subTest(name=name):
+                first, second = build_workload(name, 3, 0.01), build_workload(name, 3, 0.01)
+                self.assertListEqual(first.overrides, second.overrides)
+                self.assertListEqual(first.schedule_events(), second.schedule_events())
+                self.assertTrue(first.overrides)
+
+    def test_compare_results_flags_slowdowns_beyond_tolerance(self):
+        """
+        Testing only benchmarks slower than the tolerance and above the noise floor are reported.
+        """
+        baseline = {"results": {"a/merge": {"seconds": 0.010}, "a/combine": {"seconds": 0.010},
+                                "a/write": {"seconds": 0.0001}}}
+        results = {"results": {"a/merge": {"seconds": 0.0125}, "a/combine": {"seconds": 0.0115},
+                               "a/write": {"seconds": 0.0005}, "b/merge": {"seconds": 1.0}}}
+        regressions = compare_results(results, baseline, tolerance=0.2)
+        self.assertEqual(1, len(regressions))
+        self.assertTrue(regressions[0].startswith("a/merge"))
+
+
+if __name__ == "__main__":
+    unittest.main()
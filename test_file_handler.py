@@ -1,9 +1,10 @@
 import unittest
 import json
+import random
 import tempfile
 import os
-from datetime import datetime
-from file_handler import FileHandler
+from datetime import datetime, timedelta
+from file_handler import FileHandler, TIMESTAMP_FORMAT
 from user_event import UserEvent
 
 
@@ -88,6 +89,244 @@ class TestFileHandler(unittest.TestCase):
         for i, d in enumerate(data):
             self.assertEqual(d["user"], expected[i]["name"])
 
+    def test_iter_override_file_matches_read_override_file(self):
+        """
+        Testing the incremental override reader yields the same events as read_override_file
+        for a file sorted by start_at.
+        """
+        override_data = [{"user": "dan", "start_at": "2025-11-01T17:00:00Z", "end_at": "2025-11-08T17:00:00Z"},
+                         {"user": "charlie", "start_at": "2025-11-10T17:00:00Z", "end_at": "2025-11-10T22:00:00Z"},
+                         {"user": 5, "start_at": "2025-11-12T17:00:00Z", "end_at": "2025-11-13T17:00:00Z"}]
+        with open(self.override_file, "w") as f:
+            json.dump(override_data, f, indent=4)
+        expected = self.handler.read_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z")
+        actual = list(self.handler.iter_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z"))
+        self.assertListEqual(expected, actual)
+
+    def test_iter_override_file_malformed_json_raises(self):
+        """
+        Testing the incremental override reader rejects a truncated JSON array.
+        """
+        with open(self.override_file, "w") as f:
+            f.write('[{"user": "charlie", "start_at": "2025-11-10T17:00:00Z"')
+        with self.assertRaises(ValueError):
+            list(self.handler.iter_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z"))
+
+    def test_write_to_output_file_streams_identical_json(self):
+        """
+        Testing that writing from a generator matches json.dump with indent=2 byte for byte.
+        """
+        schedule_queue = [UserEvent("alice", self._get_dt(2025,11,7,17), self._get_dt(2025,11,14,17)),
+                          UserEvent("bob", self._get_dt(2025,11,14,17), self._get_dt(2025,11,21,17))]
+        for events in ([], schedule_queue[:1], schedule_queue):
+            self.handler.write_to_output_file(event for event in events)
+            with open(self.output_file, "r") as f:
+                actual = f.read()
+            self.assertEqual(json.dumps([event._to_dict() for event in events], indent=2), actual)
+
+    def _strptime_or_none(self, date_time_str : str) -> datetime | None:
+        """
+        Reference parser: the original strptime based conversion.
+        """
+        try:
+            return datetime.strptime(date_time_str, TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+
+    def test_fast_timestamp_parser_matches_strptime(self):
+        """
+        Testing the fast parser against strptime on valid, invalid and mutated timestamps.
+        """
+        rng = random.Random(9)
+        samples = ["2025-11-07T17:00:00Z", "2024-02-29T00:00:00Z", "2025-02-29T00:00:00Z", "2025-11-07T24:00:00Z",
+                   "2025-11-07t17:00:00Z", "2025-11-7T17:00:00Z", "2025-11-07T17:00:00", "2025-11-07 17:00:00Z",
+                   "2025-11-07T17:00:00+00:00", "0000-01-01T00:00:00Z", "２０２５-11-07T17:00:00Z", ""]
+        for _ in range(2000):
+            chars = list((datetime(2000, 1, 1) + timedelta(seconds=rng.randrange(10**9))).strftime(TIMESTAMP_FORMAT))
+            chars[rng.randrange(len(chars))] = rng.choice("0123456789 -:TZ+x")
+            samples.append("".join(chars))
+        for sample in samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(self._strptime_or_none(sample), self.handler._convert_str_to_datetime(sample))
+
+    def test_write_to_output_file_pretty_is_byte_identical_across_chunks(self):
+        """
+        Testing the default format stays byte-identical to json.dump with indent=2,
+        including names that need escaping and more records than one write chunk.
+        """
+        names = ["alice", "bob \"the builder\"", "chlo\u00e9", "dan\\n"]
+        base = self._get_dt(2025,11,7,17)
+        events = [UserEvent(names[i % len(names)], base + timedelta(hours=i), base + timedelta(hours=i + 1)) for i in range(2500)]
+        self.handler.write_to_output_file(events)
+        with open(self.output_file, "r") as f:
+            actual = f.read()
+        self.assertEqual(json.dumps([event._to_dict() for event in events], indent=2), actual)
+
+    def test_write_to_output_file_compact_and_jsonl(self):
+        """
+        Testing the compact and JSON Lines formats decode to the same records.
+        """
+        events = [UserEvent("alice", self._get_dt(2025,11,7,17), self._get_dt(2025,11,14,17)),
+                  UserEvent("bob", self._get_dt(2025,11,14,17), self._get_dt(2025,11,21,17))]
+        expected = [event._to_dict() for event in events]
+
+        self.handler.write_to_output_file(events, output_format="compact")
+        with open(self.output_file, "r") as f:
+            content = f.read()
+        self.assertNotIn(" ", content)
+        self.assertListEqual(expected, json.loads(content))
+
+        self.handler.write_to_output_file(events, output_format="jsonl")
+        with open(self.output_file, "r") as f:
+            lines = f.read().splitlines()
+        self.assertListEqual(expected, [json.loads(line) for line in lines])
+
+    def test_write_to_output_file_unknown_format_raises(self):
+        """
+        Testing that an unknown output format raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.handler.write_to_output_file([], output_format="xml")
+
+    def test_write_to_output_file_keeps_previous_output_on_error(self):
+        """
+        Testing that an error raised mid-stream (e.g. unsorted overrides in --stream mode)
+        leaves the previous output file intact and no temporary file behind.
+        """
+        self.handler.write_to_output_file([UserEvent("alice", self._get_dt(2025,11,7,17), self._get_dt(2025,11,8,17))])
+        with open(self.output_file, "r") as f:
+            previous = f.read()
+
+        def failing_queue():
+            for hour in range(3000):
+                yield UserEvent("bob", self._get_dt(2025,11,7,17) + timedelta(hours=hour),
+                                self._get_dt(2025,11,7,18) + timedelta(hours=hour))
+            raise ValueError("override events are not sorted by start time")
+
+        with self.assertRaises(ValueError):
+            self.handler.write_to_output_file(failing_queue())
+        with open(self.output_file, "r") as f:
+            self.assertEqual(previous, f.read())
+        self.assertListEqual(sorted(["schedule.json", "override.json", "output.json"]), sorted(os.listdir(self.tmpdir.name)))
+
+    def test_read_override_file_keeps_full_file_precedence(self):
+        """
+        Testing overrides truncated to the same start keep the order of their original start_at.
+        Bob starts later than Alice, so Bob must still come last (and win) after truncation.
+        """
+        override_data = [{"user": "bob", "start_at": "2025-11-06T17:00:00Z", "end_at": "2025-11-09T17:00:00Z"},
+                         {"user": "alice", "start_at": "2025-11-05T17:00:00Z", "end_at": "2025-11-09T17:00:00Z"}]
+        with open(self.override_file, "w") as f:
+            json.dump(override_data, f)
+        result = self.handler.read_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z")
+        self.assertListEqual(["alice", "bob"], [event.name for event in result])
+
+    def test_multiple_override_sources_match_concatenated_file(self):
+        """
+        Testing a list of sources and a directory of sources read like one concatenated file,
+        with later sources winning ties, both inline and in worker processes.
+        """
+        rng = random.Random(14)
+        sources = []
+        for _ in range(3):
+            source = []
+            for _ in range(40):
+                start = datetime(2025, 11, 1) + timedelta(hours=rng.randrange(0, 24 * 30))
+                source.append({"user": rng.choice(["charlie", "dan", "erin"]),
+                               "start_at": start.strftime(TIMESTAMP_FORMAT),
+                               "end_at": (start + timedelta(hours=rng.randrange(1, 48))).strftime(TIMESTAMP_FORMAT)})
+            sources.append(source)
+        source_dir = os.path.join(self.tmpdir.name, "sources")
+        os.makedirs(source_dir)
+        for idx, source in enumerate(sources):
+            with open(os.path.join(source_dir, f"{idx}.json"), "w") as f:
+                json.dump(source, f)
+        with open(self.override_file, "w") as f:
+            json.dump([override for source in sources for override in source], f)
+
+        expected = self.handler.read_override_file("2025-11-05T00:00:00Z", "2025-11-20T00:00:00Z")
+        paths = [os.path.join(source_dir, f"{idx}.json") for idx in range(3)]
+        for override_file in (source_dir, paths):
+            for workers in (1, 2):
+                with self.subTest(override_file=override_file, workers=workers):
+                    handler = FileHandler(self.schedule_file, override_file, self.output_file, workers)
+                    self.assertListEqual(expected, handler.read_override_file("2025-11-05T00:00:00Z", "2025-11-20T00:00:00Z"))
+                    self.assertListEqual(self.handler.read_overrides(), handler.read_overrides())
+
+    def test_iter_override_file_merges_sorted_sources(self):
+        """
+        Testing streaming reads merge several sorted sources by start time.
+        """
+        second_file = os.path.join(self.tmpdir.name, "second.json")
+        with open(second_file, "w") as f:
+            json.dump([{"user": "dan", "start_at": "2025-11-08T17:00:00Z", "end_at": "2025-11-09T17:00:00Z"},
+                       {"user": "erin", "start_at": "2025-11-10T17:00:00Z", "end_at": "2025-11-11T17:00:00Z"}], f)
+        handler = FileHandler(self.schedule_file, [self.override_file, second_file], self.output_file)
+        result = list(handler.iter_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z"))
+        self.assertListEqual(["dan", "charlie", "erin"], [event.name for event in result])
+
+    def test_empty_override_directory_reads_no_overrides(self):
+        """
+        Testing that an empty override directory gives no overrides on every read path.
+        """
+        source_dir = os.path.join(self.tmpdir.name, "empty")
+        os.makedirs(source_dir)
+        for workers in (None, 1, 2):
+            with self.subTest(workers=workers):
+                handler = FileHandler(self.schedule_file, source_dir, self.output_file, workers)
+                self.assertListEqual([], handler.read_overrides())
+                self.assertListEqual([], handler.read_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z"))
+                self.assertListEqual([], list(handler.iter_override_file("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z")))
+
+    def test_read_rotation_with_timezone(self):
+        """
+        Testing that a timezone keeps handovers at the same local time across DST,
+        and that an unknown timezone raises ValueError.
+        """
+        self.schedule_data.update({"handover_start_at": "2025-10-24T13:00:00Z", "timezone": "America/New_York"})
+        with open(self.schedule_file, "w") as f:
+            json.dump(self.schedule_data, f)
+        result = self.handler.read_schedule_file("2025-10-24T13:00:00Z", "2025-11-14T14:00:00Z")
+        expected = [UserEvent("alice", self._get_dt(2025,10,24,13), self._get_dt(2025,10,31,13)),
+                    UserEvent("bob", self._get_dt(2025,10,31,13), self._get_dt(2025,11,7,14)),
+                    UserEvent("alice", self._get_dt(2025,11,7,14), self._get_dt(2025,11,14,14))]
+        self.assertListEqual(expected, result)
+
+        self.schedule_data["timezone"] = "Not/AZone"
+        with open(self.schedule_file, "w") as f:
+            json.dump(self.schedule_data, f)
+        with self.assertRaises(ValueError):
+            self.handler.read_rotation()
+
+    def test_read_rotation_sub_day_interval_and_pattern(self):
+        """
+        Testing 12 hour handovers and a repeating shift pattern read from schedule.json.
+        """
+        self.schedule_data = {"users": ["alice", "bob"], "handover_start_at": "2025-11-07T09:00:00Z", "handover_interval_hours": 12}
+        with open(self.schedule_file, "w") as f:
+            json.dump(self.schedule_data, f)
+        result = self.handler.read_schedule_file("2025-11-07T15:00:00Z", "2025-11-08T12:00:00Z")
+        expected = [UserEvent("alice", self._get_dt(2025,11,7,15), self._get_dt(2025,11,7,21)),
+                    UserEvent("bob", self._get_dt(2025,11,7,21), self._get_dt(2025,11,8,9)),
+                    UserEvent("alice", self._get_dt(2025,11,8,9), self._get_dt(2025,11,8,12))]
+        self.assertListEqual(expected, result)
+
+        self.schedule_data = {"handover_start_at": "2025-11-07T09:00:00Z",
+                              "pattern": [{"user": "alice", "duration_hours": 8}, {"user": "bob", "duration_hours": 16}]}
+        with open(self.schedule_file, "w") as f:
+            json.dump(self.schedule_data, f)
+        result = self.handler.read_schedule_file("2025-11-08T00:00:00Z", "2025-11-08T12:00:00Z")
+        expected = [UserEvent("bob", self._get_dt(2025,11,8,0), self._get_dt(2025,11,8,9)),
+                    UserEvent("alice", self._get_dt(2025,11,8,9), self._get_dt(2025,11,8,12))]
+        self.assertListEqual(expected, result)
+
+        for invalid in ([{"user": "alice"}], [{"user": "alice", "duration_hours": 0}], []):
+            self.schedule_data["pattern"] = invalid
+            with open(self.schedule_file, "w") as f:
+                json.dump(self.schedule_data, f)
+            with self.subTest(pattern=invalid), self.assertRaises(ValueError):
+                self.handler.read_rotation()
+
 
 if __name__ == "__main__":
     unittest.main()
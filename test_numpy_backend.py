@@ -0,0 +1,87 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+import numpy_backend
+from random_events import random_overrides, random_schedule
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+
+@unittest.skipIf(numpy_backend.np is None, "NumPy is not installed")
+class TestNumpyBackend(unittest.TestCase):
+    def _get_dt(self, y : int, m : int, d : int, h : int, minute : int = 0) -> datetime:
+        """
+        Get date time object 
+        """
+        return datetime(y, m, d, h, minute)
+
+    def test_render_arrays_override_inside_schedule(self):
+        """
+        Testing the array entry point splits a schedule around an override.
+        E.g.
+        s = [(0, 1pm, 5pm)]
+        o = [(1, 2pm, 4pm)]
+        final = [(0, 1pm, 2pm), (1, 2pm, 4pm), (0, 4pm, 5pm)]
+        """
+        start, end, owner = numpy_backend.render_arrays([13], [17], [0], [14], [16], [1])
+        self.assertListEqual([13, 14, 16], start.tolist())
+        self.assertListEqual([14, 16, 17], end.tolist())
+        self.assertListEqual([0, 1, 0], owner.tolist())
+
+    def test_numpy_backend_rejects_overlapping_schedule(self):
+        """
+        Testing that overlapping schedule events raise ValueError.
+        """
+        s = [UserEvent("alice", self._get_dt(2025,11,10,15), self._get_dt(2025,11,10,18)),
+             UserEvent("bob", self._get_dt(2025,11,10,17), self._get_dt(2025,11,10,19))]
+        with self.assertRaises(ValueError):
+            SchedulingEngine(s, [], backend="numpy").override_schedule_queue()
+
+    def test_numpy_backend_matches_python_backend(self):
+        """
+        Randomized differential test of the numpy backend against the Python engine.
+        """
+        rng = random.Random(1107)
+        names = ["alice", "bob", "charlie", "dan"]
+        base = self._get_dt(2025,11,7,0)
+        for case in range(300):
+            s = random_schedule(rng, names, base, 6, min_length=0, max_first_start=30)
+            o = random_overrides(rng, names, base, 12, horizon=240)
+            with self.subTest(case=case):
+                expected = SchedulingEngine(list(s), list(o)).override_schedule_queue()
+                actual = SchedulingEngine(list(s), list(o), backend="numpy").override_schedule_queue()
+                self.assertListEqual(expected, actual)
+
+    def test_numpy_backend_keeps_sub_second_times(self):
+        """
+        Testing that the numpy backend renders sub-second times exactly as the Python engine.
+        E.g.
+        s = [(alice, 00:00:00.5, 01:00:00)]
+        o = [(bob, 00:30:00.25, 00:45:00)]
+        final = [(alice, 00:00:00.5, 00:30:00.25), (bob, 00:30:00.25, 00:45:00), (alice, 00:45:00, 01:00:00)]
+        """
+        base = self._get_dt(2025,11,7,0)
+        s = [UserEvent("alice", base + timedelta(microseconds=500000), base + timedelta(hours=1))]
+        o = [UserEvent("bob", base + timedelta(minutes=30, microseconds=250000), base + timedelta(minutes=45))]
+        expected = SchedulingEngine(list(s), list(o)).override_schedule_queue()
+        actual = SchedulingEngine(list(s), list(o), backend="numpy").override_schedule_queue()
+        self.assertListEqual(expected, actual)
+        self.assertEqual(base + timedelta(microseconds=500000), actual[0].start_time)
+        self.assertEqual(base + timedelta(minutes=30, microseconds=250000), actual[0].end_time)
+
+        rng = random.Random(1117)
+        names = ["alice", "bob", "charlie"]
+        shift = lambda event, offset: UserEvent(event.name, event.start_time + offset, event.end_time + offset)
+        for case in range(100):
+            offset = timedelta(microseconds=rng.randrange(0, 1000))
+            s = [shift(e, offset) for e in random_schedule(rng, names, base, 6, max_first_start=30)]
+            o = [shift(e, timedelta(microseconds=rng.randrange(0, 1000)))
+                 for e in random_overrides(rng, names, base, 12, horizon=240)]
+            with self.subTest(case=case):
+                expected = SchedulingEngine(list(s), list(o)).override_schedule_queue()
+                actual = SchedulingEngine(list(s), list(o), backend="numpy").override_schedule_queue()
+                self.assertListEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
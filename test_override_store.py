@@ -0,0 +1,89 @@
+import unittest
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from file_handler import FileHandler
+from override_store import BinaryOverrideReader, is_binary_override_file, write_binary_overrides
+from user_event import UserEvent
+
+
+class TestOverrideStore(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Write the same random overrides as json and in the binary format.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.json_file = os.path.join(self.tmpdir.name, "overrides.json")
+        self.binary_file = os.path.join(self.tmpdir.name, "overrides.bin")
+
+        rng = random.Random(13)
+        base = datetime(2025, 1, 1)
+        self.override_data = []
+        for _ in range(500):
+            start = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+            end = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 10))
+            self.override_data.append({"user": rng.choice(["alice", "bob", "zoë"]),
+                                       "start_at": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                       "end_at": end.strftime("%Y-%m-%dT%H:%M:%SZ")})
+        with open(self.json_file, "w") as f:
+            json.dump(self.override_data, f)
+
+        self.json_handler = FileHandler(None, self.json_file, None)
+        self.binary_handler = FileHandler(None, self.binary_file, None)
+        write_binary_overrides(self.json_handler.read_overrides(), self.binary_file)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_keeps_every_override_in_order(self):
+        """
+        Testing all overrides come back untruncated, sorted by start, file order on ties.
+        """
+        self.assertTrue(is_binary_override_file(self.binary_file))
+        self.assertFalse(is_binary_override_file(self.json_file))
+        self.assertListEqual(self.json_handler.read_overrides(), self.binary_handler.read_overrides())
+
+    def test_windows_match_json_reader(self):
+        """
+        Testing windowed reads against the json reader, including windows outside the data.
+        """
+        windows = [("2025-03-01T00:00:00Z", "2025-03-08T00:00:00Z"),
+                   ("2025-06-15T12:30:00Z", "2025-06-15T12:31:00Z"),
+                   ("2024-01-01T00:00:00Z", "2024-02-01T00:00:00Z"),
+                   ("2024-06-01T00:00:00Z", "2027-01-01T00:00:00Z")]
+        for start_time, end_time in windows:
+            with self.subTest(start_time=start_time, end_time=end_time):
+                expected = self.json_handler.read_override_file(start_time, end_time)
+                self.assertListEqual(expected, self.binary_handler.read_override_file(start_time, end_time))
+                self.assertListEqual(expected, list(self.binary_handler.iter_override_file(start_time, end_time)))
+
+    def test_window_decodes_only_overlapping_records(self):
+        """
+        Testing binary search bounds on records sharing a start time and touching the window edges.
+        """
+        events = [UserEvent("alice", datetime(2025, 1, 1), datetime(2025, 1, 2)),
+                  UserEvent("bob", datetime(2025, 1, 2), datetime(2025, 1, 3)),
+                  UserEvent("charlie", datetime(2025, 1, 2), datetime(2025, 1, 4)),
+                  UserEvent("dan", datetime(2025, 1, 4), datetime(2025, 1, 5))]
+        write_binary_overrides(events, self.binary_file)
+        with BinaryOverrideReader(self.binary_file) as reader:
+            self.assertEqual(4, len(reader))
+            self.assertListEqual(events[1:3], list(reader.iter_overrides_between(datetime(2025, 1, 2), datetime(2025, 1, 4))))
+            self.assertListEqual([UserEvent("charlie", datetime(2025, 1, 3), datetime(2025, 1, 3, 12))],
+                                 list(reader.iter_overrides_between(datetime(2025, 1, 3), datetime(2025, 1, 3, 12))))
+
+    def test_invalid_binary_file_raises(self):
+        """
+        Testing a file with the magic bytes but a broken header is rejected.
+        """
+        with open(self.binary_file, "r+b") as f:
+            f.truncate(20)
+        with self.assertRaises(ValueError):
+            BinaryOverrideReader(self.binary_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import time
+from datetime import datetime
+from profiler import NULL_PROFILER, Profiler
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_lazy_stages_are_timed_exclusively(self):
+        """
+        Testing time spent in an upstream generator is charged to it and not to the stage pulling from it.
+        """
+        def slow_source():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        profiler = Profiler()
+        doubled = profiler.track("double", (i * 2 for i in profiler.track("source", slow_source())))
+        self.assertListEqual([0, 2, 4], list(doubled))
+        self.assertGreaterEqual(profiler.stages["source"]["seconds"], 0.03)
+        self.assertLess(profiler.stages["double"]["seconds"], 0.01)
+        self.assertEqual(3, profiler.stages["double"]["events_out"])
+
+    def test_eager_stage_nested_in_stage(self):
+        """
+        Testing a nested stage pauses the clock of the enclosing stage.
+        """
+        profiler = Profiler()
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                time.sleep(0.02)
+        self.assertGreaterEqual(profiler.stages["inner"]["seconds"], 0.02)
+        self.assertLess(profiler.stages["outer"]["seconds"], 0.01)
+
+    def test_null_profiler_returns_stages_unwrapped(self):
+        """
+        Testing the disabled profiler adds no wrapper around lazy stages.
+        """
+        events = iter([1, 2])
+        self.assertIs(events, NULL_PROFILER.track("stage", events))
+        self.assertIs(events, NULL_PROFILER.count_in("stage", events))
+
+    def test_engine_stage_counts(self):
+        """
+        Testing a profiled render is unchanged and records events in, out and created per stage.
+        """
+        schedule = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 14, 17))]
+        overrides = [UserEvent("charlie", datetime(2025, 11, 8, 9), datetime(2025, 11, 8, 20)),
+                     UserEvent("dan", datetime(2025, 11, 8, 12), datetime(2025, 11, 8, 14))]
+        profiler = Profiler()
+        result = SchedulingEngine(schedule, overrides, profiler=profiler).override_schedule_queue()
+        self.assertListEqual(SchedulingEngine(schedule, overrides).override_schedule_queue(), result)
+
+        stages = profiler.to_dict()["stages"]
+        self.assertEqual(2, stages["resolve_overlaps"]["events_in"])
+        self.assertEqual(3, stages["resolve_overlaps"]["events_out"])
+        self.assertEqual(2, stages["resolve_overlaps"]["events_created"])
+        self.assertEqual(4, stages["merge"]["events_in"])
+        self.assertEqual(5, stages["merge"]["events_out"])
+        self.assertEqual(5, stages["combine"]["events_out"])
+        self.assertEqual(5, stages["to_user_events"]["events_out"])
+
+    def test_inputs_are_held_only_while_in_flight(self):
+        """
+        Testing inputs that can no longer be passed through are released while counting created events.
+        """
+        class Event:
+            def __init__(self, start):
+                self.start = start
+
+        profiler = Profiler()
+        held = []
+
+        def every_other_split(events):
+            for event in events:
+                held.append(len(profiler._tracking[-1].events))
+                yield event if event.start % 2 else Event(event.start)
+
+        events = [Event(start) for start in range(1000)]
+        out = list(profiler.track("split", every_other_split(profiler.count_in("split", events))))
+        self.assertEqual(1000, len(out))
+        self.assertEqual(500, profiler.stages["split"]["events_created"])
+        self.assertLessEqual(max(held), 2)
+
+    def test_layered_render_counts_created_events_per_layer(self):
+        """
+        Testing concurrently swept layers count the fragments of each layer separately.
+        """
+        base = [UserEvent("alice", datetime(2025, 11, 7), datetime(2025, 11, 14))]
+        first = [UserEvent("bob", datetime(2025, 11, 8), datetime(2025, 11, 10)),
+                 UserEvent("charlie", datetime(2025, 11, 9), datetime(2025, 11, 9, 12))]
+        second = [UserEvent("dan", datetime(2025, 11, 11), datetime(2025, 11, 12))]
+        profiler = Profiler()
+        SchedulingEngine.from_layers([base, first, second], profiler=profiler).override_schedule_queue()
+        stages = profiler.to_dict()["stages"]
+        self.assertEqual(4, stages["resolve_overlaps"]["events_in"])
+        self.assertEqual(5, stages["resolve_overlaps"]["events_out"])
+        self.assertEqual(2, stages["resolve_overlaps"]["events_created"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import unittest
+import asyncio
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from file_handler import FileHandler, parse_utc_timestamp
+from render_service import CachedWindow, RenderCache, RenderService, WindowIndex
+from scheduling_engine import SchedulingEngine
+
+
+class TestRenderService(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a weekly two-user rotation with overrides spanning several windows.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.schedule_file = os.path.join(self.tmpdir.name, "schedule.json")
+        self.override_file = os.path.join(self.tmpdir.name, "overrides.json")
+        with open(self.schedule_file, "w") as f:
+            json.dump({"users": ["alice", "bob", "charlie"], "handover_start_at": "2025-11-07T17:00:00Z", "handover_interval_days": 7}, f)
+        self.write_overrides([{"user": "dan", "start_at": "2025-11-10T17:00:00Z", "end_at": "2025-11-12T17:00:00Z"},
+                              {"user": "erin", "start_at": "2025-11-11T09:00:00Z", "end_at": "2025-11-20T09:00:00Z"},
+                              {"user": "frank", "start_at": "2025-11-15T12:00:00Z", "end_at": "2025-11-16T12:00:00Z"}])
+        self.cache = RenderCache({"default": (self.schedule_file, self.override_file)})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_overrides(self, overrides):
+        with open(self.override_file, "w") as f:
+            json.dump(overrides, f)
+
+    def direct_render(self, start_time_str, end_time_str):
+        file_handler = FileHandler(self.schedule_file, self.override_file, None)
+        return SchedulingEngine(file_handler.read_schedule_file(start_time_str, end_time_str),
+                                file_handler.read_override_file(start_time_str, end_time_str)).override_schedule_queue()
+
+    def test_repeated_window_is_served_from_cache(self):
+        """
+        Test an identical request returns the cached window.
+        """
+        first = self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        second = self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        self.assertIs(first, second)
+
+    def test_sliced_window_matches_direct_render(self):
+        """
+        Test sub-windows sliced from a cached wider window equal a fresh render of the sub-window.
+        """
+        self.cache.render("default", datetime(2025, 11, 1), datetime(2025, 12, 1))
+        for start_time_str, end_time_str in [("2025-11-11T00:00:00Z", "2025-11-16T00:00:00Z"),
+                                             ("2025-11-15T13:00:00Z", "2025-11-15T14:00:00Z"),
+                                             ("2025-11-01T00:00:00Z", "2025-11-30T23:00:00Z")]:
+            window = self.cache.render("default", parse_utc_timestamp(start_time_str), parse_utc_timestamp(end_time_str))
+            self.assertEqual(window.schedule.events, self.direct_render(start_time_str, end_time_str))
+
+    def test_changed_override_file_invalidates_cache(self):
+        """
+        Test windows are re-rendered once the override file changes on disk.
+        """
+        before = self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        self.write_overrides([{"user": "zed", "start_at": "2025-11-08T00:00:00Z", "end_at": "2025-11-09T00:00:00Z"}])
+        os.utime(self.override_file, ns=(0, 1))
+        after = self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        self.assertIsNot(before, after)
+        self.assertEqual(after.schedule.events, self.direct_render("2025-11-07T17:00:00Z", "2025-11-28T17:00:00Z"))
+        self.assertEqual(self.cache.who_is_on_call("default", datetime(2025, 11, 8, 12)), "zed")
+
+    def test_touched_file_with_same_content_keeps_cache(self):
+        """
+        Test a new mtime alone does not drop cached windows.
+        """
+        before = self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        os.utime(self.override_file, ns=(0, 1))
+        self.assertIs(before, self.cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17)))
+
+    def test_override_directory_is_watched_file_by_file(self):
+        """
+        Test a directory of override files is loaded, and a file added to it invalidates the cache.
+        """
+        override_dir = os.path.join(self.tmpdir.name, "overrides")
+        os.mkdir(override_dir)
+        os.rename(self.override_file, os.path.join(override_dir, "a.json"))
+        cache = RenderCache({"default": (self.schedule_file, override_dir)})
+        before = cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17))
+        self.assertEqual(cache.who_is_on_call("default", datetime(2025, 11, 15, 13)), "frank")
+        with open(os.path.join(override_dir, "b.json"), "w") as f:
+            json.dump([{"user": "zed", "start_at": "2025-11-08T00:00:00Z", "end_at": "2025-11-09T00:00:00Z"}], f)
+        self.assertIsNot(before, cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 28, 17)))
+        self.assertEqual(cache.who_is_on_call("default", datetime(2025, 11, 8, 12)), "zed")
+
+    def test_window_index_matches_scan(self):
+        """
+        Test covering-window lookups stay equal to scanning every window while windows are added and removed.
+        """
+        rng = random.Random(11)
+        index, windows = WindowIndex(), []
+        base = datetime(2025, 11, 1)
+        for _ in range(300):
+            if windows and rng.random() < 0.4:
+                index.remove(windows.pop(rng.randrange(len(windows))))
+            else:
+                start = base + timedelta(hours=rng.randrange(200))
+                window = CachedWindow(start, start + timedelta(hours=rng.randrange(1, 48)), None)
+                index.add(window)
+                windows.append(window)
+            start = base + timedelta(hours=rng.randrange(-10, 250))
+            end = start + timedelta(hours=rng.randrange(1, 30))
+            found = index.covering(start, end)
+            if found is None:
+                self.assertFalse(any(w.start_time <= start and end <= w.end_time for w in windows))
+            else:
+                self.assertIn(found, windows)
+                self.assertTrue(found.start_time <= start and end <= found.end_time)
+            found = index.at(start)
+            if found is None:
+                self.assertFalse(any(w.start_time <= start < w.end_time for w in windows))
+            else:
+                self.assertTrue(found.start_time <= start < found.end_time)
+
+    def test_lru_eviction_bounds_cached_events(self):
+        """
+        Test least recently used windows are evicted once the event limit is exceeded.
+        """
+        cache = RenderCache({"default": (self.schedule_file, self.override_file)}, max_cached_events=12)
+        first = cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 21, 17))
+        cache.render("default", datetime(2026, 1, 1), datetime(2026, 2, 1))
+        cache.render("default", datetime(2026, 3, 1), datetime(2026, 4, 1))
+        self.assertLessEqual(cache.cached_events, 12)
+        self.assertIsNot(first, cache.render("default", datetime(2025, 11, 7, 17), datetime(2025, 11, 21, 17)))
+
+    def test_who_is_on_call_without_cached_window(self):
+        """
+        Test on-call lookups work before anything has been rendered.
+        """
+        self.assertEqual(self.cache.who_is_on_call("default", datetime(2025, 11, 15, 13)), "frank")
+        self.assertEqual(self.cache.who_is_on_call("default", datetime(2025, 11, 8)), "alice")
+        self.assertIsNone(self.cache.who_is_on_call("default", datetime(2025, 1, 1)))
+
+    def test_http_requests_over_keep_alive_connection(self):
+        """
+        Test render, on-call and error responses over one connection.
+        """
+        async def exchange():
+            server = await RenderService(self.cache).serve_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for path in ["/render?from=2025-11-07T17:00:00Z&until=2025-11-21T17:00:00Z",
+                         "/on-call?at=2025-11-15T13:00:00Z",
+                         "/render?from=bad&until=2025-11-21T17:00:00Z",
+                         "/on-call?rotation=missing&at=2025-11-15T13:00:00Z"]:
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                while (header := await reader.readline()) != b"\r\n":
+                    if header.lower().startswith(b"content-length:"):
+                        length = int(header.split(b":")[1])
+                responses.append((status, json.loads(await reader.readexactly(length))))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+        responses = asyncio.run(exchange())
+        expected = [event._to_dict() for event in self.direct_render("2025-11-07T17:00:00Z", "2025-11-21T17:00:00Z")]
+        self.assertEqual(responses[0], (200, expected))
+        self.assertEqual(responses[1], (200, {"user": "frank"}))
+        self.assertEqual(responses[2][0], 400)
+        self.assertEqual(responses[3][0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from datetime import datetime, timedelta
+import random
+from rendered_schedule import OverrideIndex, RenderedSchedule, render_periods, render_windows, who_is_on_call
+from rotation import Rotation, RotationPlan
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+
+class TestRenderedSchedule(unittest.TestCase):
+    def setUp(self):
+        self.events = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 10, 17)),
+                       UserEvent("charlie", datetime(2025, 11, 10, 17), datetime(2025, 11, 10, 22)),
+                       UserEvent("alice", datetime(2025, 11, 10, 22), datetime(2025, 11, 14, 17)),
+                       UserEvent("bob", datetime(2025, 11, 15, 17), datetime(2025, 11, 21, 17))]
+        self.schedule = RenderedSchedule(self.events)
+
+    def test_who_is_on_call_point_lookup(self):
+        """
+        Testing point lookups on and between event boundaries, in gaps and outside the schedule.
+        """
+        self.assertEqual("alice", self.schedule.who_is_on_call(datetime(2025, 11, 7, 17)))
+        self.assertEqual("charlie", self.schedule.who_is_on_call(datetime(2025, 11, 10, 17)))
+        self.assertEqual("alice", self.schedule.who_is_on_call(datetime(2025, 11, 10, 22)))
+        self.assertIsNone(self.schedule.who_is_on_call(datetime(2025, 11, 15, 9)))
+        self.assertIsNone(self.schedule.who_is_on_call(datetime(2025, 11, 1)))
+        self.assertIsNone(self.schedule.who_is_on_call(datetime(2025, 11, 21, 17)))
+
+    def test_between_returns_overlapping_slice(self):
+        """
+        Testing that range queries return every event overlapping the range, untruncated.
+        """
+        self.assertListEqual(self.events[1:3], self.schedule.between(datetime(2025, 11, 10, 18), datetime(2025, 11, 11)))
+        self.assertListEqual(self.events[:1], self.schedule.between(datetime(2025, 11, 1), datetime(2025, 11, 10, 17)))
+        self.assertListEqual([], self.schedule.between(datetime(2025, 11, 14, 17), datetime(2025, 11, 15, 17)))
+
+    def test_who_is_on_call_from_rotation_matches_render(self):
+        """
+        Testing the rotation based lookup against a point lookup on a full render.
+        """
+        rotation = Rotation(["alice", "bob", "charlie"], datetime(2025, 1, 3, 9), timedelta(days=2))
+        overrides = [UserEvent("dan", datetime(2025, 11, 8, 10), datetime(2025, 11, 9, 12)),
+                     UserEvent("erin", datetime(2025, 11, 8, 20), datetime(2025, 11, 8, 23)),
+                     UserEvent("frank", datetime(2025, 11, 8, 20), datetime(2025, 11, 8, 21))]
+        start_time, end_time = datetime(2025, 11, 7), datetime(2025, 11, 11)
+        schedule = list(rotation.iter_events(start_time, end_time))
+        rendered = RenderedSchedule(SchedulingEngine(schedule, list(overrides)).override_schedule_queue())
+        time = start_time
+        while time < end_time:
+            with self.subTest(time=time):
+                self.assertEqual(rendered.who_is_on_call(time), who_is_on_call(rotation, overrides, time))
+            time += timedelta(minutes=30)
+
+    def test_override_index_matches_linear_scan(self):
+        """
+        Testing indexed override lookups against scanning every override, with random
+        overlapping overrides of very different lengths and shared start times.
+        """
+        rng = random.Random(6)
+        base = datetime(2025, 11, 7)
+        overrides = []
+        for _ in range(300):
+            start = base + timedelta(minutes=rng.randrange(0, 20000, 30))
+            overrides.append(UserEvent(f"user{len(overrides)}", start, start + timedelta(minutes=rng.choice([30, 90, 600, 4000]))))
+        index = OverrideIndex(overrides)
+        self.assertIsNone(OverrideIndex([]).override_at(base))
+        for minute in range(-60, 25000, 13):
+            time = base + timedelta(minutes=minute)
+            winner = None
+            for override in overrides:
+                if override.start_time <= time < override.end_time and (winner is None or override.start_time >= winner.start_time):
+                    winner = override
+            with self.subTest(time=time):
+                self.assertIs(winner, index.override_at(time))
+
+    def test_clip_truncates_edge_events(self):
+        """
+        Testing clipping truncates the first and last events, including a single event spanning both edges.
+        """
+        self.assertListEqual([UserEvent("alice", datetime(2025, 11, 10), datetime(2025, 11, 10, 17)),
+                              UserEvent("charlie", datetime(2025, 11, 10, 17), datetime(2025, 11, 10, 18))],
+                             self.schedule.clip(datetime(2025, 11, 10), datetime(2025, 11, 10, 18)))
+        self.assertListEqual([UserEvent("bob", datetime(2025, 11, 16), datetime(2025, 11, 17))],
+                             self.schedule.clip(datetime(2025, 11, 16), datetime(2025, 11, 17)))
+
+    def test_render_windows_matches_independent_renders(self):
+        """
+        Testing overlapping, touching, nested and disjoint windows against rendering each window on its own.
+        """
+        rng = random.Random(18)
+        rotation = Rotation(["alice", "bob", "charlie"], datetime(2025, 1, 3, 9), timedelta(days=2))
+        base = datetime(2025, 1, 1)
+        overrides = []
+        for _ in range(60):
+            start = base + timedelta(hours=rng.randrange(0, 24 * 90))
+            overrides.append(UserEvent(rng.choice(["dan", "erin"]), start, start + timedelta(hours=rng.randrange(1, 24 * 6))))
+        windows = [(base + timedelta(days=7 * week), base + timedelta(days=7 * (week + 1))) for week in range(13)]
+        for _ in range(20):
+            start = base + timedelta(hours=rng.randrange(-48, 24 * 120))
+            windows.append((start, start + timedelta(hours=rng.randrange(1, 24 * 20))))
+
+        results = render_windows(rotation, overrides, windows)
+        self.assertEqual(len(windows), len(results))
+        for (start_time, end_time), result in zip(windows, results):
+            with self.subTest(start_time=start_time, end_time=end_time):
+                override_lst = [UserEvent(o.name, max(o.start_time, start_time), min(o.end_time, end_time))
+                                for o in sorted(overrides, key=lambda o: o.start_time)
+                                if o.start_time < end_time and o.end_time > start_time]
+                schedule = list(rotation.iter_events(start_time, end_time))
+                self.assertListEqual(SchedulingEngine(schedule, override_lst).override_schedule_queue(), result)
+
+    def test_render_windows_rejects_empty_window(self):
+        """
+        Testing an empty window raises ValueError.
+        """
+        rotation = Rotation(["alice"], datetime(2025, 1, 1), timedelta(days=1))
+        with self.assertRaises(ValueError):
+            render_windows(rotation, [], [(datetime(2025, 1, 2), datetime(2025, 1, 2))])
+
+    def test_render_periods_matches_full_render(self):
+        """
+        Testing random plans and sparse overrides, untruncated and truncated to the window,
+        against merging the whole window, including overrides across period edges and
+        windows starting before the plan.
+        """
+        rng = random.Random(25)
+        for case in range(300):
+            shifts = [(rng.choice(["alice", "bob", "charlie"]), timedelta(hours=rng.choice([1, 5, 12, 24])))
+                      for _ in range(rng.randrange(1, 6))]
+            plan = RotationPlan(shifts, datetime(2025, 1, 1) + timedelta(hours=rng.randrange(48)))
+            start_time = datetime(2025, 1, 1) + timedelta(hours=rng.randrange(-24, 200))
+            end_time = start_time + timedelta(hours=rng.randrange(1, 400))
+            overrides = []
+            for _ in range(rng.randrange(0, 6)):
+                start = start_time + timedelta(hours=rng.randrange(-30, 420))
+                overrides.append(UserEvent(rng.choice(["alice", "dan"]), start, start + timedelta(hours=rng.randrange(0, 40))))
+
+            override_lst = [UserEvent(o.name, max(o.start_time, start_time), min(o.end_time, end_time))
+                            for o in sorted(overrides, key=lambda o: o.start_time)
+                            if o.start_time < end_time and o.end_time > start_time]
+            expected = SchedulingEngine(list(plan.iter_events(start_time, end_time)), override_lst).override_schedule_queue()
+            with self.subTest(case=case):
+                self.assertListEqual(expected, render_periods(plan, overrides, start_time, end_time))
+                self.assertListEqual(expected, render_periods(plan, override_lst, start_time, end_time))
+        with self.assertRaises(ValueError):
+            render_periods(plan, [], end_time, end_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
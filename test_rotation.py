@@ -0,0 +1,210 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from zoneinfo import ZoneInfo
+from rotation import Rotation, RotationPlan, ZonedRotation
+from user_event import UserEvent
+
+
+class TestRotation(unittest.TestCase):
+    def setUp(self):
+        self.rotation = Rotation(["alice", "bob", "charlie"], datetime(2025, 11, 7, 17), timedelta(days=7))
+
+    def _walk_from_anchor(self, rotation : Rotation, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+        """
+        Reference implementation that walks every handover since handover_start_at.
+        """
+        events = []
+        idx = 0
+        curr_start_time = rotation.handover_start_at
+        while curr_start_time < end_time:
+            curr_end_time = curr_start_time + rotation.interval
+            truncated_start = max(curr_start_time, start_time)
+            truncated_end = min(curr_end_time, end_time)
+            if truncated_start < truncated_end:
+                events.append(UserEvent(rotation.users[idx % len(rotation.users)], truncated_start, truncated_end))
+            curr_start_time += rotation.interval
+            idx += 1
+        return events
+
+    def test_iter_events_window_starting_at_anchor(self):
+        """
+        Testing a window that starts exactly at handover_start_at.
+        """
+        actual = list(self.rotation.iter_events(datetime(2025, 11, 7, 17), datetime(2025, 11, 21, 17)))
+        expected = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 14, 17)),
+                    UserEvent("bob", datetime(2025, 11, 14, 17), datetime(2025, 11, 21, 17))]
+        self.assertListEqual(expected, actual)
+
+    def test_iter_events_seeks_into_old_rotation(self):
+        """
+        Testing a window years after the anchor picks the right user and truncates correctly.
+        """
+        start_time, end_time = datetime(2031, 3, 2, 9), datetime(2031, 3, 30, 9)
+        actual = list(self.rotation.iter_events(start_time, end_time))
+        expected = self._walk_from_anchor(self.rotation, start_time, end_time)
+        self.assertListEqual(expected, actual)
+
+    def test_iter_events_window_before_anchor(self):
+        """
+        Testing that no events are generated before handover_start_at.
+        """
+        actual = list(self.rotation.iter_events(datetime(2025, 11, 1), datetime(2025, 11, 10)))
+        expected = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 10))]
+        self.assertListEqual(expected, actual)
+
+    def test_iter_events_matches_walk_for_many_windows(self):
+        """
+        Testing the seek against the reference walk for windows on and off handover boundaries.
+        """
+        rotation = Rotation(["alice", "bob"], datetime(2020, 1, 1), timedelta(days=3))
+        for offset_hours in range(0, 24 * 40, 17):
+            start_time = datetime(2023, 6, 1) + timedelta(hours=offset_hours)
+            end_time = start_time + timedelta(days=5, hours=offset_hours % 7)
+            with self.subTest(start_time=start_time):
+                self.assertListEqual(self._walk_from_anchor(rotation, start_time, end_time),
+                                     list(rotation.iter_events(start_time, end_time)))
+
+    def test_iter_events_without_end_is_unbounded(self):
+        """
+        Testing an open-ended window yields the same handovers as a bounded one, without end.
+        """
+        start_time = datetime(2025, 11, 10)
+        unbounded = list(islice(self.rotation.iter_events(start_time, None), 100))
+        self.assertListEqual(list(self.rotation.iter_events(start_time, unbounded[-1].end_time)), unbounded)
+
+    def test_who_is_on_call_uses_arithmetic(self):
+        """
+        Testing point lookups straight from the rotation definition.
+        """
+        self.assertIsNone(self.rotation.who_is_on_call(datetime(2025, 11, 7, 16)))
+        self.assertEqual("alice", self.rotation.who_is_on_call(datetime(2025, 11, 7, 17)))
+        self.assertEqual("bob", self.rotation.who_is_on_call(datetime(2025, 11, 14, 17)))
+        self.assertEqual("alice", self.rotation.who_is_on_call(datetime(2025, 11, 28, 17)))
+
+    def test_zoned_rotation_keeps_local_handover_time_across_dst(self):
+        """
+        Testing a daily 09:00 Europe/London handover: 09:00 UTC in winter, 08:00 UTC in summer.
+        """
+        rotation = ZonedRotation(["alice", "bob"], datetime(2025, 3, 28, 9), timedelta(days=1), ZoneInfo("Europe/London"))
+        expected = [UserEvent("alice", datetime(2025, 3, 28, 9), datetime(2025, 3, 29, 9)),
+                    UserEvent("bob", datetime(2025, 3, 29, 9), datetime(2025, 3, 30, 8)),
+                    UserEvent("alice", datetime(2025, 3, 30, 8), datetime(2025, 3, 31, 8))]
+        self.assertListEqual(expected, list(rotation.iter_events(datetime(2025, 3, 28, 9), datetime(2025, 3, 31, 8))))
+        self.assertEqual("bob", rotation.who_is_on_call(datetime(2025, 3, 30, 7, 59)))
+        self.assertEqual("alice", rotation.who_is_on_call(datetime(2025, 3, 30, 8)))
+        self.assertEqual(datetime(2025, 10, 27, 9), next(rotation.iter_events(datetime(2025, 10, 27, 8), None)).end_time)
+
+    def test_zoned_rotation_short_interval_across_spring_forward(self):
+        """
+        Testing 30-minute Europe/London handovers across the skipped hour on 30th Mar 2025:
+        handovers at local 02:00 and 02:30 would resolve before the one at local 01:30.
+        """
+        rotation = ZonedRotation(["a", "b", "c"], datetime(2025, 3, 30), timedelta(minutes=30), ZoneInfo("Europe/London"))
+        expected = [UserEvent("a", datetime(2025, 3, 30, 0), datetime(2025, 3, 30, 0, 30)),
+                    UserEvent("b", datetime(2025, 3, 30, 0, 30), datetime(2025, 3, 30, 1)),
+                    UserEvent("c", datetime(2025, 3, 30, 1), datetime(2025, 3, 30, 1, 30)),
+                    UserEvent("c", datetime(2025, 3, 30, 1, 30), datetime(2025, 3, 30, 2)),
+                    UserEvent("a", datetime(2025, 3, 30, 2), datetime(2025, 3, 30, 2, 30))]
+        self.assertListEqual(expected, list(rotation.iter_events(datetime(2025, 3, 30), datetime(2025, 3, 30, 2, 30))))
+        for minute in range(150):
+            time = datetime(2025, 3, 30) + timedelta(minutes=minute)
+            with self.subTest(time=time):
+                self.assertEqual(next(e.name for e in expected if e.start_time <= time < e.end_time), rotation.who_is_on_call(time))
+                self.assertListEqual([UserEvent(e.name, max(e.start_time, time), e.end_time) for e in expected if e.end_time > time],
+                                     list(rotation.iter_events(time, datetime(2025, 3, 30, 2, 30))))
+
+    def test_zoned_rotation_matches_per_handover_conversion(self):
+        """
+        Testing random zones, intervals and windows of up to a few years against converting
+        every handover's local time to UTC one at a time with zoneinfo, never going back.
+        """
+        rng = random.Random(24)
+        zones = ["Europe/London", "America/New_York", "Australia/Sydney", "Australia/Lord_Howe",
+                 "Africa/Casablanca", "Asia/Tokyo", "America/Sao_Paulo", "Pacific/Apia"]
+        for case in range(100):
+            zone = ZoneInfo(rng.choice(zones))
+            handover_start_at = datetime(1995 + rng.randrange(40), 1, 1) + timedelta(minutes=rng.choice([60, 30, 1]) * rng.randrange(8760))
+            interval = rng.choice([timedelta(days=1), timedelta(days=7), timedelta(days=14), timedelta(hours=1), timedelta(hours=8),
+                                   timedelta(minutes=30)])
+            rotation = ZonedRotation(["alice", "bob", "charlie"], handover_start_at, interval, zone)
+            start_time = handover_start_at + timedelta(days=rng.randrange(-20, 700), minutes=rng.randrange(1440))
+            end_time = start_time + min(interval * 1000, timedelta(days=rng.randrange(1, 1000)))
+
+            local_start_at = handover_start_at.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+            handovers = []
+            idx = 0
+            while not handovers or handovers[-1] < end_time:
+                local_time = local_start_at + idx * interval
+                handover = local_time.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+                handovers.append(max(handover, handovers[-1]) if handovers else handover)
+                idx += 1
+            expected = []
+            for idx, (curr_start_time, curr_end_time) in enumerate(zip(handovers, handovers[1:])):
+                truncated_start, truncated_end = max(curr_start_time, start_time), min(curr_end_time, end_time)
+                if truncated_start < truncated_end:
+                    expected.append(UserEvent(rotation.users[idx % 3], truncated_start, truncated_end))
+
+            with self.subTest(case=case, zone=str(zone), interval=interval):
+                self.assertListEqual(expected, list(rotation.iter_events(start_time, end_time)))
+                time = start_time + (end_time - start_time) * rng.random()
+                self.assertEqual(next((e.name for e in expected if e.start_time <= time < e.end_time), None),
+                                 rotation.who_is_on_call(time))
+
+    def test_rotation_plan_weekly_pattern(self):
+        """
+        Testing "weekdays alice/bob, weekends charlie" compiled into a two-week plan.
+        """
+        days = timedelta(days=1)
+        plan = RotationPlan([("alice", 5 * days), ("charlie", 2 * days), ("bob", 5 * days), ("charlie", 2 * days)],
+                            datetime(2025, 11, 3, 9))
+        self.assertEqual(14 * days, plan.interval)
+        self.assertListEqual([timedelta(0), 5 * days, 7 * days, 12 * days], plan.offsets)
+        expected = [UserEvent("alice", datetime(2025, 11, 22), datetime(2025, 11, 22, 9)),
+                    UserEvent("charlie", datetime(2025, 11, 22, 9), datetime(2025, 11, 24, 9)),
+                    UserEvent("bob", datetime(2025, 11, 24, 9), datetime(2025, 11, 29, 9)),
+                    UserEvent("charlie", datetime(2025, 11, 29, 9), datetime(2025, 12, 1))]
+        self.assertListEqual(expected, list(plan.iter_events(datetime(2025, 11, 22), datetime(2025, 12, 1))))
+        self.assertIsNone(plan.who_is_on_call(datetime(2025, 11, 3, 8)))
+        self.assertEqual("bob", plan.who_is_on_call(datetime(2025, 11, 10, 9)))
+        self.assertEqual("alice", plan.who_is_on_call(datetime(2026, 11, 2, 10)))
+        with self.assertRaises(ValueError):
+            RotationPlan([("alice", timedelta(0))], datetime(2025, 11, 3))
+
+    def test_rotation_plan_matches_expanded_shifts(self):
+        """
+        Testing random patterns, including ones that start and end with the same user,
+        against walking the shifts from handover_start_at and combining them.
+        """
+        rng = random.Random(125)
+        for case in range(300):
+            shifts = [(rng.choice(["alice", "bob", "charlie"]), timedelta(hours=rng.choice([1, 2, 12, 24])))
+                      for _ in range(rng.randrange(1, 6))]
+            handover_start_at = datetime(2025, 1, 1) + timedelta(hours=rng.randrange(48))
+            plan = RotationPlan(shifts, handover_start_at)
+            start_time = datetime(2025, 1, 1) + timedelta(hours=rng.randrange(-24, 500))
+            end_time = start_time + timedelta(hours=rng.randrange(1, 300))
+
+            expected = []
+            curr_start_time, idx = handover_start_at, 0
+            while curr_start_time < end_time:
+                user, duration = shifts[idx % len(shifts)]
+                truncated_start, truncated_end = max(curr_start_time, start_time), min(curr_start_time + duration, end_time)
+                if truncated_start < truncated_end:
+                    if expected and expected[-1].name == user and expected[-1].end_time == truncated_start:
+                        expected[-1] = UserEvent(user, expected[-1].start_time, truncated_end)
+                    else:
+                        expected.append(UserEvent(user, truncated_start, truncated_end))
+                curr_start_time += duration
+                idx += 1
+
+            with self.subTest(case=case):
+                self.assertListEqual(expected, list(plan.iter_events(start_time, end_time)))
+                time = start_time + (end_time - start_time) * rng.random()
+                self.assertEqual(next((e.name for e in expected if e.start_time <= time < e.end_time), None),
+                                 plan.who_is_on_call(time))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from random_events import random_override
+from schedule_diff import ADDED, REASSIGNED, REMOVED, ScheduleChange, affected_users, diff_schedules
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+
+class TestScheduleDiff(unittest.TestCase):
+
+    def test_diff_reports_added_removed_and_reassigned(self):
+        """
+        Testing the docstring example plus a stretch only covered by the new render.
+        """
+        old = [UserEvent("alice", datetime(2025, 11, 7, 13), datetime(2025, 11, 7, 17)),
+               UserEvent("bob", datetime(2025, 11, 7, 17), datetime(2025, 11, 7, 21))]
+        new = [UserEvent("alice", datetime(2025, 11, 7, 13), datetime(2025, 11, 7, 15)),
+               UserEvent("carol", datetime(2025, 11, 7, 15), datetime(2025, 11, 7, 18)),
+               UserEvent("bob", datetime(2025, 11, 7, 18), datetime(2025, 11, 7, 20)),
+               UserEvent("dave", datetime(2025, 11, 7, 22), datetime(2025, 11, 7, 23))]
+        expected = [ScheduleChange(REASSIGNED, datetime(2025, 11, 7, 15), datetime(2025, 11, 7, 17), "alice", "carol"),
+                    ScheduleChange(REASSIGNED, datetime(2025, 11, 7, 17), datetime(2025, 11, 7, 18), "bob", "carol"),
+                    ScheduleChange(REMOVED, datetime(2025, 11, 7, 20), datetime(2025, 11, 7, 21), "bob", None),
+                    ScheduleChange(ADDED, datetime(2025, 11, 7, 22), datetime(2025, 11, 7, 23), None, "dave")]
+        changes = diff_schedules(old, new)
+        self.assertListEqual(expected, changes)
+        self.assertEqual({"alice", "bob", "carol", "dave"}, affected_users(changes))
+
+    def test_diff_of_unchanged_renders_is_empty(self):
+        """
+        Testing that identical renders, equal re-renders and differently split
+        events with the same owners produce no changes.
+        """
+        base = datetime(2025, 11, 7)
+        events = [UserEvent(name, base + timedelta(hours=idx), base + timedelta(hours=idx + 1))
+                  for idx, name in enumerate(["alice", "bob"] * 50)]
+        self.assertListEqual([], diff_schedules(events, events))
+        self.assertListEqual([], diff_schedules(events, [UserEvent(e.name, e.start_time, e.end_time) for e in events]))
+        split = [UserEvent("alice", base, base + timedelta(hours=1)), UserEvent("alice", base + timedelta(hours=1), base + timedelta(hours=2))]
+        self.assertListEqual([], diff_schedules([UserEvent("alice", base, base + timedelta(hours=2))], split))
+
+    def test_diff_matches_minute_oracle(self):
+        """
+        Testing random pairs of renders against a minute-by-minute comparison of owners.
+        """
+        rng = random.Random(22)
+        names = ["alice", "bob", "carol"]
+        base = datetime(2025, 11, 7)
+
+        def render(overrides : list[UserEvent]) -> list[UserEvent]:
+            schedule = [UserEvent(names[idx % 3], base + timedelta(minutes=60 * idx), base + timedelta(minutes=60 * idx + 50))
+                        for idx in range(5)]
+            return SchedulingEngine(schedule, overrides).override_schedule_queue()
+
+        def owners(events : list[UserEvent]) -> list[str | None]:
+            minutes = [None] * 400
+            for event in events:
+                for minute in range((event.start_time - base) // timedelta(minutes=1), (event.end_time - base) // timedelta(minutes=1)):
+                    minutes[minute] = event.name
+            return minutes
+
+        for case in range(300):
+            overrides = [random_override(rng, names, base, 300) for _ in range(rng.randrange(0, 5))]
+            edited = [o for o in overrides if rng.random() < 0.7] + [random_override(rng, names, base, 300) for _ in range(rng.randrange(0, 3))]
+            old, new = render(overrides), render(edited)
+            changes = diff_schedules(old, new)
+            with self.subTest(case=case):
+                expected = [(minute, a, b) for minute, (a, b) in enumerate(zip(owners(old), owners(new))) if a != b]
+                actual = [((change.start_time - base) // timedelta(minutes=1) + offset, change.old_name, change.new_name)
+                          for change in changes
+                          for offset in range((change.end_time - change.start_time) // timedelta(minutes=1))]
+                self.assertListEqual(expected, actual)
+                for prev, curr in zip(changes, changes[1:]):
+                    self.assertFalse(prev.end_time == curr.start_time and (prev.old_name, prev.new_name) == (curr.old_name, curr.new_name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import random
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+import numpy_backend
+from random_events import random_override, random_overrides, random_schedule
+from rotation import Rotation
 from scheduling_engine import SchedulingEngine
 from user_event import UserEvent
 
@@ -314,7 +318,286 @@ class TestSchedulingEngine(unittest.TestCase):
         actual = self.empty_engine.override_schedule_queue()
         self.assertListEqual(expected, actual)
 
+    def test_iter_schedule_queue_matches_override_schedule_queue(self):
+        """
+        Testing that the streaming entry point over generators gives the same result
+        as the list based entry point.
+        E.g.
+        s = [(alice, 7am, 2pm), (bob, 2pm, 9pm)]
+        o = [(charlie, 6am, 8am), (dan, 1pm, 3pm), (erin, 2pm, 4pm)]
+        final = [(charlie, 6am, 8am), (alice, 8am, 1pm), (dan, 1pm, 2pm), (erin, 2pm, 4pm), (bob, 4pm, 9pm)]
+        """
+        s = [UserEvent("alice", self._get_dt(2025,11,7,7), self._get_dt(2025,11,7,14)),
+             UserEvent("bob", self._get_dt(2025,11,7,14), self._get_dt(2025,11,7,21))]
+        o = [UserEvent("charlie", self._get_dt(2025,11,7,6), self._get_dt(2025,11,7,8)),
+             UserEvent("dan", self._get_dt(2025,11,7,13), self._get_dt(2025,11,7,15)),
+             UserEvent("erin", self._get_dt(2025,11,7,14), self._get_dt(2025,11,7,16))]
+        streaming_engine = SchedulingEngine((event for event in s), (event for event in o))
+        actual = list(streaming_engine.iter_schedule_queue())
+        self.empty_engine.schedule_lst, self.empty_engine.override_lst = s, o
+        self.assertListEqual(self.empty_engine.override_schedule_queue(), actual)
+
+    def test_iter_schedule_queue_rejects_unsorted_overrides(self):
+        """
+        Testing that the streaming entry point raises on overrides that are not sorted by start time.
+        """
+        s = [UserEvent("alice", self._get_dt(2025,11,7,7), self._get_dt(2025,11,7,14))]
+        o = [UserEvent("dan", self._get_dt(2025,11,7,13), self._get_dt(2025,11,7,14)),
+             UserEvent("charlie", self._get_dt(2025,11,7,8), self._get_dt(2025,11,7,9))]
+        engine = SchedulingEngine(iter(s), iter(o))
+        with self.assertRaises(ValueError):
+            list(engine.iter_schedule_queue())
+
 
+    def test_override_deeply_nested_overrides(self):
+        """
+        Testing overrides nested several levels deep inside one long override.
+        Each override resumes once every later override inside it has ended.
+        E.g.
+        s = [(bob, 12pm, 10pm)]
+        o = [(alice, 1pm, 9pm), (charlie, 2pm, 6pm), (dan, 3pm, 4pm), (erin, 5pm, 7pm)]
+        final = [(bob, 12pm, 1pm), (alice, 1pm, 2pm), (charlie, 2pm, 3pm), (dan, 3pm, 4pm),
+                 (charlie, 4pm, 5pm), (erin, 5pm, 7pm), (alice, 7pm, 9pm), (bob, 9pm, 10pm)]
+        """
+        s = [UserEvent("bob", self._get_dt(2025,11,8,12), self._get_dt(2025,11,8,22))]
+        o = [UserEvent("alice", self._get_dt(2025,11,8,13), self._get_dt(2025,11,8,21)),
+             UserEvent("charlie", self._get_dt(2025,11,8,14), self._get_dt(2025,11,8,18)),
+             UserEvent("dan", self._get_dt(2025,11,8,15), self._get_dt(2025,11,8,16)),
+             UserEvent("erin", self._get_dt(2025,11,8,17), self._get_dt(2025,11,8,19))]
+        self.empty_engine.schedule_lst, self.empty_engine.override_lst = s, o
+        expected = [UserEvent("bob", self._get_dt(2025,11,8,12), self._get_dt(2025,11,8,13)),
+                    UserEvent("alice", self._get_dt(2025,11,8,13), self._get_dt(2025,11,8,14)),
+                    UserEvent("charlie", self._get_dt(2025,11,8,14), self._get_dt(2025,11,8,15)),
+                    UserEvent("dan", self._get_dt(2025,11,8,15), self._get_dt(2025,11,8,16)),
+                    UserEvent("charlie", self._get_dt(2025,11,8,16), self._get_dt(2025,11,8,17)),
+                    UserEvent("erin", self._get_dt(2025,11,8,17), self._get_dt(2025,11,8,19)),
+                    UserEvent("alice", self._get_dt(2025,11,8,19), self._get_dt(2025,11,8,21)),
+                    UserEvent("bob", self._get_dt(2025,11,8,21), self._get_dt(2025,11,8,22))]
+        actual = self.empty_engine.override_schedule_queue()
+        self.assertListEqual(expected, actual)
+
+    def _minute_oracle(self, s : list[UserEvent], o : list[UserEvent]) -> list[UserEvent]:
+        """
+        Brute-force reference: decide the owner of every minute independently.
+        The last override (in start time order) covering a minute wins, otherwise
+        the schedule event covering it, otherwise nobody. Runs of the same owner
+        are then joined into events.
+        """
+        ordered_overrides = sorted(o, key=lambda x: x.start_time)
+        times = [e.start_time for e in s + o] + [e.end_time for e in s + o]
+        minute = timedelta(minutes=1)
+        result = []
+        curr_time = min(times)
+        while curr_time < max(times):
+            owner = None
+            for event in s:
+                if event.start_time <= curr_time < event.end_time:
+                    owner = event.name
+            for event in ordered_overrides:
+                if event.start_time <= curr_time < event.end_time:
+                    owner = event.name
+            if owner is not None:
+                if result and result[-1].name == owner and result[-1].end_time == curr_time:
+                    result[-1].end_time = curr_time + minute
+                else:
+                    result.append(UserEvent(owner, curr_time, curr_time + minute))
+            curr_time += minute
+        return result
+
+    def test_override_resolution_matches_minute_oracle(self):
+        """
+        Randomized differential test against a brute-force minute-by-minute oracle.
+        Schedules are non-overlapping with random gaps; overrides overlap, nest,
+        touch and chain arbitrarily.
+        """
+        rng = random.Random(20251107)
+        names = ["alice", "bob", "charlie", "dan"]
+        base = self._get_dt(2025,11,7,0)
+        for case in range(300):
+            s = random_schedule(rng, names, base, 6, max_first_start=30)
+            o = random_overrides(rng, names, base, 10, horizon=240)
+            if not s and not o:
+                continue
+            with self.subTest(case=case):
+                expected = self._minute_oracle(s, o)
+                actual = SchedulingEngine(s, o).override_schedule_queue()
+                self.assertListEqual(expected, actual)
+
+    def test_rendering_leaves_inputs_unchanged(self):
+        """
+        Testing every entry point leaves the caller's lists and events untouched, so the
+        same inputs can be rendered repeatedly without defensive copies.
+        """
+        schedule = [UserEvent("bob", self._get_dt(2025, 11, 14, 17), self._get_dt(2025, 11, 21, 17)),
+                    UserEvent("alice", self._get_dt(2025, 11, 7, 17), self._get_dt(2025, 11, 14, 17))]
+        overrides = [UserEvent("dan", self._get_dt(2025, 11, 13, 9), self._get_dt(2025, 11, 15, 9)),
+                     UserEvent("charlie", self._get_dt(2025, 11, 6, 12), self._get_dt(2025, 11, 8, 12)),
+                     UserEvent("erin", self._get_dt(2025, 11, 13, 12), self._get_dt(2025, 11, 13, 14))]
+        snapshot = [[(e.name, e.start_time, e.end_time) for e in events] for events in (schedule, overrides)]
+        sorted_overrides = sorted(overrides, key=lambda e: e.start_time)
+
+        first = SchedulingEngine(schedule, overrides).override_schedule_queue()
+        renders = [SchedulingEngine(schedule, overrides).override_schedule_queue(),
+                   list(SchedulingEngine(schedule[::-1], sorted_overrides).iter_schedule_queue())]
+        engine = SchedulingEngine(schedule, overrides)
+        engine.remove_override(engine.add_override(UserEvent("frank", self._get_dt(2025, 11, 10, 0), self._get_dt(2025, 11, 11, 0))))
+        renders.append(engine.rendered_events())
+        if numpy_backend.np is not None:
+            renders.append(SchedulingEngine(schedule, overrides, backend="numpy").override_schedule_queue())
+        for render in renders:
+            self.assertListEqual(first, render)
+        self.assertListEqual(snapshot, [[(e.name, e.start_time, e.end_time) for e in events] for events in (schedule, overrides)])
+        self.assertFalse(any(event is input_event for event in first for input_event in schedule + overrides))
+
+    def test_from_rotation_streams_next_segments(self):
+        """
+        Testing the next segments of an unbounded rotation match a bounded render of the same span,
+        and that repeated calls continue where the previous one stopped.
+        """
+        rotation = Rotation(["alice", "bob", "charlie"], self._get_dt(2025, 11, 7, 17), timedelta(days=7))
+        overrides = [UserEvent("dan", self._get_dt(2025, 11, 20, 9), self._get_dt(2025, 11, 22, 9)),
+                     UserEvent("erin", self._get_dt(2025, 11, 1, 9), self._get_dt(2025, 11, 11, 9)),
+                     UserEvent("alice", self._get_dt(2025, 12, 4, 17), self._get_dt(2025, 12, 6, 17))]
+        start_time = self._get_dt(2025, 11, 10, 0)
+        engine = SchedulingEngine.from_rotation(rotation, overrides, start_time)
+        upcoming = engine.next_segments(4) + engine.next_segments(2)
+
+        end_time = upcoming[-1].end_time
+        bounded = SchedulingEngine.from_rotation(rotation, overrides, start_time, end_time).override_schedule_queue()
+        self.assertListEqual(bounded, upcoming)
+        self.assertEqual(UserEvent("erin", start_time, self._get_dt(2025, 11, 11, 9)), upcoming[0])
+
+    def test_from_rotation_far_future_is_lazy(self):
+        """
+        Testing only the consumed part of an unbounded schedule is generated.
+        """
+        rotation = Rotation(["alice", "bob"], self._get_dt(2025, 1, 1, 0), timedelta(hours=1))
+        engine = SchedulingEngine.from_rotation(rotation, [], self._get_dt(9000, 1, 1, 0))
+        self.assertEqual(["alice", "bob", "alice"], [event.name for event in engine.next_segments(3)])
+
+    def test_from_rotation_rejects_unrenderable_schedules(self):
+        """
+        Testing a single-user unbounded rotation and full renders of an unbounded schedule raise ValueError.
+        """
+        start_time = self._get_dt(2025, 11, 7, 17)
+        with self.assertRaises(ValueError):
+            SchedulingEngine.from_rotation(Rotation(["alice", "alice"], start_time, timedelta(days=7)), [], start_time)
+        engine = SchedulingEngine.from_rotation(Rotation(["alice", "bob"], start_time, timedelta(days=7)), [], start_time)
+        with self.assertRaises(ValueError):
+            engine.override_schedule_queue()
+        with self.assertRaises(ValueError):
+            engine.rendered_events()
+
+    def test_unknown_backend_raises(self):
+        """
+        Testing that an unknown backend name raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            SchedulingEngine([], [], backend="fortran")
+
+    def test_incremental_edits_patch_timeline(self):
+        """
+        Testing add, update and remove of single overrides against the rendered timeline.
+        E.g.
+        s = [(alice, 8am, 8pm)]
+        add (bob, 10am, 12pm)      -> [(alice, 8am, 10am), (bob, 10am, 12pm), (alice, 12pm, 8pm)]
+        update to (bob, 6pm, 9pm)  -> [(alice, 8am, 6pm), (bob, 6pm, 9pm)]
+        remove                     -> [(alice, 8am, 8pm)]
+        """
+        engine = SchedulingEngine([UserEvent("alice", self._get_dt(2025,11,8,8), self._get_dt(2025,11,8,20))], [])
+        override_id = engine.add_override(UserEvent("bob", self._get_dt(2025,11,8,10), self._get_dt(2025,11,8,12)))
+        self.assertListEqual([UserEvent("alice", self._get_dt(2025,11,8,8), self._get_dt(2025,11,8,10)),
+                              UserEvent("bob", self._get_dt(2025,11,8,10), self._get_dt(2025,11,8,12)),
+                              UserEvent("alice", self._get_dt(2025,11,8,12), self._get_dt(2025,11,8,20))],
+                             engine.rendered_events())
+        engine.update_override(override_id, UserEvent("bob", self._get_dt(2025,11,8,18), self._get_dt(2025,11,8,21)))
+        self.assertListEqual([UserEvent("alice", self._get_dt(2025,11,8,8), self._get_dt(2025,11,8,18)),
+                              UserEvent("bob", self._get_dt(2025,11,8,18), self._get_dt(2025,11,8,21))],
+                             engine.rendered_events())
+        engine.remove_override(override_id)
+        self.assertListEqual([UserEvent("alice", self._get_dt(2025,11,8,8), self._get_dt(2025,11,8,20))],
+                             engine.rendered_events())
+
+    def test_incremental_edits_match_full_render(self):
+        """
+        Randomized equivalence test: after every add, update or remove the incrementally
+        maintained timeline must equal a full re-render of the current overrides, and
+        must be unchanged outside the reported changed ranges.
+        """
+        rng = random.Random(7)
+        names = ["alice", "bob", "charlie", "dan"]
+        base = self._get_dt(2025,11,7,0)
+        for case in range(40):
+            s = random_schedule(rng, names, base, 8)
+            initial = random_overrides(rng, names, base, 4, horizon=300)
+            overrides = dict(enumerate(initial))
+            engine = SchedulingEngine(s, initial)
+            before = engine.rendered_events()
+            for step in range(30):
+                event = random_override(rng, names, base, horizon=300)
+                action = rng.random()
+                if action < 0.5 or not overrides:
+                    overrides[engine.add_override(event)] = event
+                elif action < 0.75:
+                    override_id = rng.choice(list(overrides))
+                    engine.update_override(override_id, event)
+                    overrides[override_id] = event
+                else:
+                    override_id = rng.choice(list(overrides))
+                    engine.remove_override(override_id)
+                    del overrides[override_id]
+                with self.subTest(case=case, step=step):
+                    expected = SchedulingEngine(list(s), [overrides[k] for k in sorted(overrides)]).override_schedule_queue()
+                    self.assertListEqual(expected, engine.rendered_events())
+                    ranges = engine.changed_ranges()
+                    outside = lambda events: [e for e in events if all(e.end_time <= lo or hi <= e.start_time for lo, hi in ranges)]
+                    self.assertListEqual(outside(before), outside(expected))
+                    for lo, hi in ranges:
+                        self.assertListEqual([e for e in expected if e.start_time < hi and lo < e.end_time], engine.rendered_events(lo, hi))
+                before = expected
+
+    def test_from_layers_stacks_layers_by_priority(self):
+        """
+        Testing that higher priority layers win where they have coverage and lower
+        layers show through their gaps, whatever the order the layers are passed in.
+        """
+        primary = [UserEvent("alice", self._get_dt(2025, 11, 7, 13), self._get_dt(2025, 11, 7, 21))]
+        weekend = [UserEvent("bob", self._get_dt(2025, 11, 7, 14), self._get_dt(2025, 11, 7, 18))]
+        adhoc = [UserEvent("carol", self._get_dt(2025, 11, 7, 17), self._get_dt(2025, 11, 7, 19))]
+        expected = [UserEvent("alice", self._get_dt(2025, 11, 7, 13), self._get_dt(2025, 11, 7, 14)),
+                    UserEvent("bob", self._get_dt(2025, 11, 7, 14), self._get_dt(2025, 11, 7, 17)),
+                    UserEvent("carol", self._get_dt(2025, 11, 7, 17), self._get_dt(2025, 11, 7, 19)),
+                    UserEvent("alice", self._get_dt(2025, 11, 7, 19), self._get_dt(2025, 11, 7, 21))]
+        self.assertListEqual(expected, SchedulingEngine.from_layers([primary, weekend, adhoc]).override_schedule_queue())
+        self.assertListEqual(expected, SchedulingEngine.from_layers([adhoc, primary, weekend], [30, 10, 20]).override_schedule_queue())
+        with self.assertRaises(ValueError):
+            SchedulingEngine.from_layers([primary, weekend], [1, 1])
+
+    def test_from_layers_matches_applying_layers_one_at_a_time(self):
+        """
+        Testing that one sweep over random layers gives the same schedule, stream and
+        aggregate hours as rendering the lowest layer and applying each higher layer
+        as the override list of the previous result.
+        """
+        rng = random.Random(21)
+        names = ["alice", "bob", "carol", "dave"]
+        base = datetime(2025, 11, 7, 0)
+        for case in range(150):
+            layers = [random_overrides(rng, names, base, 8, horizon=300) for _ in range(rng.randrange(1, 6))]
+
+            expected = SchedulingEngine([], layers[0]).override_schedule_queue()
+            for layer in layers[1:]:
+                expected = SchedulingEngine(expected, layer).override_schedule_queue()
+
+            engine = SchedulingEngine.from_layers(layers)
+            with self.subTest(case=case):
+                self.assertListEqual(expected, engine.override_schedule_queue())
+                sorted_layers = [sorted(layer, key=lambda event: event.start_time) for layer in layers]
+                self.assertListEqual(expected, list(SchedulingEngine.from_layers(sorted_layers).iter_schedule_queue()))
+                stats = engine.aggregate_by_user()
+                for name in names:
+                    total = sum((e.end_time - e.start_time).total_seconds() for e in expected if e.name == name)
+                    self.assertEqual(total, stats[name].total_seconds if name in stats else 0)
 
 
 if __name__ == "__main__":
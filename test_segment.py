@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime
+from segment import NameTable, Segment, from_epoch_microseconds, from_epoch_seconds, to_epoch_microseconds, to_epoch_seconds
+from user_event import UserEvent
+
+
+class TestSegment(unittest.TestCase):
+    def test_epoch_seconds_round_trip(self):
+        """
+        Testing conversion between datetimes and epoch seconds.
+        """
+        time = datetime(2025, 11, 7, 17, 30, 15)
+        self.assertEqual(1762536615, to_epoch_seconds(time))
+        self.assertEqual(time, from_epoch_seconds(to_epoch_seconds(time)))
+
+    def test_epoch_microseconds_round_trip(self):
+        """
+        Testing that conversion through epoch microseconds keeps sub-second times.
+        """
+        time = datetime(2025, 11, 7, 17, 30, 15, 250000)
+        self.assertEqual(1762536615250000, to_epoch_microseconds(time))
+        self.assertEqual(time, from_epoch_microseconds(to_epoch_microseconds(time)))
+
+    def test_name_table_interns_names(self):
+        """
+        Testing that repeated names share one id and ids map back to names.
+        """
+        names = NameTable()
+        self.assertEqual(0, names.intern("alice"))
+        self.assertEqual(1, names.intern("bob"))
+        self.assertEqual(0, names.intern("alice"))
+        self.assertListEqual(["alice", "bob"], names.names)
+
+    def test_user_event_round_trip(self):
+        """
+        Testing that events survive conversion to segments and back, including back-to-back events.
+        """
+        events = [UserEvent("alice", datetime(2025, 11, 7, 17), datetime(2025, 11, 14, 17)),
+                  UserEvent("bob", datetime(2025, 11, 14, 17), datetime(2025, 11, 21, 17)),
+                  UserEvent("alice", datetime(2025, 11, 22, 9), datetime(2025, 11, 22, 10))]
+        names = NameTable()
+        segments = list(names.to_segments(events))
+        self.assertIsInstance(segments[0], Segment)
+        self.assertEqual(segments[0].owner, segments[2].owner)
+        self.assertListEqual(events, list(names.to_user_events(segments)))
+
+    def test_to_sorted_segments_orders_by_start(self):
+        """
+        Testing sorted input keeps its order and unsorted input is sorted stably by start.
+        """
+        events = [UserEvent("alice", datetime(2025, 11, 8), datetime(2025, 11, 9)),
+                  UserEvent("bob", datetime(2025, 11, 7), datetime(2025, 11, 8)),
+                  UserEvent("charlie", datetime(2025, 11, 7), datetime(2025, 11, 10))]
+        names = NameTable()
+        segments = names.to_sorted_segments(events)
+        self.assertListEqual(["bob", "charlie", "alice"], [names.names[segment.owner] for segment in segments])
+        self.assertListEqual(["alice", "bob", "charlie"], [event.name for event in events])
+        self.assertListEqual([1, 2], [segment.owner for segment in names.to_sorted_segments(events[1:])])
+
+
+if __name__ == "__main__":
+    unittest.main()
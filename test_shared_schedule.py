@@ -0,0 +1,165 @@
+import random
+import threading
+import unittest
+from datetime import datetime, timedelta
+from rendered_schedule import RenderedSchedule
+from scheduling_engine import SchedulingEngine
+from shared_schedule import SharedSchedule
+from user_event import UserEvent
+
+
+class TestSharedSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.base = datetime(2025, 11, 7)
+        self.schedule = [UserEvent(["alice", "bob", "carol"][idx % 3], self.base + timedelta(hours=idx), self.base + timedelta(hours=idx + 1))
+                         for idx in range(48)]
+
+    def test_edits_publish_new_snapshots(self):
+        """
+        Testing that each edit publishes a new snapshot and leaves the old one untouched.
+        """
+        shared = SharedSchedule(self.schedule, [])
+        before = shared.snapshot()
+        override_id = shared.add_override(UserEvent("dave", self.base + timedelta(hours=2), self.base + timedelta(hours=5)))
+        after = shared.snapshot()
+
+        self.assertEqual(0, before.version)
+        self.assertEqual(1, after.version)
+        self.assertEqual("carol", before.who_is_on_call(self.base + timedelta(hours=2)))
+        self.assertEqual("dave", after.who_is_on_call(self.base + timedelta(hours=2)))
+        self.assertListEqual(SchedulingEngine(self.schedule, []).override_schedule_queue(), before.events)
+
+        with shared.edit() as engine:
+            engine.remove_override(override_id)
+            engine.add_override(UserEvent("erin", self.base, self.base + timedelta(hours=1)))
+        self.assertEqual(2, shared.snapshot().version)
+        self.assertEqual("erin", shared.who_is_on_call(self.base))
+        self.assertEqual("carol", shared.who_is_on_call(self.base + timedelta(hours=2)))
+        with self.assertRaises(KeyError):
+            shared.remove_override(override_id)
+
+    def test_failed_edit_publishes_nothing(self):
+        """
+        Testing that an edit block raising before it changed anything keeps the snapshot and version.
+        """
+        shared = SharedSchedule(self.schedule, [])
+        before = shared.snapshot()
+        with self.assertRaises(KeyError):
+            shared.remove_override(7)
+        with shared.edit():
+            pass
+        self.assertIs(before, shared.snapshot())
+        self.assertEqual(0, shared.snapshot().version)
+
+    def test_snapshot_matches_rendered_schedule(self):
+        """
+        Testing that a chunked snapshot answers every RenderedSchedule query, including the
+        inherited ones, like a RenderedSchedule over the same events.
+        """
+        shared = SharedSchedule(self.schedule, [], chunk_size=4)
+        shared.add_override(UserEvent("dave", self.base + timedelta(hours=6, minutes=30), self.base + timedelta(hours=9)))
+        snapshot = shared.snapshot()
+        expected = RenderedSchedule(snapshot.events)
+        self.assertListEqual(expected.starts, snapshot.starts)
+        self.assertListEqual(expected.ends, snapshot.ends)
+        for minutes in range(-60, 50 * 60, 45):
+            start_time = self.base + timedelta(minutes=minutes)
+            end_time = start_time + timedelta(minutes=100)
+            with self.subTest(start_time=start_time):
+                self.assertEqual(expected.event_at(start_time), snapshot.event_at(start_time))
+                self.assertEqual(expected.who_is_on_call(start_time), snapshot.who_is_on_call(start_time))
+                self.assertListEqual(expected.between(start_time, end_time), snapshot.between(start_time, end_time))
+                self.assertListEqual(expected.clip(start_time, end_time), snapshot.clip(start_time, end_time))
+
+    def test_snapshots_share_untouched_chunks(self):
+        """
+        Testing random edits on small chunks: each snapshot equals a full render, and only
+        the chunks around the edited stretch are replaced.
+        """
+        rng = random.Random(7)
+        shared = SharedSchedule(self.schedule, [], chunk_size=4)
+        overrides = {}
+        for _ in range(60):
+            before = shared.snapshot()
+            start = self.base + timedelta(minutes=rng.randrange(0, 2880))
+            event = UserEvent(rng.choice(["dave", "erin"]), start, start + timedelta(minutes=rng.randrange(1, 180)))
+            if overrides and rng.random() < 0.3:
+                shared.remove_override(override_id := rng.choice(list(overrides)))
+                del overrides[override_id]
+            else:
+                overrides[shared.add_override(event)] = event
+            after = shared.snapshot()
+            expected = SchedulingEngine(self.schedule, [overrides[k] for k in sorted(overrides)]).override_schedule_queue()
+            self.assertListEqual(expected, after.events)
+            self.assertEqual(expected[20:30], after.between(expected[20].start_time, expected[29].end_time))
+            shared_chunks = {id(chunk) for chunk in before.chunks} & {id(chunk) for chunk in after.chunks}
+            self.assertGreater(len(shared_chunks), 0)
+            self.assertTrue(all(len(chunk) <= 4 for chunk in after.chunks))
+
+    def test_readers_see_consistent_snapshots_during_writes(self):
+        """
+        Testing many reader threads against a writer applying random edits.
+        Every snapshot a reader sees must equal a full render of the overrides at its
+        version, versions must never go backwards, and readers keep making progress
+        while the writer is busy.
+        """
+        rng = random.Random(23)
+        shared = SharedSchedule(self.schedule, [])
+        overrides_by_version = {0: {}}
+        seen = [dict() for _ in range(4)]
+        progressed = [threading.Event() for _ in range(4)]
+        writing, stop = threading.Event(), threading.Event()
+        errors = []
+
+        def reader(idx : int) -> None:
+            last_version = -1
+            try:
+                while not stop.is_set():
+                    snapshot = shared.snapshot()
+                    if snapshot.version < last_version:
+                        errors.append(f"version went back from {last_version} to {snapshot.version}")
+                    last_version = snapshot.version
+                    snapshot.who_is_on_call(self.base + timedelta(minutes=idx * 97 % 2880))
+                    seen[idx].setdefault(snapshot.version, (snapshot, list(snapshot.events)))
+                    if writing.is_set():
+                        progressed[idx].set()
+            except Exception as e:
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=reader, args=(idx,)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        writing.set()
+        overrides = {}
+        for version in range(1, 201):
+            if version == 101:
+                # Halfway through, wait until every reader has read while edits are being applied
+                for event in progressed:
+                    event.wait(10)
+            start = self.base + timedelta(minutes=rng.randrange(0, 2880))
+            event = UserEvent(rng.choice(["dave", "erin"]), start, start + timedelta(minutes=rng.randrange(1, 300)))
+            if overrides and rng.random() < 0.3:
+                shared.remove_override(override_id := rng.choice(list(overrides)))
+                del overrides[override_id]
+            else:
+                overrides[shared.add_override(event)] = event
+            overrides_by_version[version] = dict(overrides)
+        writing.clear()
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([], errors)
+        self.assertTrue(all(event.is_set() for event in progressed))
+        for snapshots in seen:
+            for version, (snapshot, events_when_seen) in snapshots.items():
+                with self.subTest(version=version):
+                    by_id = overrides_by_version[version]
+                    expected = SchedulingEngine(self.schedule, [by_id[k] for k in sorted(by_id)]).override_schedule_queue()
+                    self.assertListEqual(expected, snapshot.events)
+                    self.assertListEqual(events_when_seen, snapshot.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from tiled_renderer import TiledRenderer
+from user_event import UserEvent
+
+
+class TestTiledRenderer(unittest.TestCase):
+    def setUp(self):
+        self.rotation = Rotation(["alice", "bob", "charlie"], datetime(2025, 11, 7, 17), timedelta(days=7))
+
+    def direct_render(self, overrides, start_time, end_time):
+        """
+        Render [start_time, end_time] in one pass, truncating overrides after ordering them by start.
+        """
+        override_lst = []
+        for override in sorted(overrides, key=lambda event: event.start_time):
+            truncated_start, truncated_end = max(override.start_time, start_time), min(override.end_time, end_time)
+            if truncated_start < truncated_end:
+                override_lst.append(UserEvent(override.name, truncated_start, truncated_end))
+        schedule_lst = list(self.rotation.iter_events(start_time, end_time))
+        return SchedulingEngine(schedule_lst, override_lst).override_schedule_queue()
+
+    def test_events_are_stitched_across_block_edges(self):
+        """
+        Testing an override spanning several blocks comes out as one event.
+        """
+        overrides = [UserEvent("dan", datetime(2025, 11, 12), datetime(2025, 11, 30))]
+        renderer = TiledRenderer(self.rotation, overrides)
+        self.assertListEqual([UserEvent("alice", datetime(2025, 11, 8), datetime(2025, 11, 12)),
+                              UserEvent("dan", datetime(2025, 11, 12), datetime(2025, 11, 30)),
+                              UserEvent("alice", datetime(2025, 11, 30), datetime(2025, 12, 3))],
+                             renderer.render(datetime(2025, 11, 8), datetime(2025, 12, 3)))
+
+    def test_sliding_window_renders_only_new_blocks(self):
+        """
+        Testing a window moved forward by an hour reuses every cached block but at most one.
+        """
+        renderer = TiledRenderer(self.rotation, [])
+        renderer.render(datetime(2025, 11, 8), datetime(2025, 11, 15))
+        rendered = renderer.blocks_rendered
+        renderer.render(datetime(2025, 11, 8, 1), datetime(2025, 11, 15, 1))
+        self.assertEqual(rendered, renderer.blocks_rendered)
+        renderer.render(datetime(2025, 11, 14, 18), datetime(2025, 11, 21, 18))
+        self.assertEqual(rendered + 1, renderer.blocks_rendered)
+
+    def test_cache_is_bounded(self):
+        """
+        Testing least recently used blocks are evicted beyond max_cached_events events.
+        """
+        renderer = TiledRenderer(self.rotation, [], max_cached_events=2)
+        renderer.render(datetime(2025, 11, 8), datetime(2025, 12, 8))
+        self.assertEqual(2, len(renderer._blocks))
+        renderer = TiledRenderer(self.rotation, [UserEvent("dan", datetime(2025, 11, 10), datetime(2025, 11, 11))],
+                                 max_cached_events=2)
+        renderer.render(datetime(2025, 11, 8), datetime(2025, 12, 8))
+        self.assertLessEqual(renderer.cached_events, 2)
+        self.assertEqual(renderer.cached_events, sum(len(block) for block in renderer._blocks.values()))
+
+    def test_tiled_render_matches_direct_render(self):
+        """
+        Testing random windows and block sizes against a single-pass render, including
+        overrides before the rotation starts and overrides nested across block edges.
+        """
+        rng = random.Random(12)
+        base = datetime(2025, 11, 1)
+        for trial in range(200):
+            overrides = []
+            for _ in range(rng.randrange(0, 12)):
+                start = base + timedelta(hours=rng.randrange(0, 24 * 40))
+                overrides.append(UserEvent(rng.choice(["alice", "dan", "erin"]), start,
+                                           start + timedelta(hours=rng.randrange(1, 24 * 15))))
+            renderer = TiledRenderer(self.rotation, overrides, block_size=timedelta(hours=rng.choice([5, 24, 168, 400])))
+            for _ in range(3):
+                start_time = base + timedelta(hours=rng.randrange(0, 24 * 40))
+                end_time = start_time + timedelta(hours=rng.randrange(1, 24 * 20))
+                with self.subTest(trial=trial, start_time=start_time, end_time=end_time):
+                    self.assertListEqual(self.direct_render(overrides, start_time, end_time),
+                                         renderer.render(start_time, end_time))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Iterator
+from rendered_schedule import RenderedSchedule
+from rotation import Rotation
+from scheduling_engine import SchedulingEngine
+from user_event import UserEvent
+
+DEFAULT_MAX_CACHED_EVENTS = 1_000_000
+
+class TiledRenderer:
+    def __init__(self, rotation : Rotation, overrides : list[UserEvent], block_size : timedelta | None = None,
+                 max_cached_events : int = DEFAULT_MAX_CACHED_EVENTS) -> None:
+        """
+        Render windows of a rotation from fixed-size blocks aligned to handover_start_at.
+        overrides must be untruncated (see FileHandler.read_overrides), or truncated to a
+        range containing every window rendered (see FileHandler.read_override_file); they
+        are ordered by start time, file order on ties. block_size defaults to one handover interval.
+        Each block is rendered once and kept in an LRU cache holding at most
+        max_cached_events events, so a window sliding forward only renders the blocks it
+        newly reaches. A single block larger than the limit is used but not kept.
+        """
+        self.rotation = rotation
+        self.overrides = sorted(overrides, key=attrgetter("start_time"))
+        self.block_size = block_size or rotation.interval
+        self.max_cached_events = max_cached_events
+        self.cached_events = 0
+        self.blocks_rendered = 0
+        self._override_starts = [override.start_time for override in self.overrides]
+        self._max_override_length = max((override.end_time - override.start_time for override in self.overrides),
+                                        default=timedelta(0))
+        self._blocks: OrderedDict[int, RenderedSchedule] = OrderedDict()
+
+    def block_index(self, time : datetime) -> int:
+        """
+        Return the index of the block containing time. Blocks before handover_start_at have negative indices.
+        E.g.
+        handover_start_at = 7th 5pm, block_size = 7 days
+        time = 6th 5pm -> -1, time = 14th 5pm -> 1
+        """
+        return (time - self.rotation.handover_start_at) // self.block_size
+
+    def block_start(self, idx : int) -> datetime:
+        return self.rotation.handover_start_at + idx * self.block_size
+
+    def render(self, start_time : datetime, end_time : datetime) -> list[UserEvent]:
+        """
+        Render [start_time, end_time] by stitching the blocks it touches.
+        Each block is a complete render of its own range, so consecutive blocks only
+        disagree at their shared edge: an event of the same user running over the edge
+        is split in two and merged back here. The first and last block are clipped to the window.
+        E.g.
+        blocks = [[(A, 1st, 5th), (B, 5th, 8th)], [(B, 8th, 9th), (A, 9th, 15th)]]
+        render(3rd, 10th) = [(A, 3rd, 5th), (B, 5th, 9th), (A, 9th, 10th)]
+        """
+        if not start_time < end_time:
+            raise ValueError("Invalid start or end time range provided.")
+        result = []
+        for idx in self._block_range(start_time, end_time):
+            block_start = self.block_start(idx)
+            block_end = block_start + self.block_size
+            events = self._block(idx).clip(max(block_start, start_time), min(block_end, end_time))
+            if result and events:
+                prev, first = result[-1], events[0]
+                if prev.name == first.name and prev.end_time == first.start_time:
+                    result[-1] = UserEvent(prev.name, prev.start_time, first.end_time)
+                    events = events[1:]
+            result.extend(events)
+        return result
+
+    def _block_range(self, start_time : datetime, end_time : datetime) -> Iterator[int]:
+        idx = self.block_index(start_time)
+        while self.block_start(idx) < end_time:
+            yield idx
+            idx += 1
+
+    def _block(self, idx : int) -> RenderedSchedule:
+        """
+        Return the rendered block idx from the cache, rendering it on a miss.
+        """
+        block = self._blocks.get(idx)
+        if block is not None:
+            self._blocks.move_to_end(idx)
+            return block
+
+        block_start = self.block_start(idx)
+        block_end = block_start + self.block_size
+        schedule_lst = list(self.rotation.iter_events(block_start, block_end))
+        override_lst = list(self._overrides_between(block_start, block_end))
+        block = RenderedSchedule(SchedulingEngine(schedule_lst, override_lst).override_schedule_queue())
+        self.blocks_rendered += 1
+
+        size = len(block)
+        if size <= self.max_cached_events:
+            self._blocks[idx] = block
+            self.cached_events += size
+            while self.cached_events > self.max_cached_events:
+                _, evicted = self._blocks.popitem(last=False)
+                self.cached_events -= len(evicted)
+        return block
+
+    def _overrides_between(self, start_time : datetime, end_time : datetime) -> Iterator[UserEvent]:
+        """
+        Yield the overrides intersecting [start_time, end_time] in precedence order, truncated to it.
+        Only overrides starting within _max_override_length before start_time can reach into the range.
+        """
+        lo = bisect_left(self._override_starts, start_time - self._max_override_length)
+        hi = bisect_left(self._override_starts, end_time)
+        for override in self.overrides[lo:hi]:
+            truncated_start = max(override.start_time, start_time)
+            truncated_end = min(override.end_time, end_time)
+            if truncated_start < truncated_end:
+                yield UserEvent(override.name, truncated_start, truncated_end)